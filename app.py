@@ -3,44 +3,92 @@ Cacao Tools - A collection of developer utilities built with Cacao.
 Inspired by it-tools.tech
 """
 
-import cacao as c
+import importlib
+import time
 
-c.config(title="Cacao Tools", theme="dark")
+_started = time.perf_counter()
+STARTUP = {}  # phase or tool key -> seconds spent on it at startup (see benchmarks/bench_startup.py)
+
+import cacao as c
 
-# Import tool functions directly
-from tools.encoders import base64_tool, url_tool, html_tool, jwt_tool
-from tools.generators import uuid_tool, password_tool, lorem_tool
-from tools.converters import json_yaml_tool, case_tool, number_base_tool
-from tools.text import stats_tool, regex_tool
-from tools.crypto import hash_tool, hmac_tool
+from tools import metrics, session_state
 
-# Tool definitions for the hub
+c.config(title="Cacao Tools", theme="dark")
+# Every event marks its session active; idle sessions' large values are evicted
+session_state.track(c)
+if metrics.ENABLED:
+    # Handlers are wrapped as they are registered; when off, c.on is untouched
+    metrics.instrument(c)
+    if metrics.PORT:
+        metrics.serve_in_background()
+STARTUP["cacao"] = time.perf_counter() - _started
+
+# Each tool's module is imported, and its factory called, by the loop that
+# builds the panels; heavy optional dependencies are imported by the tools
+# themselves on first use.
 TOOLS = {
     "Encoders": [
-        {"key": "base64", "name": "Base64", "desc": "Encode and decode Base64 strings"},
-        {"key": "url", "name": "URL Encoder", "desc": "Encode and decode URL components"},
-        {"key": "html", "name": "HTML Entities", "desc": "Escape and unescape HTML entities"},
-        {"key": "jwt", "name": "JWT Decoder", "desc": "Decode and inspect JWT tokens"},
+        {"key": "base64", "name": "Base64", "desc": "Encode and decode Base64 strings",
+         "title": "Base64 Encoder/Decoder", "module": "tools.encoders", "factory": "base64_tool"},
+        {"key": "url", "name": "URL Encoder", "nav": "URL", "desc": "Encode and decode URL components",
+         "title": "URL Encoder/Decoder", "module": "tools.encoders", "factory": "url_tool"},
+        {"key": "html", "name": "HTML Entities", "desc": "Escape and unescape HTML entities",
+         "title": "HTML Entity Encoder/Decoder", "module": "tools.encoders", "factory": "html_tool"},
+        {"key": "jwt", "name": "JWT Decoder", "desc": "Decode and inspect JWT tokens",
+         "title": "JWT Decoder", "module": "tools.encoders", "factory": "jwt_tool"},
     ],
     "Generators": [
-        {"key": "uuid", "name": "UUID", "desc": "Generate unique identifiers"},
-        {"key": "password", "name": "Password", "desc": "Create secure random passwords"},
-        {"key": "lorem", "name": "Lorem Ipsum", "desc": "Generate placeholder text"},
+        {"key": "uuid", "name": "UUID", "desc": "Generate unique identifiers",
+         "title": "UUID Generator", "module": "tools.generators", "factory": "uuid_tool"},
+        {"key": "password", "name": "Password", "desc": "Create secure random passwords",
+         "title": "Password Generator", "module": "tools.generators", "factory": "password_tool"},
+        {"key": "lorem", "name": "Lorem Ipsum", "desc": "Generate placeholder text",
+         "title": "Lorem Ipsum Generator", "module": "tools.generators", "factory": "lorem_tool"},
+        {"key": "fake_data", "name": "Fake Data", "desc": "Generate test rows from a schema",
+         "title": "Fake Data Generator", "module": "tools.generators", "factory": "fake_data_tool"},
     ],
     "Converters": [
-        {"key": "json_yaml", "name": "JSON to YAML", "desc": "Convert between JSON and YAML"},
-        {"key": "case", "name": "Case Converter", "desc": "Transform text case styles"},
-        {"key": "number", "name": "Number Base", "desc": "Convert between number bases"},
+        {"key": "json_yaml", "name": "JSON to YAML", "desc": "Convert between JSON and YAML",
+         "title": "JSON to YAML Converter", "module": "tools.converters", "factory": "json_yaml_tool"},
+        {"key": "json_csv", "name": "JSON to CSV", "desc": "Convert between JSON arrays and CSV",
+         "title": "JSON to CSV Converter", "module": "tools.converters", "factory": "json_csv_tool"},
+        {"key": "case", "name": "Case Converter", "desc": "Transform text case styles",
+         "title": "Case Converter", "module": "tools.converters", "factory": "case_tool"},
+        {"key": "number", "name": "Number Base", "desc": "Convert between number bases",
+         "title": "Number Base Converter", "module": "tools.converters", "factory": "number_base_tool"},
     ],
     "Text": [
-        {"key": "stats", "name": "Text Stats", "desc": "Analyze text and count words"},
-        {"key": "regex", "name": "Regex Tester", "desc": "Test regular expressions"},
+        {"key": "stats", "name": "Text Stats", "nav": "Statistics", "desc": "Analyze text and count words",
+         "title": "Text Statistics", "module": "tools.text", "factory": "stats_tool"},
+        {"key": "regex", "name": "Regex Tester", "desc": "Test regular expressions",
+         "title": "Regex Tester", "module": "tools.text", "factory": "regex_tool"},
+        {"key": "diff", "name": "Text Diff", "desc": "Compare two texts line by line",
+         "title": "Text Diff", "module": "tools.text", "factory": "diff_tool"},
     ],
     "Crypto": [
-        {"key": "hash", "name": "Hash Generator", "desc": "Generate MD5, SHA hashes"},
-        {"key": "hmac", "name": "HMAC", "desc": "Create keyed-hash message codes"},
+        {"key": "hash", "name": "Hash Generator", "desc": "Hash text or files with MD5, SHA, BLAKE2",
+         "title": "Hash Generator", "module": "tools.crypto", "factory": "hash_tool"},
+        {"key": "hmac", "name": "HMAC", "desc": "Create keyed-hash message codes",
+         "title": "HMAC Generator", "module": "tools.crypto", "factory": "hmac_tool"},
+    ],
+    "System": [
+        {"key": "diagnostics", "name": "Diagnostics", "desc": "See which tools use the most time and CPU",
+         "title": "Diagnostics", "module": "tools.diagnostics", "factory": "diagnostics_tool"},
     ],
 }
+CATEGORY_ICONS = {"Encoders": "code", "Generators": "dice", "Converters": "shuffle", "Text": "text", "Crypto": "lock",
+                  "System": "cog"}
+CATEGORY_OPEN = {"Encoders"}  # nav groups expanded on load; the rest start collapsed
+
+def _build_panel(tool):
+    """Import the tool's module and render its panel, timing both."""
+    start = time.perf_counter()
+    factory = getattr(importlib.import_module(tool["module"]), tool["factory"])
+    c.title(tool["title"], level=2)
+    with metrics.registering(tool["key"]):
+        factory()
+    STARTUP[tool["key"]] = time.perf_counter() - start
+
 
 # Admin layout with sidebar navigation
 with c.app_shell(brand="Cacao Tools", default="home"):
@@ -49,29 +97,10 @@ with c.app_shell(brand="Cacao Tools", default="home"):
         c.nav_item("Home", key="home", icon="home")
         c.spacer(2)
 
-        with c.nav_group("Encoders", icon="code", default_open=True):
-            c.nav_item("Base64", key="base64")
-            c.nav_item("URL", key="url")
-            c.nav_item("HTML Entities", key="html")
-            c.nav_item("JWT Decoder", key="jwt")
-
-        with c.nav_group("Generators", icon="dice"):
-            c.nav_item("UUID", key="uuid")
-            c.nav_item("Password", key="password")
-            c.nav_item("Lorem Ipsum", key="lorem")
-
-        with c.nav_group("Converters", icon="shuffle"):
-            c.nav_item("JSON to YAML", key="json_yaml")
-            c.nav_item("Case Converter", key="case")
-            c.nav_item("Number Base", key="number")
-
-        with c.nav_group("Text", icon="text"):
-            c.nav_item("Statistics", key="stats")
-            c.nav_item("Regex Tester", key="regex")
-
-        with c.nav_group("Crypto", icon="lock"):
-            c.nav_item("Hash Generator", key="hash")
-            c.nav_item("HMAC", key="hmac")
+        for category, tools in TOOLS.items():
+            with c.nav_group(category, icon=CATEGORY_ICONS[category], default_open=category in CATEGORY_OPEN):
+                for tool in tools:
+                    c.nav_item(tool.get("nav", tool["name"]), key=tool["key"])
 
     # Main content area with panels for each tool
     with c.shell_content():
@@ -92,8 +121,8 @@ with c.app_shell(brand="Cacao Tools", default="home"):
                     with c.col(span=4):
                         # Stats
                         with c.row(gap=4, justify="center"):
-                            c.metric("Tools", "14")
-                            c.metric("Categories", "5")
+                            c.metric("Tools", str(sum(len(tools) for tools in TOOLS.values())))
+                            c.metric("Categories", str(len(TOOLS)))
 
             c.spacer(6)
 
@@ -110,63 +139,10 @@ with c.app_shell(brand="Cacao Tools", default="home"):
                                 c.spacer(2)
                                 c.button("Open", on_click=f"nav:{tool['key']}", variant="outline", size="sm")
                 c.spacer(4)
-        # Encoders
-        with c.nav_panel("base64"):
-            c.title("Base64 Encoder/Decoder", level=2)
-            base64_tool()
-
-        with c.nav_panel("url"):
-            c.title("URL Encoder/Decoder", level=2)
-            url_tool()
-
-        with c.nav_panel("html"):
-            c.title("HTML Entity Encoder/Decoder", level=2)
-            html_tool()
-
-        with c.nav_panel("jwt"):
-            c.title("JWT Decoder", level=2)
-            jwt_tool()
-
-        # Generators
-        with c.nav_panel("uuid"):
-            c.title("UUID Generator", level=2)
-            uuid_tool()
-
-        with c.nav_panel("password"):
-            c.title("Password Generator", level=2)
-            password_tool()
-
-        with c.nav_panel("lorem"):
-            c.title("Lorem Ipsum Generator", level=2)
-            lorem_tool()
-
-        # Converters
-        with c.nav_panel("json_yaml"):
-            c.title("JSON to YAML Converter", level=2)
-            json_yaml_tool()
-
-        with c.nav_panel("case"):
-            c.title("Case Converter", level=2)
-            case_tool()
-
-        with c.nav_panel("number"):
-            c.title("Number Base Converter", level=2)
-            number_base_tool()
-
-        # Text
-        with c.nav_panel("stats"):
-            c.title("Text Statistics", level=2)
-            stats_tool()
-
-        with c.nav_panel("regex"):
-            c.title("Regex Tester", level=2)
-            regex_tool()
-
-        # Crypto
-        with c.nav_panel("hash"):
-            c.title("Hash Generator", level=2)
-            hash_tool()
+        # One panel per tool
+        for tools in TOOLS.values():
+            for tool in tools:
+                with c.nav_panel(tool["key"]):
+                    _build_panel(tool)
 
-        with c.nav_panel("hmac"):
-            c.title("HMAC Generator", level=2)
-            hmac_tool()
+STARTUP["total"] = time.perf_counter() - _started
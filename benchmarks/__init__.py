@@ -0,0 +1 @@
+"""Cacao Tools - Benchmarks."""
@@ -0,0 +1,41 @@
+"""Messages signed per second: one HMAC per message versus a batch sharing its keyed state.
+
+hmac_engine.sign hashes one message in a single call, as the single-message
+tool does. hmac_engine.sign_lines builds the keyed state once per batch and
+copies it for each line, as Sign All does; nothing is kept between calls.
+
+Run from the repository root with: python -m benchmarks.bench_hmac
+"""
+
+import hmac
+
+from tools import hmac_engine
+from .timing import best_of, report
+
+COUNT = 100_000
+KEY = b"webhook-secret"
+
+
+def per_message(messages):
+    return [hmac.new(KEY, m.encode("utf-8"), "sha256").hexdigest() for m in messages]
+
+
+def signed(messages):
+    return [hmac_engine.sign(KEY, m.encode("utf-8")).hex() for m in messages]
+
+
+def batch(messages):
+    return hmac_engine.sign_lines(KEY, messages)
+
+
+def main():
+    messages = [f'{{"id": {i}, "action": "opened", "repository": "cacao-tools"}}' for i in range(COUNT)]
+    report([
+        ("hmac.new per message", COUNT, best_of(per_message, messages)),
+        ("hmac_engine.sign per message", COUNT, best_of(signed, messages)),
+        ("hmac_engine.sign_lines batch", COUNT, best_of(batch, messages)),
+    ], "messages")
+
+
+if __name__ == "__main__":
+    main()
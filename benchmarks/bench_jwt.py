@@ -0,0 +1,80 @@
+"""Tokens verified per second: unique tokens versus a log that repeats them.
+
+RS256 is included when the cryptography package is installed.
+Run from the repository root with: python -m benchmarks.bench_jwt
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+
+from tools import jwt_engine
+from .timing import best_of, report
+
+COUNT = 20_000
+REPEATS = 10  # times each token appears in the repeated log
+SECRET = "benchmark-secret"
+
+
+def _b64(data):
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _signing_input(alg, i):
+    header = _b64(json.dumps({"alg": alg, "typ": "JWT"}).encode())
+    payload = _b64(json.dumps({"sub": f"user{i}", "iat": 1700000000, "exp": 1700003600 + i}).encode())
+    return f"{header}.{payload}"
+
+
+def hs256_tokens(count):
+    tokens = []
+    for i in range(count):
+        signing_input = _signing_input("HS256", i)
+        signature = hmac.new(SECRET.encode(), signing_input.encode(), hashlib.sha256).digest()
+        tokens.append(f"{signing_input}.{_b64(signature)}")
+    return tokens
+
+
+def rs256_tokens(count, private_key):
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.asymmetric import padding
+
+    tokens = []
+    for i in range(count):
+        signing_input = _signing_input("RS256", i)
+        signature = private_key.sign(signing_input.encode(), padding.PKCS1v15(), hashes.SHA256())
+        tokens.append(f"{signing_input}.{_b64(signature)}")
+    return tokens
+
+
+def verify(tokens, keys):
+    # A fresh key set per run, so only repeats within the run are reused
+    return jwt_engine.verify_all(tokens, jwt_engine.KeySet(default=keys.default))
+
+
+def main():
+    hs256 = hs256_tokens(COUNT)
+    repeated = hs256[:COUNT // REPEATS] * REPEATS
+    hmac_keys = jwt_engine.load_keys(secret=SECRET)
+    rows = [
+        ("HS256, unique tokens", COUNT, best_of(verify, hs256, hmac_keys)),
+        (f"HS256, each token {REPEATS}x", COUNT, best_of(verify, repeated, hmac_keys)),
+    ]
+    if jwt_engine.crypto() is not None:
+        from cryptography.hazmat.primitives.asymmetric import rsa
+
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        rsa_keys = jwt_engine.KeySet(default=("rsa", private_key.public_key()))
+        count = COUNT // 10
+        rs256 = rs256_tokens(count, private_key)
+        rows.append(("RS256, unique tokens", count, best_of(verify, rs256, rsa_keys)))
+        rows.append((f"RS256, each token {REPEATS}x", count,
+                     best_of(verify, rs256[:count // REPEATS] * REPEATS, rsa_keys)))
+    else:
+        print("cryptography is not installed; skipping RS256")
+    report(rows, "tokens")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""Passwords per second: secrets.choice per character versus bulk rejection sampling.
+
+Run from the repository root with: python -m benchmarks.bench_password
+"""
+
+import secrets
+
+from tools import bulk_random
+from tools.generators import PASSWORD_ALPHABET, PASSWORD_CLASSES
+from .timing import best_of, report
+
+COUNT = 20_000
+LENGTH = 16
+
+
+def per_character(count):
+    return ["".join(secrets.choice(PASSWORD_ALPHABET) for _ in range(LENGTH)) for _ in range(count)]
+
+
+def bulk(count, required):
+    return bulk_random.passwords(count, LENGTH, PASSWORD_ALPHABET, required)
+
+
+def main():
+    required = list(PASSWORD_CLASSES.values())
+    report([
+        ("secrets.choice per character", COUNT, best_of(per_character, COUNT)),
+        ("bulk", COUNT, best_of(bulk, COUNT, ())),
+        ("bulk, digit and symbol required", COUNT, best_of(bulk, COUNT, required)),
+    ], "passwords")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Digits converted per second by digit count: builtin int()/str() versus radix.
+
+The builtins are timed with the int/str digit limit lifted and are skipped
+past BUILTIN_LIMIT digits, where their quadratic cost takes minutes.
+Run from the repository root with: python -m benchmarks.bench_radix
+"""
+
+import random
+import sys
+
+from tools import radix
+from .timing import best_of, report
+
+DIGIT_COUNTS = (1_000, 10_000, 100_000, 1_000_000)
+BUILTIN_LIMIT = 100_000
+REPEAT = 3
+
+
+def main():
+    rng = random.Random(0)
+    previous = sys.get_int_max_str_digits()
+    sys.set_int_max_str_digits(0)
+    try:
+        for digits in DIGIT_COUNTS:
+            text = str(rng.randrange(1, 10)) + "".join(rng.choices("0123456789", k=digits - 1))
+            num = radix.parse(text)
+            rows = []
+            if digits <= BUILTIN_LIMIT:
+                rows.append(("int(text)", digits, best_of(int, text, repeat=REPEAT)))
+                rows.append(("str(num)", digits, best_of(str, num, repeat=REPEAT)))
+            rows.append(("radix.parse, base 10", digits, best_of(radix.parse, text, repeat=REPEAT)))
+            rows.append(("radix.to_string, base 10", digits, best_of(radix.to_string, num, repeat=REPEAT)))
+            rows.append(("radix.to_string, base 36", digits, best_of(radix.to_string, num, 36, repeat=REPEAT)))
+            rows.append(("radix.to_string, base 58", digits, best_of(radix.to_string, num, 58, repeat=REPEAT)))
+            print(f"{digits:,} decimal digits")
+            report(rows, "digits")
+            print()
+    finally:
+        sys.set_int_max_str_digits(previous)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Cold-start time of the app, per tool panel, against a budget.
+
+Each run imports app.py in a fresh interpreter and reads its STARTUP
+timings; the fastest of RUNS is reported. Exits with status 1 when the
+total is over budget, so it can gate CI as the catalogue grows.
+Run from the repository root with: python -m benchmarks.bench_startup [--budget MS]
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+
+RUNS = 5
+BUDGET_MS = 400
+PROBE = "import json, app; print(json.dumps(app.STARTUP))"
+
+
+def measure(runs=RUNS):
+    """Return {phase: fastest seconds} over runs fresh imports of app."""
+    best = {}
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", PROBE], capture_output=True, text=True, check=True).stdout
+        timings = json.loads(out.strip().splitlines()[-1])
+        for phase, seconds in timings.items():
+            best[phase] = min(seconds, best.get(phase, seconds))
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget", type=float, default=BUDGET_MS, help="total startup budget in ms")
+    parser.add_argument("--runs", type=int, default=RUNS)
+    args = parser.parse_args(argv)
+
+    best = measure(args.runs)
+    total = best.pop("total")
+    width = max(len(phase) for phase in best)
+    for phase, seconds in sorted(best.items(), key=lambda item: -item[1]):
+        print(f"{phase:<{width}}  {seconds * 1000:>8.1f} ms")
+    print(f"{'total':<{width}}  {total * 1000:>8.1f} ms (budget {args.budget:,.0f} ms)")
+    if total * 1000 > args.budget:
+        print("Startup is over budget", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,282 @@
+"""Throughput and peak memory of every tool's core transform across input sizes.
+
+Each case runs at each size from the sweep. Inputs are deterministic and
+built before timing. Throughput is input bytes per second (output bytes
+for the generators), the median of several runs. Peak memory is the most
+Python allocated on top of the input during one extra run under
+tracemalloc.
+
+Results are compared with a baselines file when there is one. The run
+exits with status 1 when a case is slower, or peaks higher, than its
+baseline by more than the threshold. Inputs under 64 KB finish too
+quickly to time reliably, so only their memory is checked. Baselines are
+machine-specific: record them with --save on the machine that will check
+against them.
+
+Run from the repository root with:
+    python -m benchmarks.bench_suite                      # 1 KB to 1 MB
+    python -m benchmarks.bench_suite --sizes 1K,1M,100M --cases hash,base64
+    python -m benchmarks.bench_suite --save               # record baselines
+"""
+
+import argparse
+import base64
+import functools
+import hashlib
+import hmac
+import json
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+from tools import bulk_random, fake_data, regex_sandbox
+from tools.converters import _json_to_yaml, _yaml, _yaml_to_json
+from tools.crypto import _hash_digests
+from tools.encoders import _base64_transform, _html_transform, _jwt_batch, _jwt_decode, _url_transform
+from tools.generators import PASSWORD_ALPHABET
+from tools.text import _analyze
+
+QUICK_SIZES = "1K,64K,1M"
+FULL_SIZES = "1K,64K,1M,16M,100M"
+BASELINES = os.path.join(os.path.dirname(__file__), "baselines.json")
+THRESHOLD = 0.25  # allowed fractional slowdown or memory growth
+MIN_TIME = 0.25  # seconds per timing; small inputs are run in a loop to reach it
+GATE_MIN_SIZE = 64 << 10  # smaller inputs are too quick to time reliably, so their throughput is not gated
+_UNITS = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+
+
+def parse_size(text):
+    """"64K" -> 65536."""
+    text = text.strip().upper()
+    if text[-1:] in _UNITS:
+        return int(float(text[:-1]) * _UNITS[text[-1]])
+    return int(text)
+
+
+def format_size(n):
+    for unit in ("G", "M", "K"):
+        if n >= _UNITS[unit] and n % _UNITS[unit] == 0:
+            return f"{n // _UNITS[unit]}{unit}"
+    return str(n)
+
+
+# Inputs, built once per size
+
+@functools.lru_cache(maxsize=None)
+def _lorem(size):
+    rng = random.Random(0)
+    parts = []
+    total = 0
+    while total < size:
+        sentence = " ".join(fake_data.sentences(rng, 8)) + "\n"
+        parts.append(sentence)
+        total += len(sentence)
+    return "".join(parts)[:size]
+
+
+def text_input(size):
+    return _lorem(size)
+
+
+def html_input(size):
+    return _lorem(size).replace(". ", ". <br/> &amp; ")[:size]
+
+
+def base64_input(size):
+    return _base64_transform(_lorem(size * 3 // 4), "encode")[0]
+
+
+def json_input(size):
+    rng = random.Random(0)
+    words = fake_data.LOREM_WORDS
+    records = []
+    total = 2
+    while total < size:
+        record = json.dumps({"id": len(records), "name": rng.choice(words), "score": round(rng.random() * 100, 2),
+                             "active": rng.random() < 0.5, "tags": rng.sample(words, 3)})
+        records.append(record)
+        total += len(record) + 2
+    return "[" + ", ".join(records) + "]"
+
+
+def yaml_input(size):
+    # Documents of about 4 KB each, so large sizes exercise multi-document streams
+    doc = _json_to_yaml(json_input(min(size, 4096)))[0]
+    return ("---\n" + doc) * max(1, size // (len(doc) + 4))
+
+
+def regex_input(size):
+    # A rare match every 64 KB keeps the result well under the match limit
+    text = _lorem(size)
+    step = 1 << 16
+    return "".join(text[i:i + step - 12] + " order-12345" for i in range(0, len(text), step))[:size]
+
+
+def _b64(data):
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def jwt_log(size):
+    header = _b64(b'{"alg":"HS256","typ":"JWT"}')
+    lines = []
+    total = 0
+    i = 0
+    while total < size:
+        payload = _b64(json.dumps({"sub": f"user{i % 5000}", "iat": 1700000000 + i, "exp": 1700003600 + i}).encode())
+        signing_input = f"{header}.{payload}"
+        signature = _b64(hmac.new(b"secret", signing_input.encode(), hashlib.sha256).digest())
+        line = f"2024-01-01T00:00:00Z INFO request authorized token={signing_input}.{signature}\n"
+        lines.append(line)
+        total += len(line)
+        i += 1
+    return "".join(lines)
+
+
+def jwt_token(size):
+    claims = {"sub": "user", "data": _lorem(max(0, size * 3 // 4 - 40))}
+    return _b64(b'{"alg":"HS256"}') + "." + _b64(json.dumps(claims).encode()) + ".c2ln"
+
+
+# Cases: name -> (input builder or None for generators, function of (input, size))
+
+def _verify_log(log, size):
+    # Each call builds its own key set and decodes every token, so runs start cold
+    return _jwt_batch(log, "secret", "")
+
+
+def _regex(text, size):
+    # The search runs in a sandbox process, so peak memory covers only the hand-off
+    return regex_sandbox.find_matches(r"order-\d+", text, timeout=600, max_matches=1 << 20)
+
+
+def _uuids(_, size):
+    return "".join(bulk_random.iter_uuids(max(1, size // 37)))
+
+
+def _passwords(_, size):
+    return bulk_random.passwords(max(1, size // 17), 16, PASSWORD_ALPHABET)
+
+
+def _lorem_sentences(_, size):
+    return " ".join(fake_data.sentences(random.Random(0), max(1, size // 60)))
+
+
+CASES = {
+    "yaml": (json_input, lambda text, size: _json_to_yaml(text)),
+    "yaml_to_json": (yaml_input, lambda text, size: _yaml_to_json(text)),
+    "stats": (text_input, lambda text, size: _analyze(text)),
+    "regex": (regex_input, _regex),
+    "hash": (text_input, lambda text, size: _hash_digests(text)),
+    "base64_encode": (text_input, lambda text, size: _base64_transform(text, "encode")),
+    "base64_decode": (base64_input, lambda text, size: _base64_transform(text, "decode")),
+    "url_encode": (text_input, lambda text, size: _url_transform(text, "encode")),
+    "html_encode": (html_input, lambda text, size: _html_transform(text, "encode")),
+    "html_decode": (html_input, lambda text, size: _html_transform(text, "decode")),
+    "jwt_decode": (jwt_token, lambda token, size: _jwt_decode(token)),
+    "jwt_verify_log": (jwt_log, _verify_log),
+    "uuid": (None, _uuids),
+    "password": (None, _passwords),
+    "lorem": (None, _lorem_sentences),
+}
+if _yaml() is None:
+    del CASES["yaml_to_json"]  # PyYAML is optional
+
+
+def _repeats(size):
+    return 9 if size <= 1 << 20 else 3 if size <= 16 << 20 else 1
+
+
+def _loops(func, data, size):
+    """Calls per timing so that each timing lasts at least MIN_TIME."""
+    start = time.perf_counter()
+    func(data, size)
+    return max(1, int(MIN_TIME / max(time.perf_counter() - start, 1e-9)))
+
+
+def measure(name, size):
+    """Return {"throughput": bytes/s, "peak": bytes} for one case at one size."""
+    build, func = CASES[name]
+    data = build(size) if build else None
+    loops = _loops(func, data, size)
+    timings = []
+    for _ in range(_repeats(size)):
+        start = time.perf_counter()
+        for _ in range(loops):
+            func(data, size)
+        timings.append((time.perf_counter() - start) / loops)
+    tracemalloc.start()
+    try:
+        func(data, size)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {"throughput": size / statistics.median(timings), "peak": peak}
+
+
+def compare(key, size, result, baseline, threshold):
+    """Return a list of regression messages for one result."""
+    problems = []
+    if baseline is None:
+        return problems
+    if size >= GATE_MIN_SIZE and result["throughput"] < baseline["throughput"] * (1 - threshold):
+        problems.append(f"{key}: throughput {result['throughput'] / baseline['throughput'] - 1:+.0%}")
+    # Ignore growth within 64 KB, which is noise at small sizes
+    if result["peak"] > baseline["peak"] * (1 + threshold) + (64 << 10):
+        problems.append(f"{key}: peak memory {result['peak'] / max(baseline['peak'], 1) - 1:+.0%}")
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default=QUICK_SIZES, help=f"comma-separated sizes (full sweep: {FULL_SIZES})")
+    parser.add_argument("--cases", default=",".join(CASES), help="comma-separated case names")
+    parser.add_argument("--baselines", default=BASELINES, help="baselines file")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD)
+    parser.add_argument("--save", action="store_true", help="record these results as the baselines")
+    args = parser.parse_args(argv)
+
+    names = [name.strip() for name in args.cases.split(",") if name.strip()]
+    unknown = [name for name in names if name not in CASES]
+    if unknown:
+        parser.error(f"unknown cases: {', '.join(unknown)} (choose from {', '.join(CASES)})")
+    sizes = [parse_size(size) for size in args.sizes.split(",")]
+    baselines = {}
+    if os.path.exists(args.baselines):
+        with open(args.baselines, encoding="utf-8") as f:
+            baselines = json.load(f)
+
+    results = {}
+    problems = []
+    print(f"{'case':<16} {'size':>6} {'throughput':>14} {'peak':>10}  vs baseline")
+    for name in names:
+        for size in sizes:
+            key = f"{name}@{format_size(size)}"
+            result = results[key] = measure(name, size)
+            baseline = baselines.get(key)
+            change = ""
+            if baseline:
+                change = f"{result['throughput'] / baseline['throughput'] - 1:+.0%} speed, " \
+                         f"{result['peak'] / max(baseline['peak'], 1) - 1:+.0%} memory"
+            print(f"{name:<16} {format_size(size):>6} {result['throughput'] / (1 << 20):>9,.1f} MB/s "
+                  f"{result['peak'] / (1 << 20):>7,.1f} MB  {change}", flush=True)
+            problems.extend(compare(key, size, result, baseline, args.threshold))
+
+    if args.save:
+        baselines.update(results)
+        with open(args.baselines, "w", encoding="utf-8") as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+        print(f"Saved {len(results)} baselines to {args.baselines}")
+        return 0
+    if problems:
+        print(f"Regressions beyond {args.threshold:.0%}:", file=sys.stderr)
+        for problem in problems:
+            print(f"  {problem}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,33 @@
+"""UUIDs per second: one uuid module call per ID versus bulk generation.
+
+Run from the repository root with: python -m benchmarks.bench_uuid
+"""
+
+import uuid
+
+from tools import bulk_random
+from .timing import best_of, report
+
+COUNT = 200_000
+
+
+def per_call(factory, count):
+    return [str(factory()) for _ in range(count)]
+
+
+def bulk(version, count):
+    return "".join(bulk_random.iter_uuids(count, version))
+
+
+def main():
+    rows = [
+        ("uuid.uuid4() per ID", COUNT, best_of(per_call, uuid.uuid4, COUNT)),
+        ("uuid.uuid1() per ID", COUNT, best_of(per_call, uuid.uuid1, COUNT)),
+    ]
+    for version in bulk_random.UUID_VERSIONS:
+        rows.append((f"bulk v{version}", COUNT, best_of(bulk, version, COUNT)))
+    report(rows, "IDs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,20 @@
+"""Timing helpers shared by the benchmark scripts."""
+
+import time
+
+
+def best_of(func, *args, repeat=5):
+    """Return the fastest of repeat wall-clock timings of func(*args), in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def report(rows, unit):
+    """Print (name, count, seconds) rows as an aligned throughput table."""
+    width = max(len(name) for name, _, _ in rows)
+    for name, count, seconds in rows:
+        print(f"{name:<{width}}  {count / seconds:>14,.0f} {unit}/s")
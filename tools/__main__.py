@@ -0,0 +1,99 @@
+"""Command-line access to the tool transforms.
+
+    python -m tools list
+    python -m tools run base64 -o mode=decode aGVsbG8=
+    python -m tools run case -o style=snake_case < identifiers.txt
+    python -m tools run hash --ndjson < items.ndjson
+    python -m tools serve --port 8765
+
+Without inputs, run reads one item per line from stdin. Plain output is
+one result per line; --ndjson reads JSON items and writes JSON results.
+"""
+
+import argparse
+import json
+import sys
+
+from . import api, http_api
+
+
+def _options(pairs):
+    options = {}
+    for pair in pairs:
+        key, sep, value = pair.partition("=")
+        if not sep:
+            raise SystemExit(f"Options are key=value, got {pair!r}")
+        options[key] = value
+    return options
+
+
+def _stdin_items(ndjson):
+    for line in sys.stdin:
+        line = line.rstrip("\r\n")
+        if not ndjson:
+            yield line
+        elif line.strip():
+            try:
+                yield json.loads(line)
+            except ValueError as e:
+                yield ValueError(f"Invalid JSON line: {str(e)}")
+
+
+def _list():
+    for name, spec in api.describe().items():
+        options = " ".join(f"{key}={value!r}" for key, value in spec["options"].items())
+        print(f"{name:<10} {spec['description']}")
+        if options:
+            print(f"{'':<10} {options}")
+
+
+def _run(args):
+    if args.tool not in api.TRANSFORMS:
+        raise SystemExit(f"Unknown tool: {args.tool} (see python -m tools list)")
+    items = args.inputs if args.inputs else _stdin_items(args.ndjson)
+    failed = 0
+    out = sys.stdout
+    for number, result in enumerate(api.iter_batch(args.tool, items, _options(args.option)), 1):
+        if "error" in result:
+            failed += 1
+        if args.ndjson:
+            out.write(json.dumps(result) + "\n")
+        elif "error" in result:
+            print(f"item {number}: Error: {result['error']}", file=sys.stderr)
+            out.write("\n")  # keep output lines aligned with input lines
+        else:
+            output = result["output"]
+            out.write((output if isinstance(output, str) else json.dumps(output)) + "\n")
+    return 1 if failed else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m tools", description="Run Cacao Tools transforms without the UI.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="list the tools and their options")
+    run = commands.add_parser("run", help="run a tool over inputs or stdin lines")
+    run.add_argument("tool")
+    run.add_argument("inputs", nargs="*", help="items to process; stdin lines when omitted")
+    run.add_argument("-o", "--option", action="append", default=[], metavar="KEY=VALUE", help="option for every item")
+    run.add_argument("--ndjson", action="store_true", help="read JSON items and write JSON results, one per line")
+    serve = commands.add_parser("serve", help="serve the batch HTTP API on localhost")
+    serve.add_argument("--host", default=http_api.HOST)
+    serve.add_argument("--port", type=int, default=http_api.PORT)
+    # Inputs may come before or after options, so run collects the leftovers
+    args, extra = parser.parse_known_args(argv)
+    if extra and (args.command != "run" or any(arg.startswith("-") for arg in extra)):
+        parser.error(f"unrecognized arguments: {' '.join(extra)}")
+    if extra:
+        args.inputs += extra
+
+    if args.command == "list":
+        _list()
+        return 0
+    if args.command == "run":
+        return _run(args)
+    http_api.serve(args.host, args.port)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,208 @@
+"""Headless registry of every tool's transform, for the CLI and HTTP API.
+
+Each transform is a plain function of keyword arguments. Its declared
+options double as defaults and as types for coercing command-line and
+query-string values. Batches are run item by item; one failing item
+becomes an {"error": ...} result and never stops the rest.
+"""
+
+import hashlib
+import random
+
+from . import bulk_random, casing, fake_data, hmac_engine, jwt_engine, radix, regex_sandbox, stats_engine
+from .converters import _json_to_yaml, _yaml_to_json
+from .crypto import HASH_ALGORITHMS
+from .encoders import _base64_transform, _html_transform, _url_transform
+from .generators import PASSWORD_ALPHABET, PASSWORD_CLASSES
+
+MAX_ITEMS = 100_000  # per batch
+MAX_COUNT = 100_000  # IDs or passwords per item
+
+TRANSFORMS = {}  # name -> {"func", "input", "description", "options"}
+
+
+def transform(name, description, input="text", **options):
+    """Register func(**params) as a transform.
+
+    input names the parameter that a bare string item fills; options are
+    the remaining parameters and their defaults.
+    """
+    def register(func):
+        TRANSFORMS[name] = {"func": func, "input": input, "description": description, "options": options}
+        return func
+    return register
+
+
+def _coerce(value, default):
+    """Convert a string option to the type of its default."""
+    if isinstance(default, str) and isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)  # e.g. {"text": 255} for the number tool
+    if not isinstance(value, str) or isinstance(default, str) or default is None:
+        return value
+    if isinstance(default, bool):
+        if value.lower() in ("1", "true", "yes", "on"):
+            return True
+        if value.lower() in ("0", "false", "no", "off"):
+            return False
+        raise ValueError(f"Expected true or false, got {value!r}")
+    if isinstance(default, int):
+        return int(value)
+    return type(default)(value)
+
+
+def describe():
+    """Return {name: {"description", "input", "options"}} for every transform."""
+    return {name: {"description": spec["description"], "input": spec["input"], "options": spec["options"]}
+            for name, spec in TRANSFORMS.items()}
+
+
+def params_for(name, item, options=None):
+    """Merge a batch item over shared options and the transform's defaults."""
+    spec = TRANSFORMS.get(name)
+    if spec is None:
+        raise KeyError(f"Unknown tool: {name}")
+    defaults = spec["options"]
+    params = dict(defaults)
+    params[spec["input"]] = defaults.get(spec["input"], "")
+    for source in (options or {}, item if isinstance(item, dict) else {spec["input"]: item}):
+        for key, value in source.items():
+            if key not in params:
+                raise ValueError(f"Unknown option for {name}: {key}")
+            params[key] = _coerce(value, params[key])
+    return params
+
+
+def run(name, item, options=None):
+    """Run one item through a transform and return its output."""
+    params = params_for(name, item, options)
+    return TRANSFORMS[name]["func"](**params)
+
+
+def iter_batch(name, items, options=None):
+    """Yield {"output": ...} or {"error": ...} for each item, in order.
+
+    An item that is an exception (e.g. from parsing the request) becomes
+    its error result.
+    """
+    if name not in TRANSFORMS:
+        raise KeyError(f"Unknown tool: {name}")
+    for count, item in enumerate(items, 1):
+        if count > MAX_ITEMS:
+            yield {"error": f"Batch limit of {MAX_ITEMS:,} items reached"}
+            return
+        if isinstance(item, Exception):
+            yield {"error": str(item)}
+            continue
+        try:
+            yield {"output": run(name, item, options)}
+        except Exception as e:
+            yield {"error": str(e)}
+
+
+def _count(count):
+    if not 1 <= count <= MAX_COUNT:
+        raise ValueError(f"Count must be between 1 and {MAX_COUNT:,}")
+    return count
+
+
+@transform("base64", "Encode or decode Base64 (standard, url or mime variant)", mode="encode", variant="standard")
+def base64_transform(text, mode, variant):
+    output, data = _base64_transform(text, mode, variant)
+    if data is not None:
+        return {"hex": data.hex()}  # binary output
+    return output
+
+
+@transform("url", "Percent-encode or decode URL components", mode="encode")
+def url_transform(text, mode):
+    return _url_transform(text, mode)
+
+
+@transform("html", "Escape or unescape HTML entities", mode="encode")
+def html_transform(text, mode):
+    return _html_transform(text, mode)
+
+
+@transform("jwt", "Decode a JWT and verify it with a secret or key file", input="token", secret="", key_path="")
+def jwt_transform(token, secret, key_path):
+    decoded = jwt_engine.decode(token.strip())
+    if isinstance(decoded, str):
+        raise ValueError(decoded)
+    result = jwt_engine.verify_all([token.strip()], jwt_engine.load_keys(key_path, secret))[0]
+    return {key: result[key] for key in ("header", "payload", "status", "timing")}
+
+
+@transform("uuid", "Generate UUIDs", input="count", count=1, version=4)
+def uuid_transform(count, version):
+    return "".join(bulk_random.iter_uuids(_count(count), version)).split()
+
+
+@transform("password", "Generate random passwords", input="count", count=1, length=16, digit=False, symbol=False)
+def password_transform(count, length, digit, symbol):
+    required = [PASSWORD_CLASSES[name] for name, wanted in (("digit", digit), ("symbol", symbol)) if wanted]
+    return bulk_random.passwords(_count(count), length, PASSWORD_ALPHABET, required)
+
+
+@transform("lorem", "Generate placeholder paragraphs", input="paragraphs", paragraphs=3, seed=None)
+def lorem_transform(paragraphs, seed):
+    rng = random.Random(seed)
+    return "\n\n".join(" ".join(fake_data.sentences(rng, rng.randint(4, 8))) for _ in range(_count(paragraphs)))
+
+
+@transform("yaml", "Convert JSON to YAML")
+def yaml_transform(text):
+    return _json_to_yaml(text)[0]
+
+
+@transform("yaml_json", "Convert YAML to JSON; a multi-document stream becomes an array (needs PyYAML)")
+def yaml_json_transform(text):
+    return _yaml_to_json(text)[0]
+
+
+@transform("case", "Convert to one case style, or to all of them when style is empty", style="")
+def case_transform(text, style):
+    if not style:
+        return casing.convert_all(text)
+    if style not in casing.STYLES:
+        raise ValueError(f"Unknown style: {style} (use one of {', '.join(casing.STYLES)})")
+    return next(casing.iter_convert([text], style))
+
+
+@transform("number", "Convert a number between bases 2-36, 58 and 62", from_base=10, to_base=16)
+def number_transform(text, from_base, to_base):
+    return radix.convert(text, from_base, to_base)
+
+
+@transform("stats", "Count characters, words, lines and sentences")
+def stats_transform(text):
+    return stats_engine.TextStats(text).counts()
+
+
+@transform("regex", "Find regex matches in a sandboxed, time-limited worker", pattern="")
+def regex_transform(text, pattern):
+    if not pattern:
+        raise ValueError("pattern is required")
+    match_set = regex_sandbox.find_matches(pattern, text)
+    if match_set.timed_out:
+        raise TimeoutError("Search timed out")
+    return [{"match": text[regs[0][0]:regs[0][1]], "span": list(regs[0]),
+             "groups": [text[s:e] if s >= 0 else None for s, e in regs[1:]]} for regs in match_set.spans]
+
+
+@transform("hash", "Hash UTF-8 text", algorithm="SHA-256")
+def hash_transform(text, algorithm):
+    if algorithm not in HASH_ALGORITHMS:
+        raise ValueError(f"Unknown algorithm: {algorithm} (use one of {', '.join(HASH_ALGORITHMS)})")
+    return hashlib.new(HASH_ALGORITHMS[algorithm], text.encode("utf-8")).hexdigest()
+
+
+@transform("hmac", "Sign a message, or verify it when a hex signature is given", key="", digest="SHA-256",
+           signature="")
+def hmac_transform(text, key, digest, signature):
+    if not key:
+        raise ValueError("key is required")
+    if digest not in hmac_engine.DIGESTS:
+        raise ValueError(f"Unknown digest: {digest} (use one of {', '.join(hmac_engine.DIGESTS)})")
+    if signature:
+        return {"valid": not hmac_engine.verify_lines(key.encode(), [f"{signature} {text}"], digest)}
+    return hmac_engine.sign(key.encode(), text.encode(), digest).hex()
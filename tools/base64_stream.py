@@ -0,0 +1,91 @@
+"""Chunked Base64 encoding and decoding in flat memory.
+
+Input is consumed as an iterable of byte chunks. Only the bytes that do
+not yet fill a whole 3-byte group (or 57-byte MIME line) when encoding, or
+4-character group when decoding, are carried over to the next chunk.
+"""
+
+import binascii
+
+CHUNK_SIZE = 57 * 18396  # about 1 MB; a whole number of 3-byte groups and MIME lines
+VARIANTS = ("standard", "url", "mime")
+MIME_LINE = 76  # characters per MIME line (57 input bytes)
+
+_STD_TO_URL = bytes.maketrans(b"+/", b"-_")
+_URL_TO_STD = bytes.maketrans(b"-_", b"+/")
+_WHITESPACE = b" \t\r\n\v\f"
+
+
+def _encode_block(data, variant):
+    encoded = binascii.b2a_base64(data, newline=False)
+    if variant == "url":
+        return encoded.translate(_STD_TO_URL)
+    if variant == "mime":
+        return b"".join([encoded[i:i + MIME_LINE] + b"\r\n" for i in range(0, len(encoded), MIME_LINE)])
+    return encoded
+
+
+def iter_encode(chunks, variant="standard"):
+    """Yield the Base64 encoding of an iterable of byte chunks.
+
+    variant is "standard", "url" (RFC 4648 URL-safe alphabet) or "mime"
+    (76-character lines ending in CRLF).
+    """
+    if variant not in VARIANTS:
+        raise ValueError(f"Unknown Base64 variant: {variant}")
+    unit = 57 if variant == "mime" else 3
+    pending = b""
+    for chunk in chunks:
+        data = pending + chunk if pending else chunk
+        cut = len(data) - len(data) % unit
+        pending = data[cut:]
+        if cut:
+            yield _encode_block(memoryview(data)[:cut], variant)
+    if pending:
+        yield _encode_block(pending, variant)
+
+
+def iter_decode(chunks):
+    """Yield the bytes decoded from an iterable of Base64 byte chunks.
+
+    Standard, URL-safe and MIME input are all accepted: whitespace is
+    skipped, both alphabets are understood, and missing final padding is
+    tolerated. Raises ValueError on anything else.
+    """
+    pending = b""
+    offset = 0  # Base64 characters decoded so far, for error messages
+    finished = False  # padding seen; nothing may follow
+    for chunk in chunks:
+        data = chunk.translate(_URL_TO_STD, _WHITESPACE)
+        if not data:
+            continue
+        if finished:
+            raise ValueError(f"Invalid Base64: data after padding at character {offset}")
+        data = pending + data if pending else data
+        cut = len(data) - len(data) % 4
+        pending = data[cut:]
+        if cut:
+            yield _decode_block(data[:cut], offset)
+            offset += cut
+            finished = data[cut - 1] == 61  # "="
+    if pending:
+        if finished:
+            raise ValueError(f"Invalid Base64: data after padding at character {offset}")
+        yield _decode_block(pending + b"=" * (-len(pending) % 4), offset)
+
+
+def _decode_block(data, offset):
+    try:
+        return binascii.a2b_base64(data, strict_mode=True)
+    except binascii.Error as e:
+        raise ValueError(f"Invalid Base64 in characters {offset}-{offset + len(data)}: {e}") from None
+
+
+def encode(data, variant="standard"):
+    """Encode bytes to Base64 bytes."""
+    return b"".join(iter_encode([data], variant))
+
+
+def decode(data):
+    """Decode Base64 bytes in any supported variant."""
+    return b"".join(iter_decode([data]))
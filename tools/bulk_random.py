@@ -0,0 +1,209 @@
+"""Bulk random identifiers and passwords drawn from large os.urandom buffers.
+
+A whole batch is generated from one urandom call, and the per-item work
+(setting version bits, hex formatting, mapping bytes to an alphabet) is
+done with strided slice assignments and bytes.translate over the batch
+buffer rather than by a Python call per item.
+"""
+
+import array
+import functools
+import math
+import os
+import string
+import sys
+import threading
+import time
+
+BATCH = 16384  # UUIDs generated per urandom draw
+UUID_VERSIONS = (4, 1, 7)
+SYMBOLS = "!@#$%^&*"
+PASSWORD_ALPHABET = string.ascii_letters + string.digits + SYMBOLS
+
+_VERSION_BITS = {v: bytes((b & 0x0F) | (v << 4) for b in range(256)) for v in UUID_VERSIONS}
+_VARIANT_BITS = bytes((b & 0x3F) | 0x80 for b in range(256))
+# Where each of the 32 hex digits of a UUID lands in its 37-character line
+_HEX_POSITIONS = [i + (i >= 8) + (i >= 12) + (i >= 16) + (i >= 20) for i in range(32)]
+_GREGORIAN_OFFSET = 0x01B21DD213814000  # 100 ns intervals from 1582-10-15 to 1970-01-01
+
+_clock_lock = threading.Lock()
+_last_v1 = 0  # last v1 timestamp handed out
+_last_v7 = 0  # last v7 (milliseconds << 12 | counter) handed out
+
+
+def _big_endian(values):
+    """Pack unsigned 64-bit ints as big-endian bytes."""
+    packed = array.array("Q", values)
+    if sys.byteorder == "little":
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def _set_high(buf, high):
+    """Copy 8 bytes per UUID from high into the first half of each UUID in buf."""
+    for k in range(8):
+        buf[k::16] = high[k::8]
+
+
+def _format(buf):
+    """Render 16-byte UUIDs as canonical lowercase lines, each ending in a newline."""
+    n = len(buf) // 16
+    digits = buf.hex().encode("ascii")
+    out = bytearray(b"-") * (37 * n)
+    for i, pos in enumerate(_HEX_POSITIONS):
+        out[pos::37] = digits[i::32]
+    out[36::37] = b"\n" * n
+    return out.decode("ascii")
+
+
+def _v4(n, source):
+    buf = bytearray(source(16 * n))
+    buf[6::16] = buf[6::16].translate(_VERSION_BITS[4])
+    buf[8::16] = buf[8::16].translate(_VARIANT_BITS)
+    return buf
+
+
+def _v1(n, source):
+    """Time-based UUIDs with consecutive timestamps.
+
+    The node is a random multicast address as RFC 9562 allows, so no MAC
+    address leaks into the IDs; clock sequence and node are drawn once per batch.
+    """
+    global _last_v1
+    with _clock_lock:
+        start = max(time.time_ns() // 100 + _GREGORIAN_OFFSET, _last_v1 + 1)
+        _last_v1 = start + n - 1
+    high = _big_endian([
+        (ts & 0xFFFFFFFF) << 32 | (ts >> 32 & 0xFFFF) << 16 | (ts >> 48 & 0x0FFF) | 0x1000
+        for ts in range(start, start + n)
+    ])
+    tail = bytearray(source(8))
+    tail[0] = tail[0] & 0x3F | 0x80
+    tail[2] |= 0x01
+    buf = bytearray(bytes(8) + tail) * n
+    _set_high(buf, high)
+    return buf
+
+
+def _v7(n, source):
+    """Unix-time-ordered UUIDs, monotonic across calls.
+
+    rand_a holds a 12-bit counter started at a random value each
+    millisecond (RFC 9562 method 1); rand_b is random.
+    """
+    global _last_v7
+    with _clock_lock:
+        now = (time.time_ns() // 1_000_000) << 12 | int.from_bytes(source(2), "big") & 0x7FF
+        start = max(now, _last_v7 + 1)
+        _last_v7 = start + n - 1
+    high = _big_endian([(p >> 12) << 16 | 0x7000 | (p & 0xFFF) for p in range(start, start + n)])
+    buf = bytearray(source(16 * n))
+    buf[8::16] = buf[8::16].translate(_VARIANT_BITS)
+    _set_high(buf, high)
+    return buf
+
+
+_GENERATORS = {4: _v4, 1: _v1, 7: _v7}
+
+
+def iter_uuids(count, version=4, batch=BATCH, source=os.urandom):
+    """Yield count UUIDs of the given version as blocks of newline-terminated lines.
+
+    source(n) returns n random bytes; pass a seeded random.Random().randbytes
+    for reproducible v4 IDs.
+    """
+    if version not in _GENERATORS:
+        raise ValueError(f"Unsupported UUID version: {version}")
+    generate = _GENERATORS[version]
+    while count > 0:
+        n = min(batch, count)
+        yield _format(generate(n, source))
+        count -= n
+
+
+def uuids(count, version=4, source=os.urandom):
+    """Return a list of count UUID strings."""
+    return "".join(iter_uuids(count, version, source=source)).split()
+
+
+@functools.lru_cache(maxsize=64)
+def _sampling_table(alphabet):
+    """Return (table, rejected bytes) mapping random bytes uniformly onto alphabet.
+
+    Bytes at or above the largest multiple of len(alphabet) are rejected, so
+    each symbol is reached by exactly 256 // len(alphabet) byte values.
+    """
+    k = len(alphabet)
+    if not 0 < k <= 256:
+        raise ValueError("Alphabet must have between 1 and 256 symbols")
+    limit = 256 - 256 % k
+    return bytes(alphabet[b % k] for b in range(256)), bytes(range(limit, 256))
+
+
+def random_bytes(alphabet, n, source=os.urandom):
+    """Return n symbols drawn uniformly from a bytes alphabet by rejection sampling."""
+    table, rejected = _sampling_table(alphabet)
+    accept = 1 - len(rejected) / 256
+    parts = []
+    got = 0
+    while got < n:
+        # Overdraw slightly so one urandom call almost always suffices
+        draw = int((n - got) / accept * 1.02) + 64
+        part = source(draw).translate(table, rejected)
+        parts.append(part)
+        got += len(part)
+    return b"".join(parts)[:n]
+
+
+def random_chars(alphabet, n, source=os.urandom):
+    """Return a str of n characters drawn uniformly from an ASCII alphabet."""
+    return random_bytes(alphabet.encode("ascii"), n, source).decode("ascii")
+
+
+def passwords(count, length, alphabet, required=(), source=os.urandom):
+    """Return count passwords of length characters drawn from alphabet.
+
+    Each string in required is a character class the password must use at
+    least once. Instead of regenerating passwords that miss a class, one
+    character of each class is written over a distinct random position;
+    this is the same distribution as drawing those characters alongside
+    the rest and shuffling.
+    """
+    if len(required) > length:
+        raise ValueError(f"Length {length} is too short for {len(required)} required character classes")
+    if length > 256:
+        raise ValueError("Passwords are limited to 256 characters")
+    body = random_chars(alphabet, count * length, source)
+    if not required:
+        return [body[i:i + length] for i in range(0, count * length, length)]
+
+    picks = [random_chars(chars, count, source) for chars in required]
+    slots = range(length)
+    positions = random_bytes(bytes(slots), 2 * count * len(required) + 64, source)
+    cursor = 0
+    out = []
+    for i in range(count):
+        chars = list(body[i * length:(i + 1) * length])
+        taken = []
+        for pick in picks:
+            while True:
+                if cursor == len(positions):
+                    positions = random_bytes(bytes(slots), count * len(required) + 64, source)
+                    cursor = 0
+                pos = positions[cursor]
+                cursor += 1
+                if pos not in taken:
+                    break
+            taken.append(pos)
+            chars[pos] = pick[i]
+        out.append("".join(chars))
+    return out
+
+
+def password_entropy(length, alphabet, required=()):
+    """Lower bound in bits on the entropy of passwords(..., length, alphabet, required).
+
+    Given the positions of the required characters the password determines
+    every draw, so the draws' entropy is a lower bound.
+    """
+    return (length - len(required)) * math.log2(len(alphabet)) + sum(math.log2(len(chars)) for chars in required)
@@ -0,0 +1,69 @@
+"""Identifier case conversion with one precompiled tokenizer.
+
+Words are found in a single regex pass that splits on separators, on
+lower-to-upper transitions and before the last capital of an acronym
+("HTTPServer" -> HTTP, Server), keeping plural acronyms whole ("getURLs"
+-> get, URLs). Digits stay attached to the word they follow
+("base64Encode" -> base64, Encode). Versioned names stay whole
+("IPv6Address" -> IPv6, Address; "OAuth2Token" -> OAuth2, Token), as do
+numeronyms ("I18N", "K8S"). Every joined style is built from the same
+word list, so each input is tokenised once; lowercase, UPPERCASE and
+Title Case are plain string transforms that keep the text's spacing and
+punctuation.
+"""
+
+import re
+
+# Letters other than ASCII capitals count as lowercase, so accented words stay whole
+_LOWER = r"[^\W\d_A-Z]"
+_LETTER = r"[^\W\d_]"
+WORD = re.compile("|".join([
+    rf"[A-Z]{{2,}}s(?!{_LOWER})",                           # plural acronym: URLs
+    rf"(?:[A-Z]+{_LOWER}|[A-Z]{{1,2}}{_LOWER}+)\d+",         # versioned name: IPv6, OAuth2, Base64
+    rf"[A-Z]+\d*(?=[A-Z]{_LOWER})",                         # acronym before a word: HTTP(Server)
+    rf"[A-Z]?{_LOWER}+\d*",                                 # word: parse, Document, base64
+    rf"[A-Z]+\d+[A-Z](?=[A-Z]{_LOWER}|(?!{_LETTER}))",       # numeronym: I18N, K8S
+    rf"[A-Z]+\d*",                                          # acronym: XML, SHA256
+    r"\d+",
+]))
+BATCH = 4096  # lines converted per write in file mode
+
+
+def words(text):
+    """Split text or an identifier into words."""
+    return WORD.findall(text)
+
+
+def _camel(ws):
+    return ws[0].lower() + "".join(w.capitalize() for w in ws[1:]) if ws else ""
+
+
+STYLES = {
+    "lowercase": str.lower,
+    "UPPERCASE": str.upper,
+    "Title Case": str.title,
+    "camelCase": _camel,
+    "PascalCase": lambda ws: "".join(w.capitalize() for w in ws),
+    "snake_case": lambda ws: "_".join(w.lower() for w in ws),
+    "kebab-case": lambda ws: "-".join(w.lower() for w in ws),
+    "CONSTANT_CASE": lambda ws: "_".join(w.upper() for w in ws),
+}
+
+PLAIN = frozenset({"lowercase", "UPPERCASE", "Title Case"})  # styles applied to the text, not its words
+
+
+def convert_all(text):
+    """Return {style: text in that style} from one tokenisation."""
+    ws = words(text)
+    return {name: style(text if name in PLAIN else ws) for name, style in STYLES.items()}
+
+
+def iter_convert(lines, style):
+    """Yield each line converted to style; blank lines stay blank."""
+    build = STYLES[style]
+    if style in PLAIN:
+        yield from map(build, lines)
+        return
+    findall = WORD.findall
+    for line in lines:
+        yield build(findall(line))
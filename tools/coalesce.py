@@ -0,0 +1,80 @@
+"""Per-session debouncing of bursty on_change events."""
+
+import asyncio
+import inspect
+
+WAIT = 0.15  # seconds of quiet before the newest value is computed
+MAX_WAIT = 1.0  # upper bound on how long a burst can defer computation
+
+_debouncers = []
+
+
+class Debouncer:
+    """Collapse bursts of events per session into one call with the newest value.
+
+    Handlers call push() and return immediately; compute(session, value) runs
+    once the session has been quiet for `wait` seconds, or `max_wait` seconds
+    after the first event of a burst, whichever comes first. If compute
+    raises, on_error(session, exc) is called, as with executor.submit.
+    """
+
+    def __init__(self, name, wait=WAIT, max_wait=MAX_WAIT):
+        self.name = name
+        self.wait = wait
+        self.max_wait = max_wait
+        self.events = 0
+        self.runs = 0
+        self.coalesced = 0
+        self._pending = {}  # session id -> [value, compute, first, last, on_error]
+        self._tasks = set()  # flushes in flight; the loop only keeps weak references
+        _debouncers.append(self)
+
+    def push(self, session, value, compute, on_error=None):
+        """Record the newest value for a session and schedule its computation."""
+        self.events += 1
+        now = asyncio.get_running_loop().time()
+        pending = self._pending.get(session.id)
+        if pending is not None:
+            self.coalesced += 1
+            pending[0] = value
+            pending[1] = compute
+            pending[3] = now
+            pending[4] = on_error
+            return
+        self._pending[session.id] = [value, compute, now, now, on_error]
+        task = asyncio.ensure_future(self._flush(session))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _flush(self, session):
+        loop = asyncio.get_running_loop()
+        pending = self._pending[session.id]
+        while True:
+            deadline = min(pending[3] + self.wait, pending[2] + self.max_wait)
+            delay = deadline - loop.time()
+            if delay <= 0:
+                break
+            await asyncio.sleep(delay)
+
+        del self._pending[session.id]
+        self.runs += 1
+        value, compute, on_error = pending[0], pending[1], pending[4]
+        try:
+            result = compute(session, value)
+            if inspect.isawaitable(result):
+                await result
+        except Exception as e:
+            if on_error is None:
+                loop.call_exception_handler({"message": f"Debounced {self.name} computation failed",
+                                             "exception": e})
+            else:
+                on_error(session, e)
+
+    def stats(self):
+        """Return event, run and coalesced counts."""
+        return {"events": self.events, "runs": self.runs, "coalesced": self.coalesced}
+
+
+def stats():
+    """Return counters for every debouncer, keyed by name."""
+    return {d.name: d.stats() for d in _debouncers}
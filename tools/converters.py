@@ -1,94 +1,842 @@
 """Converter tools."""
 
+import base64
+import csv
+import datetime
+import functools
+import io
 import json
+import math
+import os
+import re
+import time
+import types
 import cacao as c
 
+from . import casing, coalesce, executor, files, json_stream, radix
+from .pager import Pager
+from .session_state import State, derived
+from .units import format_item_rate, format_rate
+
+YAML_CHUNK = 1 << 16
+STREAM_THRESHOLD = 8 << 20  # larger inputs are tokenized instead of json.loads'd
+_yaml_plain = re.compile(r"[A-Za-z_/][\w ./-]*").fullmatch
+_YAML_RESERVED = {"y", "n", "yes", "no", "on", "off", "true", "false", "null", "~"}
+# Characters json.dumps leaves raw that YAML reads as line breaks (NEL, LS, PS) or refuses
+# (DEL, C1 controls, surrogates, U+FFFE/U+FFFF) inside a double-quoted scalar
+_YAML_UNSAFE = re.compile("[\x7f-\x9f\u2028\u2029\ud800-\udfff\ufffe\uffff]")
+_YAML_ESCAPES = {"\x85": "\\N", "\u2028": "\\L", "\u2029": "\\P"}
+YAML_KEY_LIMIT = 1024  # characters; longer keys need the explicit "? key" form
+YAML_MISSING = "YAML to JSON needs PyYAML: pip install pyyaml"
+CSV_CHUNK = 1 << 16
+CSV_BATCH = 1000  # rows per csv.writer call
+# Numbers whose text survives a round trip (no leading zeros or "+")
+_csv_number = re.compile(r"-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?").fullmatch
+
 
 def render_all():
     """Render all converter tools."""
     with c.tabs():
         with c.tab("json_yaml", "JSON to YAML"):
             json_yaml_tool()
+        with c.tab("json_csv", "JSON to CSV"):
+            json_csv_tool()
         with c.tab("case", "Case Converter"):
             case_tool()
         with c.tab("number", "Number Base"):
             number_base_tool()
 
 
-def _to_yaml(data, indent=0):
-    """Convert data to YAML format."""
-    lines = []
-    prefix = "  " * indent
-    if isinstance(data, dict):
-        for key, value in data.items():
-            if isinstance(value, (dict, list)):
-                lines.append(f"{prefix}{key}:")
-                lines.append(_to_yaml(value, indent + 1))
+def _yaml_scalar(value):
+    """Render a JSON scalar (or mapping key) as a YAML flow scalar."""
+    kind = type(value)
+    if kind is str:
+        if _yaml_plain(value) and value[-1] != " " and value.lower() not in _YAML_RESERVED:
+            return value
+        # JSON string escapes are valid in YAML double-quoted scalars
+        return _YAML_UNSAFE.sub(_yaml_escape, json.dumps(value, ensure_ascii=False))
+    if kind is int:
+        return str(value)
+    if value is None:
+        return "null"
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    if kind is float:
+        if value != value:
+            return ".nan"
+        if value in (float("inf"), float("-inf")):
+            return ".inf" if value > 0 else "-.inf"
+        text = repr(value)
+        mantissa, e, exponent = text.partition("e")
+        if e and "." not in mantissa:
+            # YAML 1.1 resolves 1e+16 as a string; 1.0e+16 is a float
+            return f"{mantissa}.0e{exponent}"
+        return text
+    return _yaml_scalar(str(value))
+
+
+def _yaml_escape(m):
+    char = m.group()
+    code = ord(char)
+    return _YAML_ESCAPES.get(char) or (f"\\x{code:02x}" if code < 0x100 else f"\\u{code:04x}")
+
+
+def _iter_yaml(events, chunk_size=YAML_CHUNK):
+    """Render JSON parse events as block-style YAML, yielding text chunks.
+
+    Works iteratively over json_stream events, so nesting depth is bounded
+    only by memory and output is built once into chunks of about chunk_size
+    characters instead of being re-joined at every level.
+    """
+    out = []
+    size = 0
+    stack = []  # [is_map, indent, prefix of next entry, lead of pending value]
+    pending = None  # container whose emptiness is known only at the next event
+    keys = {}  # rendered mapping keys; documents repeat the same few keys
+
+    for kind, value in events:
+        if pending is not None:
+            is_map, lead, indent, in_list = pending
+            pending = None
+            if kind == ("end_map" if is_map else "end_array"):
+                line = lead + ("{}\n" if is_map else "[]\n")
+                out.append(line)
+                size += len(line)
+                continue
+            if in_list:
+                # Compact form: the first entry shares the "- " line
+                first = lead
             else:
-                lines.append(f"{prefix}{key}: {value}")
-    elif isinstance(data, list):
-        for item in data:
-            if isinstance(item, (dict, list)):
-                lines.append(f"{prefix}-")
-                lines.append(_to_yaml(item, indent + 1))
+                if lead:
+                    line = lead[:-1] + "\n"
+                    out.append(line)
+                    size += len(line)
+                first = " " * indent
+            stack.append([is_map, indent, first, None])
+
+        if kind == "end_map" or kind == "end_array":
+            stack.pop()
+            continue
+
+        if stack:
+            frame = stack[-1]
+            prefix = frame[2]
+            if frame[0]:
+                if kind == "key":
+                    key = keys.get(value)
+                    if key is None:
+                        key = _yaml_scalar(value)
+                        if len(keys) < 4096:
+                            keys[value] = key
+                    frame[2] = " " * frame[1]
+                    if len(key) > YAML_KEY_LIMIT:
+                        frame[3] = f"{prefix}? {key}\n{frame[2]}: "
+                    else:
+                        frame[3] = f"{prefix}{key}: "
+                    continue
+                lead = frame[3]
             else:
-                lines.append(f"{prefix}- {item}")
-    return "\n".join(lines)
+                frame[2] = " " * frame[1]
+                lead = prefix + "- "
+            indent = frame[1] + 2
+        else:
+            lead = ""
+            indent = 0
+
+        if kind == "value":
+            line = f"{lead}{_yaml_scalar(value)}\n"
+            out.append(line)
+            size += len(line)
+            if size >= chunk_size:
+                yield "".join(out)
+                out.clear()
+                size = 0
+        else:
+            pending = (kind == "start_map", lead, indent, bool(stack) and not stack[-1][0])
+
+    if out:
+        yield "".join(out)
+
+
+def _to_yaml(data):
+    """Convert data to YAML format."""
+    return "".join(_iter_yaml(json_stream.walk(data)))
+
+
+def _json_to_yaml(text):
+    """Convert a JSON document to YAML, returning (yaml, throughput report)."""
+    start = time.perf_counter()
+    if len(text) < STREAM_THRESHOLD:
+        events = json_stream.walk(json.loads(text))
+    else:
+        # Avoid materialising the whole object tree for huge documents
+        events = json_stream.iter_events((text,))
+    result = "".join(_iter_yaml(events))
+    elapsed = time.perf_counter() - start
+    return result, f"Converted {format_rate(len(text), elapsed)}"
+
+
+def _json_to_yaml_file(src, dst):
+    """Stream a JSON file at path src to YAML at path dst in bounded memory.
+
+    Both paths are under the file root. Returns a throughput report.
+    """
+    files.check_pair(src, dst)
+    start = time.perf_counter()
+    with files.open_read(src, "r", encoding="utf-8") as fin, \
+            files.open_write(dst, "w", encoding="utf-8") as fout:
+        for chunk in _iter_yaml(json_stream.iter_events(json_stream.iter_file(fin))):
+            fout.write(chunk)
+        size = fin.tell()
+    return f"Converted {format_rate(size, time.perf_counter() - start)}"
+
+
+@functools.lru_cache(maxsize=None)
+def _yaml():
+    """PyYAML with its fastest safe loader, or None if it is not installed.
+
+    libyaml's CSafeLoader parses several times faster than the pure-Python
+    SafeLoader; it is used whenever PyYAML was built against libyaml.
+    """
+    try:
+        import yaml
+    except ImportError:
+        return None
+    loader = getattr(yaml, "CSafeLoader", None)
+    return types.SimpleNamespace(load_all=yaml.load_all, Loader=loader or yaml.SafeLoader,
+                                 parser="libyaml" if loader else "pure-Python")
+
+
+def _json_default(value):
+    """JSON for the YAML types JSON lacks: timestamps, binary and sets."""
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    if isinstance(value, bytes):
+        return base64.b64encode(value).decode("ascii")
+    if isinstance(value, (set, frozenset)):
+        return [_json_safe(item) for item in sorted(value, key=str)]
+    raise TypeError(f"Cannot convert {type(value).__name__} to JSON")
+
+
+def _json_key(key):
+    """The string a YAML mapping key becomes in JSON."""
+    key = _json_safe(key)
+    if isinstance(key, str):
+        return key
+    if key is None or isinstance(key, (bool, int, float)):
+        return json.dumps(key)
+    return _json_default(key)
+
+
+def _json_safe(value):
+    """Copy a YAML document into values json.dumps takes as they are.
+
+    JSON has no NaN or infinities, so .nan, .inf and -.inf become the
+    strings "NaN", "Infinity" and "-Infinity". Keys that are not strings
+    (dates, numbers, null) become the text JSON would show for them;
+    raises ValueError when two keys of one mapping end up the same.
+    """
+    if isinstance(value, dict):
+        safe = {_json_key(key): _json_safe(item) for key, item in value.items()}
+        if len(safe) < len(value):
+            keys = [_json_key(key) for key in value]
+            duplicate = next(key for key in keys if keys.count(key) > 1)
+            raise ValueError(f"Two keys of one mapping both become {json.dumps(duplicate, ensure_ascii=False)} in JSON")
+        return safe
+    if isinstance(value, list):
+        return [_json_safe(item) for item in value]
+    if isinstance(value, float) and not math.isfinite(value):
+        return "NaN" if math.isnan(value) else "Infinity" if value > 0 else "-Infinity"
+    return value
+
+
+def _json_text(document):
+    return json.dumps(_json_safe(document), indent=2, ensure_ascii=False, allow_nan=False, default=_json_default)
+
+
+def _write_json_documents(documents, write):
+    """Write YAML documents as JSON, one at a time; returns how many there were.
+
+    A single document is written as itself, several as a JSON array.
+    """
+    count = 0
+    previous = None
+    for document in documents:
+        if count:
+            write(("[\n  " if count == 1 else ",\n  ") + _json_text(previous).replace("\n", "\n  "))
+        previous = document
+        count += 1
+    if count == 1:
+        write(_json_text(previous))
+    elif count:
+        write(",\n  " + _json_text(previous).replace("\n", "\n  ") + "\n]")
+    return count
+
+
+def _yaml_report(count, size, elapsed, parser):
+    documents = "1 document" if count == 1 else f"{count:,} documents"
+    return f"Parsed {documents}, {format_rate(size, elapsed)} with the {parser} parser"
+
+
+def _yaml_to_json(text):
+    """Convert a YAML stream to JSON, returning (json, throughput report)."""
+    yaml = _yaml()
+    if yaml is None:
+        raise ValueError(YAML_MISSING)
+    start = time.perf_counter()
+    parts = []
+    count = _write_json_documents(yaml.load_all(text, Loader=yaml.Loader), parts.append)
+    return "".join(parts), _yaml_report(count, len(text), time.perf_counter() - start, yaml.parser)
+
+
+def _yaml_to_json_file(src, dst):
+    """Convert the YAML stream in file src to JSON in file dst, one document in memory at a time.
+
+    Both paths are under the file root. Returns a throughput report.
+    """
+    yaml = _yaml()
+    if yaml is None:
+        raise ValueError(YAML_MISSING)
+    files.check_pair(src, dst)
+    start = time.perf_counter()
+    with files.open_read(src, "r", encoding="utf-8") as fin, \
+            files.open_write(dst, "w", encoding="utf-8") as fout:
+        count = _write_json_documents(yaml.load_all(fin, Loader=yaml.Loader), fout.write)
+        size = os.fstat(fin.fileno()).st_size
+    return _yaml_report(count, size, time.perf_counter() - start, yaml.parser)
+
+
+YAML_MODES = {"to_yaml": "JSON to YAML", "to_json": "YAML to JSON"}
 
 
 def json_yaml_tool():
-    """JSON to YAML converter."""
+    """JSON to YAML converter, and back."""
     output = c.signal("", name="yaml_out")
+    report = c.signal("", name="yaml_stats")
+    window = c.signal("", name="yaml_window")
+    mode = c.signal("to_yaml", name="yaml_mode")
+    mode_label = c.signal(f"Mode: {YAML_MODES['to_yaml']}", name="yaml_mode_label")
+    src_sig = c.signal("", name="yaml_src")
+    dst_sig = c.signal("", name="yaml_dst")
+    source = State("json_yaml_input", evict=False)  # latest input, converted again when the mode changes
+    typing = coalesce.Debouncer("json_yaml")
+    view = Pager("json_yaml", output, window)
 
     @c.on("convert_yaml")
     async def convert(session, event):
-        text = event.get("value", "").strip()
+        text = source.set(session, event.get("value", "").strip())
+        typing.push(session, text, run, on_error=publish_error)
+
+    def run(session, text):
         if not text:
-            output.set(session, "")
+            executor.cancel(session, "json_yaml")
+            view.clear(session)
+            report.set(session, "")
             return
+        # Pure-Python parse and emit holds the GIL, as does building libyaml's
+        # objects, so use a process
+        transform = _json_to_yaml if mode.get(session) == "to_yaml" else _yaml_to_json
+        executor.submit(session, "json_yaml", publish, transform, text, process=True, on_error=publish_error,
+                        cache=True)
+
+    def publish(session, converted):
+        view.publish(session, converted[0])
+        report.set(session, converted[1])
+
+    def publish_error(session, e):
+        view.clear(session, f"Error: {str(e)}")
+        report.set(session, "")
+
+    @c.on("yaml_prev_page")
+    async def prev_page(session, event):
+        view.page(session, -1)
+
+    @c.on("yaml_next_page")
+    async def next_page(session, event):
+        view.page(session, 1)
+
+    def choose(new_mode):
+        async def handler(session, event):
+            mode.set(session, new_mode)
+            mode_label.set(session, f"Mode: {YAML_MODES[new_mode]}")
+            run(session, source.get(session, ""))
+        return handler
+
+    c.on("yaml_to_yaml")(choose("to_yaml"))
+    c.on("yaml_to_json")(choose("to_json"))
+
+    @c.on("set_yaml_src")
+    async def set_src(session, event):
+        src_sig.set(session, event.get("value", ""))
+
+    @c.on("set_yaml_dst")
+    async def set_dst(session, event):
+        dst_sig.set(session, event.get("value", ""))
+
+    @c.on("yaml_convert_file")
+    async def convert_file(session, event):
+        src = src_sig.get(session).strip()
+        dst = dst_sig.get(session).strip()
+        if not files.enabled():
+            report.set(session, files.DISABLED)
+            return
+        if not src or not dst:
+            report.set(session, "Enter an input and an output file path")
+            return
+        # Only the report is shown; the files' contents never reach the browser
+        report.set(session, f"Converting {src}...")
+        transform = _json_to_yaml_file if mode.get(session) == "to_yaml" else _yaml_to_json_file
+        executor.submit(session, "json_yaml_file", report.set, transform, src, dst, process=True,
+                        on_error=publish_file_error)
+
+    def publish_file_error(session, e):
+        report.set(session, f"Error: {str(e)}")
+
+    with c.card():
+        c.text("Convert JSON to YAML, or YAML (including multi-document streams) to JSON.", color="muted")
+        c.spacer()
+
+        with c.row(justify="start"):
+            c.button("JSON to YAML", on_click="yaml_to_yaml", variant="primary")
+            c.button("YAML to JSON", on_click="yaml_to_json", variant="outline")
+        c.text(mode_label, size="sm", color="muted")
+
+        c.spacer()
+
+        with c.row():
+            with c.col(span=6):
+                c.textarea(label="Input", placeholder='{"key": "value", "array": [1, 2, 3]}', rows=10, on_change="convert_yaml")
+                c.spacer()
+                c.input("Input File", placeholder=files.hint(), on_change="set_yaml_src")
+                c.input("Output File", placeholder=files.hint(), on_change="set_yaml_dst")
+                c.button("Convert File", on_click="yaml_convert_file", variant="outline")
+
+            with c.col(span=6):
+                c.text("Output", size="sm", color="muted")
+                c.code(output, language="text")  # YAML or JSON, depending on the mode
+                c.text(report, size="sm", color="muted")
+                c.text(window, size="sm", color="muted")
+                with c.row(justify="start"):
+                    c.button("Previous", on_click="yaml_prev_page", variant="outline", size="sm")
+                    c.button("Next", on_click="yaml_next_page", variant="outline", size="sm")
+
+
+def _csv_cell(value):
+    """Render a flattened JSON value as a CSV cell."""
+    if value is None:
+        return ""
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+def _flatten(item):
+    """Flatten nested objects into one dict with dotted keys.
+
+    Arrays and empty objects stay whole and become JSON-encoded cells.
+    A dotted key that also arises from nesting ({"a.b": 1, "a": {"b": 2}})
+    would lose a value, so it raises ValueError.
+    """
+    if not isinstance(item, dict):
+        return {"value": item}
+    flat = {}
+    stack = [("", iter(item.items()))]
+    while stack:
+        prefix, entries = stack[-1]
+        for key, value in entries:
+            key = f"{prefix}{key}"
+            if isinstance(value, dict) and value:
+                stack.append((key + ".", iter(value.items())))
+                break
+            if key in flat:
+                raise ValueError(f'Column "{key}" would hold two values; rename the dotted key')
+            flat[key] = value
+        else:
+            stack.pop()
+    return flat
+
+
+def _csv_columns(items):
+    """Collect every flattened column name in first-seen order, in one pass."""
+    columns = {}
+    for item in items:
+        for key in _flatten(item):
+            if key not in columns:
+                columns[key] = None
+    return list(columns)
+
+
+def _iter_csv(items, columns, stats, chunk_size=CSV_CHUNK):
+    """Write items as CSV rows under columns, yielding text chunks.
+
+    Rows go through csv.writer in batches into one reused buffer;
+    stats["rows"] counts rows written.
+    """
+    if not columns:
+        yield ""  # no objects with fields, so no header either
+        return
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    writer.writerow(columns)
+    batch = []
+    for item in items:
+        flat = _flatten(item)
+        batch.append([_csv_cell(flat.get(column)) for column in columns])
+        if len(batch) >= CSV_BATCH:
+            writer.writerows(batch)
+            stats["rows"] += len(batch)
+            batch.clear()
+            if buf.tell() >= chunk_size:
+                yield buf.getvalue()
+                buf.seek(0)
+                buf.truncate()
+    writer.writerows(batch)
+    stats["rows"] += len(batch)
+    yield buf.getvalue()
+
+
+def _finite_float(text):
+    """float(text), refusing values JSON cannot hold (1e400 overflows to inf)."""
+    value = float(text)
+    if not math.isfinite(value):
+        raise ValueError(f"{text} is out of range")
+    return value
+
+
+def _no_constant(name):
+    raise ValueError(f"{name} is not JSON")
+
+
+def _json_value(cell):
+    """Infer the JSON value of a CSV cell, keeping text that would not round-trip."""
+    if cell == "":
+        return None
+    if cell == "true":
+        return True
+    if cell == "false":
+        return False
+    if _csv_number(cell):
+        if "." in cell or "e" in cell or "E" in cell:
+            value = float(cell)
+            return value if math.isfinite(value) else cell  # 1e400 stays text; JSON has no Infinity
+        return int(cell)
+    if cell[0] in "[{":
         try:
-            data = json.loads(text)
-            result = _to_yaml(data)
-            output.set(session, result)
-        except Exception as e:
-            output.set(session, f"Error: {str(e)}")
+            return json.loads(cell, parse_float=_finite_float, parse_constant=_no_constant)
+        except ValueError:
+            pass
+    return cell
+
+
+def _unflatten(row):
+    """Rebuild nested objects from dotted column names.
+
+    A column that collides with a scalar keeps its dotted name at the top
+    level; one whose name is already taken there by nested columns ("a"
+    after "a.b") raises ValueError.
+    """
+    nested = {}
+    for key, value in row.items():
+        node = nested
+        *parents, leaf = key.split(".")
+        for part in parents:
+            child = node.setdefault(part, {})
+            if not isinstance(child, dict):
+                node = None
+                break
+            node = child
+        if node is None or isinstance(node.get(leaf), dict):
+            if key in nested:
+                raise ValueError(f'Column "{key}" collides with the nested columns "{key}.*"')
+            nested[key] = value
+        else:
+            node[leaf] = value
+    return nested
+
+
+def _iter_csv_json(lines, stats, chunk_size=CSV_CHUNK):
+    """Read CSV rows lazily from lines and yield a JSON array in text chunks."""
+    reader = csv.reader(lines)
+    header = next(reader, None)
+    if header is None:
+        yield "[]"
+        return
+    seen = set()
+    duplicates = sorted({key for key in header if key in seen or seen.add(key)})
+    if duplicates:
+        raise ValueError("Duplicate CSV column: " + ", ".join(f'"{key}"' for key in duplicates))
+    out = ["["]
+    size = 0
+    sep = "\n  "
+    for row in reader:
+        if not row:
+            continue
+        item = _unflatten({key: _json_value(cell) for key, cell in zip(header, row)})
+        text = sep + json.dumps(item, ensure_ascii=False, allow_nan=False)
+        sep = ",\n  "
+        out.append(text)
+        size += len(text)
+        stats["rows"] += 1
+        if size >= chunk_size:
+            yield "".join(out)
+            out.clear()
+            size = 0
+    out.append("\n]" if stats["rows"] else "]")
+    yield "".join(out)
+
+
+def _convert_csv(text, mode):
+    """Convert JSON to CSV ("to_csv") or CSV to JSON, returning (output, report)."""
+    start = time.perf_counter()
+    stats = {"rows": 0}
+    if mode == "to_csv" and len(text) < STREAM_THRESHOLD:
+        data = json.loads(text)
+        items = data if isinstance(data, list) else [data]
+        result = "".join(_iter_csv(items, _csv_columns(items), stats))
+    elif mode == "to_csv":
+        # Column inference and row emission are two passes over the text,
+        # holding one item at a time instead of a list of every row
+        columns = _csv_columns(json_stream.iter_array((text,)))
+        result = "".join(_iter_csv(json_stream.iter_array((text,)), columns, stats))
+    else:
+        result = "".join(_iter_csv_json(io.StringIO(text, newline=""), stats))
+    return result, f"Converted {format_item_rate(stats['rows'], 'rows', time.perf_counter() - start)}"
+
+
+def _convert_csv_file(src, dst, mode):
+    """Stream a JSON array file to CSV ("to_csv"), or a CSV file to JSON.
+
+    Both paths are under the file root, and memory stays constant in the
+    number of rows. Returns a throughput report.
+    """
+    files.check_pair(src, dst)
+    start = time.perf_counter()
+    stats = {"rows": 0}
+    with files.open_read(src, "r", encoding="utf-8", newline="") as fin, \
+            files.open_write(dst, "w", encoding="utf-8", newline="") as fout:
+        if mode == "to_csv":
+            columns = _csv_columns(json_stream.iter_array(json_stream.iter_file(fin)))
+            fin.seek(0)
+            chunks = _iter_csv(json_stream.iter_array(json_stream.iter_file(fin)), columns, stats)
+        else:
+            chunks = _iter_csv_json(fin, stats)
+        for chunk in chunks:
+            fout.write(chunk)
+    return f"Converted {format_item_rate(stats['rows'], 'rows', time.perf_counter() - start)}"
+
+
+CSV_MODES = {"to_csv": "JSON to CSV", "to_json": "CSV to JSON"}
+
+
+def json_csv_tool():
+    """JSON to CSV converter."""
+    output = c.signal("", name="csv_out")
+    report = c.signal("", name="csv_stats")
+    window = c.signal("", name="csv_window")
+    mode = c.signal("to_csv", name="csv_mode")
+    mode_label = c.signal(f"Mode: {CSV_MODES['to_csv']}", name="csv_mode_label")
+    derived(report)
+    source = State("json_csv_input", evict=False)  # latest input, converted again when the mode changes
+    typing = coalesce.Debouncer("json_csv")
+    view = Pager("json_csv", output, window)
+
+    @c.on("convert_csv")
+    async def convert(session, event):
+        text = source.set(session, event.get("value", "").strip())
+        typing.push(session, text, run, on_error=publish_error)
+
+    def run(session, text):
+        if not text:
+            executor.cancel(session, "json_csv")
+            view.clear(session)
+            report.set(session, "")
+            return
+        executor.submit(session, "json_csv", publish, _convert_csv, text, mode.get(session), process=True,
+                        on_error=publish_error)
+
+    def publish(session, converted):
+        view.publish(session, converted[0])
+        report.set(session, converted[1])
+
+    def publish_error(session, e):
+        view.clear(session, f"Error: {str(e)}")
+        report.set(session, "")
+
+    @c.on("csv_prev_page")
+    async def prev_page(session, event):
+        view.page(session, -1)
+
+    @c.on("csv_next_page")
+    async def next_page(session, event):
+        view.page(session, 1)
+
+    def choose(new_mode):
+        async def handler(session, event):
+            mode.set(session, new_mode)
+            mode_label.set(session, f"Mode: {CSV_MODES[new_mode]}")
+            run(session, source.get(session, ""))
+        return handler
+
+    c.on("csv_to_csv")(choose("to_csv"))
+    c.on("csv_to_json")(choose("to_json"))
 
     with c.card():
-        c.text("Convert JSON to YAML format.", color="muted")
+        c.text("Convert between JSON arrays of objects and CSV. Nested keys become dotted columns.", color="muted")
+        c.spacer()
+
+        with c.row(justify="start"):
+            c.button("JSON to CSV", on_click="csv_to_csv", variant="primary")
+            c.button("CSV to JSON", on_click="csv_to_json", variant="outline")
+        c.text(mode_label, size="sm", color="muted")
+
         c.spacer()
 
         with c.row():
             with c.col(span=6):
-                c.textarea(label="JSON Input", placeholder='{"key": "value", "array": [1, 2, 3]}', rows=10, on_change="convert_yaml")
+                c.textarea(label="Input", placeholder='[{"id": 1, "user": {"name": "Ada"}}]', rows=10, on_change="convert_csv")
 
             with c.col(span=6):
-                c.text("YAML Output", size="sm", color="muted")
-                c.code(output, language="yaml")
+                c.text("Output", size="sm", color="muted")
+                c.code(output, language="text")  # CSV or JSON, depending on the mode
+                c.text(report, size="sm", color="muted")
+                c.text(window, size="sm", color="muted")
+                with c.row(justify="start"):
+                    c.button("Previous", on_click="csv_prev_page", variant="outline", size="sm")
+                    c.button("Next", on_click="csv_next_page", variant="outline", size="sm")
+
+
+CASE_DISPLAY_LIMIT = 10_000  # converted lines shown; larger lists belong in a file
+
+
+def _case_batch(text, style):
+    """Convert one identifier per line to style; returns (text, report)."""
+    start = time.perf_counter()
+    lines = text.splitlines()
+    output = "\n".join(casing.iter_convert(lines[:CASE_DISPLAY_LIMIT], style))
+    report = format_item_rate(min(len(lines), CASE_DISPLAY_LIMIT), "lines", time.perf_counter() - start)
+    if len(lines) > CASE_DISPLAY_LIMIT:
+        report += f"; {len(lines) - CASE_DISPLAY_LIMIT:,} more lines not shown"
+        if files.enabled():
+            report += ", convert them as a file"
+    return output, report
+
+
+def _case_file(src, dst, style):
+    """Stream the lines of the file at src to dst in style, both under the file root; returns a report."""
+    files.check_pair(src, dst)
+    start = time.perf_counter()
+    count = 0
+    with files.open_read(src, "r", encoding="utf-8") as fin, \
+            files.open_write(dst, "w", encoding="utf-8") as fout:
+        lines = (line.rstrip("\r\n") for line in fin)
+        batch = []
+        for converted in casing.iter_convert(lines, style):
+            batch.append(converted)
+            if len(batch) == casing.BATCH:
+                fout.write("\n".join(batch) + "\n")
+                count += len(batch)
+                batch = []
+        if batch:
+            fout.write("\n".join(batch) + "\n")
+            count += len(batch)
+    return f"{src} to {dst}: " + format_item_rate(count, "lines", time.perf_counter() - start)
+
+
+def _case_event(style):
+    return "case_style_" + re.sub(r"\W+", "_", style.lower())
 
 
 def case_tool():
     """Case converter."""
     results = c.signal("", name="case_out")
+    style_sig = c.signal("snake_case", name="case_style")
+    bulk_sig = c.signal("", name="case_bulk")
+    bulk_out = c.signal("", name="case_bulk_out")
+    bulk_report = c.signal("", name="case_bulk_stats")
+    src_sig = c.signal("", name="case_src")
+    dst_sig = c.signal("", name="case_dst")
+    derived(results, bulk_out, bulk_report)
+    typing = coalesce.Debouncer("case")
 
     @c.on("convert_case")
     async def convert(session, event):
-        text = event.get("value", "")
+        typing.push(session, event.get("value", ""), run, on_error=publish_text_error)
+
+    def run(session, text):
         if not text:
             results.set(session, "")
             return
 
-        words = text.replace("-", " ").replace("_", " ").split()
-        output_lines = [
-            f"lowercase:     {text.lower()}",
-            f"UPPERCASE:     {text.upper()}",
-            f"Title Case:    {text.title()}",
-            f"camelCase:     {words[0].lower() + ''.join(w.capitalize() for w in words[1:]) if words else ''}",
-            f"PascalCase:    {''.join(w.capitalize() for w in words)}",
-            f"snake_case:    {'_'.join(w.lower() for w in words)}",
-            f"kebab-case:    {'-'.join(w.lower() for w in words)}",
-            f"CONSTANT_CASE: {'_'.join(w.upper() for w in words)}",
-        ]
-        results.set(session, "\n".join(output_lines))
+        converted = casing.convert_all(text)
+        results.set(session, "\n".join(f"{name + ':':<14} {value}" for name, value in converted.items()))
+
+    def publish_text_error(session, e):
+        results.set(session, f"Error: {str(e)}")
+
+    def choose(style):
+        async def handler(session, event):
+            style_sig.set(session, style)
+            if bulk_sig.get(session).strip():
+                await convert_all(session, event)
+        return handler
+
+    for style in casing.STYLES:
+        c.on(_case_event(style))(choose(style))
+
+    @c.on("set_case_bulk")
+    async def set_bulk(session, event):
+        bulk_sig.set(session, event.get("value", ""))
+
+    @c.on("case_convert_all")
+    async def convert_all(session, event):
+        text = bulk_sig.get(session)
+        if not text.strip():
+            bulk_out.set(session, "Enter one identifier per line")
+            bulk_report.set(session, "")
+            return
+        # Regex tokenising holds the GIL, so use a process
+        executor.submit(session, "case_bulk", publish_bulk, _case_batch, text, style_sig.get(session),
+                        process=True, on_error=publish_error, cache=True)
+
+    @c.on("set_case_src")
+    async def set_src(session, event):
+        src_sig.set(session, event.get("value", "").strip())
+
+    @c.on("set_case_dst")
+    async def set_dst(session, event):
+        dst_sig.set(session, event.get("value", "").strip())
+
+    @c.on("case_convert_file")
+    async def convert_file(session, event):
+        src = src_sig.get(session)
+        dst = dst_sig.get(session)
+        if not files.enabled():
+            bulk_report.set(session, files.DISABLED)
+            return
+        if not src or not dst:
+            bulk_report.set(session, "Enter an input and an output file path")
+            return
+        # Only the report is shown; the files' contents never reach the browser
+        bulk_report.set(session, f"Converting {src}...")
+        executor.submit(session, "case_file", bulk_report.set, _case_file, src, dst, style_sig.get(session),
+                        process=True, on_error=publish_file_error)
+
+    def publish_bulk(session, converted):
+        bulk_out.set(session, converted[0])
+        bulk_report.set(session, converted[1])
+
+    def publish_error(session, e):
+        bulk_out.set(session, f"Error: {str(e)}")
+        bulk_report.set(session, "")
+
+    def publish_file_error(session, e):
+        bulk_report.set(session, f"Error: {str(e)}")
 
     with c.card():
         c.text("Convert text between different case formats.", color="muted")
@@ -101,36 +849,194 @@ def case_tool():
         c.text("Results", size="sm", color="muted")
         c.code(results)
 
+    c.spacer()
+
+    with c.card():
+        c.text("Convert a list of identifiers, one per line, or a file of them, to one style.", color="muted")
+        c.spacer()
+
+        with c.row(justify="start"):
+            for style in casing.STYLES:
+                c.button(style, on_click=_case_event(style), variant="primary" if style == "snake_case" else "outline")
+        c.text(style_sig, size="sm", color="muted")
+
+        c.spacer()
+
+        with c.row():
+            with c.col(span=6):
+                c.textarea(label="Identifiers", placeholder="HTTPServerError\nparseXMLDocument\n...", rows=8,
+                           on_change="set_case_bulk")
+                c.spacer()
+                c.button("Convert All", on_click="case_convert_all", variant="primary")
+                c.spacer()
+                c.input("Input File", placeholder=files.hint(), on_change="set_case_src")
+                c.input("Output File", placeholder=files.hint(), on_change="set_case_dst")
+                c.spacer()
+                c.button("Convert File", on_click="case_convert_file", variant="outline")
+
+            with c.col(span=6):
+                c.text("Converted", size="sm", color="muted")
+                c.code(bulk_out)
+                c.text(bulk_report, size="sm", color="muted")
+
+
+NUMBER_DISPLAY = 10_000  # digits shown per converted value
+NUMBER_TARGETS = (2, 8, 10, 16)
+
+
+def _parse_base(text):
+    """Read a base typed by the user; raises ValueError unless radix supports it."""
+    try:
+        base = int(text.strip())
+    except ValueError:
+        base = 0
+    if base not in radix.BASES:
+        raise ValueError("Base must be 2-36, 58 or 62")
+    return base
+
+
+def _clip_digits(digits):
+    if len(digits) <= NUMBER_DISPLAY:
+        return digits
+    half = NUMBER_DISPLAY // 2
+    return f"{digits[:half]}...{digits[-half:]} ({len(digits):,} digits)"
+
+
+def _convert_number(text, from_base, to_base):
+    """Show a number in binary, octal, decimal, hex and to_base; returns (text, report)."""
+    start = time.perf_counter()
+    num = radix.parse(text, from_base)
+    lines = []
+    for base in NUMBER_TARGETS + ((to_base,) if to_base not in NUMBER_TARGETS else ()):
+        label = radix.BASE_NAMES.get(base, f"Base {base}") + ":"
+        lines.append(f"{label:<12} {_clip_digits(radix.to_string(num, base))}")
+    elapsed = time.perf_counter() - start
+    return "\n".join(lines), f"{num.bit_length():,} bits, converted in {elapsed * 1000:,.1f} ms"
+
+
+def _convert_numbers(text, from_base, to_base):
+    """Convert one number per line; returns (text, report). Bad lines show their error."""
+    start = time.perf_counter()
+    lines = []
+    count = 0
+    for line in text.splitlines():
+        if not line.strip():
+            lines.append("")
+            continue
+        count += 1
+        try:
+            lines.append(radix.convert(line, from_base, to_base))
+        except ValueError as e:
+            lines.append(f"Error: {str(e)}")
+    return "\n".join(lines), format_item_rate(count, "values", time.perf_counter() - start)
+
 
 def number_base_tool():
     """Number base converter."""
     results = c.signal("", name="base_out")
+    report = c.signal("", name="base_stats")
+    value_sig = c.signal("", name="base_value")
+    from_sig = c.signal(10, name="base_from")
+    to_sig = c.signal(36, name="base_to")
+    bulk_sig = c.signal("", name="base_bulk")
+    bulk_out = c.signal("", name="base_bulk_out")
+    bulk_report = c.signal("", name="base_bulk_stats")
+    derived(results, report, bulk_out, bulk_report)
+    typing = coalesce.Debouncer("number_base")
 
     @c.on("convert_base")
     async def convert(session, event):
-        value = event.get("value", "").strip()
+        value_sig.set(session, event.get("value", ""))
+        typing.push(session, None, run, on_error=publish_error)
+
+    def set_base(signal):
+        async def handler(session, event):
+            try:
+                signal.set(session, _parse_base(event.get("value", "")))
+            except ValueError as e:
+                results.set(session, f"Error: {str(e)}")
+                report.set(session, "")
+                return
+            run(session, None)
+        return handler
+
+    c.on("set_base_from")(set_base(from_sig))
+    c.on("set_base_to")(set_base(to_sig))
+
+    def run(session, _value):
+        value = value_sig.get(session).strip()
         if not value:
+            executor.cancel(session, "number_base")
             results.set(session, "")
+            report.set(session, "")
             return
-        try:
-            num = int(value, 10)
-            output_lines = [
-                f"Binary:      {bin(num)[2:]}",
-                f"Octal:       {oct(num)[2:]}",
-                f"Decimal:     {num}",
-                f"Hexadecimal: {hex(num)[2:].upper()}",
-            ]
-            results.set(session, "\n".join(output_lines))
-        except ValueError:
-            results.set(session, "Error: Invalid decimal number")
+        # Big-int arithmetic holds the GIL, so use a process for huge numbers
+        executor.submit(session, "number_base", publish, _convert_number, value, from_sig.get(session),
+                        to_sig.get(session), process=len(value) > NUMBER_DISPLAY, on_error=publish_error,
+                        cache=True)
+
+    def publish(session, converted):
+        results.set(session, converted[0])
+        report.set(session, converted[1])
+
+    def publish_error(session, e):
+        results.set(session, f"Error: {str(e)}")
+        report.set(session, "")
+
+    @c.on("set_base_bulk")
+    async def set_bulk(session, event):
+        bulk_sig.set(session, event.get("value", ""))
+
+    @c.on("base_convert_all")
+    async def convert_all(session, event):
+        text = bulk_sig.get(session)
+        if not text.strip():
+            bulk_out.set(session, "Enter one number per line")
+            bulk_report.set(session, "")
+            return
+        bulk_report.set(session, "Converting...")
+        executor.submit(session, "number_base_bulk", publish_bulk, _convert_numbers, text, from_sig.get(session),
+                        to_sig.get(session), process=True, on_error=publish_bulk_error, cache=True)
+
+    def publish_bulk(session, converted):
+        bulk_out.set(session, converted[0])
+        bulk_report.set(session, converted[1])
+
+    def publish_bulk_error(session, e):
+        bulk_out.set(session, f"Error: {str(e)}")
+        bulk_report.set(session, "")
 
     with c.card():
-        c.text("Convert numbers between binary, octal, decimal, and hexadecimal.", color="muted")
+        c.text("Convert whole numbers of any size between bases 2-36, base 58 and base 62.", color="muted")
         c.spacer()
 
-        c.input("Decimal Number", placeholder="Enter a decimal number (e.g., 255)...", on_change="convert_base")
+        with c.row():
+            c.input("From Base", placeholder="10", on_change="set_base_from")
+            c.input("To Base", placeholder="36", on_change="set_base_to")
+
+        c.spacer()
+
+        c.input("Number", placeholder="Enter a number (e.g., 255)...", on_change="convert_base")
 
         c.spacer()
 
         c.text("Conversions", size="sm", color="muted")
         c.code(results)
+        c.text(report, size="sm", color="muted")
+
+    c.spacer()
+
+    with c.card():
+        c.text("Convert a list of numbers, one per line, from the From Base to the To Base.", color="muted")
+        c.spacer()
+
+        with c.row():
+            with c.col(span=6):
+                c.textarea(label="Numbers", placeholder="One number per line...", rows=8, on_change="set_base_bulk")
+                c.spacer()
+                c.button("Convert All", on_click="base_convert_all", variant="primary")
+
+            with c.col(span=6):
+                c.text("Converted", size="sm", color="muted")
+                c.code(bulk_out)
+                c.text(bulk_report, size="sm", color="muted")
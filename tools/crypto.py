@@ -1,9 +1,18 @@
 """Cryptography and hashing tools."""
 
+import asyncio
 import hashlib
-import hmac as hmac_lib
+import mmap
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 import cacao as c
 
+from . import coalesce, executor, files, hmac_engine
+from .session_state import derived
+from .units import format_bytes, format_item_rate, format_rate
+
 
 def render_all():
     """Render all crypto tools."""
@@ -14,69 +23,331 @@ def render_all():
             hmac_tool()
 
 
+HASH_ALGORITHMS = {
+    "MD5": "md5",
+    "SHA-1": "sha1",
+    "SHA-256": "sha256",
+    "SHA-384": "sha384",
+    "SHA-512": "sha512",
+    "SHA3-256": "sha3_256",
+    "SHA3-512": "sha3_512",
+    "BLAKE2b": "blake2b",
+    "BLAKE2s": "blake2s",
+}
+HASH_PRESETS = {
+    "standard": ["MD5", "SHA-1", "SHA-256", "SHA-512"],
+    "sha3": ["SHA3-256", "SHA3-512"],
+    "blake2": ["BLAKE2b", "BLAKE2s"],
+    "all": list(HASH_ALGORITHMS),
+}
+HASH_CHUNK = 4 << 20  # bytes fed to every hasher per step; large enough that hashlib drops the GIL
+PROGRESS_INTERVAL = 0.25  # seconds between progress reports
+
+
+class _HashCancelled(Exception):
+    pass
+
+
+def _format_digests(hashers):
+    width = max(len(name) for name in hashers) + 1
+    return "\n".join(f"{name + ':':<{width}} {h.hexdigest()}" for name, h in hashers.items())
+
+
+def _hash_digests(text, names=HASH_PRESETS["standard"]):
+    """Format the selected digests of text."""
+    data = text.encode("utf-8")
+    return _format_digests({name: hashlib.new(HASH_ALGORITHMS[name], data) for name in names})
+
+
+def _iter_file_chunks(f, size=HASH_CHUNK):
+    """Yield a file's contents as buffers of up to size bytes.
+
+    Regular files are memory-mapped and sliced without copying; anything
+    mmap refuses (pipes, empty or special files) is read into one reused
+    buffer instead.
+    """
+    try:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        mapped = None
+    if mapped is not None:
+        with mapped, memoryview(mapped) as view:
+            for start in range(0, len(view), size):
+                # Release each slice so the map can be closed afterwards
+                with view[start:start + size] as chunk:
+                    yield chunk
+        return
+    buf = bytearray(size)
+    with memoryview(buf) as view:
+        while True:
+            n = f.readinto(buf)
+            if not n:
+                return
+            with view[:n] as chunk:
+                yield chunk
+
+
+def _hash_file(path, names, progress=None):
+    """Hash a regular file under the file root with every selected algorithm in one read pass.
+
+    Returns (digests, report). progress(done, total) is called after each
+    chunk and may raise to abort.
+    """
+    hashers = {name: hashlib.new(HASH_ALGORITHMS[name]) for name in names}
+    updates = [h.update for h in hashers.values()]
+    start = time.perf_counter()
+    done = 0
+    # hashlib drops the GIL while hashing a chunk, so with several algorithms
+    # each chunk is fed to all of them at once from a private pool
+    workers = ThreadPoolExecutor(len(updates)) if len(updates) > 1 and (os.cpu_count() or 1) > 1 else None
+    try:
+        with files.open_read(path) as f:
+            total = os.fstat(f.fileno()).st_size
+            for chunk in _iter_file_chunks(f):
+                if workers is None:
+                    for update in updates:
+                        update(chunk)
+                else:
+                    for future in [workers.submit(update, chunk) for update in updates]:
+                        future.result()
+                done += len(chunk)
+                if progress is not None:
+                    progress(done, total)
+    finally:
+        if workers is not None:
+            workers.shutdown()
+    return _format_digests(hashers), format_rate(done, time.perf_counter() - start)
+
+
 def hash_tool():
     """Hash generator."""
     results = c.signal("", name="hash_out")
+    algorithms = c.signal(HASH_PRESETS["standard"], name="hash_algorithms")
+    text_sig = c.signal("", name="hash_text")
+    path_sig = c.signal("", name="hash_path")
+    report = c.signal("", name="hash_progress")
+    derived(results, report)
+    running = {}  # session id -> threading.Event that stops its file hash
+    typing = coalesce.Debouncer("hash")
 
     @c.on("compute_hash")
     async def compute(session, event):
-        text = event.get("value", "")
+        text_sig.set(session, event.get("value", ""))
+        typing.push(session, None, run, on_error=publish_error)
+
+    def run(session, _value):
+        text = text_sig.get(session)
         if not text:
+            executor.cancel(session, "hash")
             results.set(session, "")
             return
+        # hashlib releases the GIL on large buffers, so threads are enough
+        executor.submit(session, "hash", results.set, _hash_digests, text, algorithms.get(session), cache=True)
+
+    def publish_error(session, e):
+        results.set(session, f"Error: {str(e)}")
+
+    def choose(preset):
+        async def handler(session, event):
+            algorithms.set(session, HASH_PRESETS[preset])
+            if text_sig.get(session):
+                run(session, None)
+        return handler
+
+    for preset in HASH_PRESETS:
+        c.on(f"hash_preset_{preset}")(choose(preset))
+
+    @c.on("set_hash_path")
+    async def set_path(session, event):
+        path_sig.set(session, event.get("value", ""))
+
+    @c.on("hash_file")
+    async def hash_file(session, event):
+        stop_file(session)
+        path = path_sig.get(session).strip()
+        if not files.enabled():
+            report.set(session, files.DISABLED)
+            return
+        if not path:
+            report.set(session, "Enter a file path")
+            return
+        stop = running[session.id] = threading.Event()
+        loop = asyncio.get_running_loop()
+        last = [0.0, time.perf_counter()]  # time of last report, start time
 
-        data = text.encode("utf-8")
-        output_lines = [
-            f"MD5:     {hashlib.md5(data).hexdigest()}",
-            f"SHA-1:   {hashlib.sha1(data).hexdigest()}",
-            f"SHA-256: {hashlib.sha256(data).hexdigest()}",
-            f"SHA-512: {hashlib.sha512(data).hexdigest()}",
-        ]
-        results.set(session, "\n".join(output_lines))
+        def progress(done, total):
+            if stop.is_set():
+                raise _HashCancelled()
+            now = time.perf_counter()
+            if now - last[0] >= PROGRESS_INTERVAL:
+                last[0] = now
+                percent = f" ({done * 100 // total}%)" if total else ""
+                text = f"Hashing: {format_bytes(done)} of {format_bytes(total)}{percent}, " \
+                       f"{format_bytes(done / max(now - last[1], 1e-9))}/s"
+                loop.call_soon_threadsafe(report.set, session, text)
+
+        def publish(session, hashed):
+            running.pop(session.id, None)
+            results.set(session, hashed[0])
+            report.set(session, f"{path}: {hashed[1]}")
+
+        def publish_error(session, e):
+            running.pop(session.id, None)
+            if not isinstance(e, _HashCancelled):
+                report.set(session, f"Error: {str(e)}")
+
+        report.set(session, f"Hashing {path}...")
+        executor.submit(session, "hash_file", publish, _hash_file, path, algorithms.get(session), progress,
+                        on_error=publish_error)
+
+    @c.on("hash_file_cancel")
+    async def cancel_file(session, event):
+        if stop_file(session):
+            report.set(session, "Cancelled")
+
+    def stop_file(session):
+        stop = running.pop(session.id, None)
+        executor.cancel(session, "hash_file")
+        if stop is None:
+            return False
+        # The worker thread cannot be interrupted; it stops at the next chunk
+        stop.set()
+        return True
 
     with c.card():
-        c.text("Generate cryptographic hashes from text.", color="muted")
+        c.text("Generate cryptographic hashes from text or a file.", color="muted")
+        c.spacer()
+
+        with c.row(justify="start"):
+            c.button("MD5/SHA", on_click="hash_preset_standard", variant="primary")
+            c.button("SHA-3", on_click="hash_preset_sha3", variant="outline")
+            c.button("BLAKE2", on_click="hash_preset_blake2", variant="outline")
+            c.button("All", on_click="hash_preset_all", variant="outline")
+
         c.spacer()
 
         c.textarea(label="Text", placeholder="Enter text to hash...", rows=4, on_change="compute_hash")
 
         c.spacer()
 
+        with c.row():
+            c.input("File Path", placeholder=files.hint(), on_change="set_hash_path")
+            c.button("Hash File", on_click="hash_file", variant="primary")
+            c.button("Cancel", on_click="hash_file_cancel", variant="outline")
+        c.text(report, size="sm", color="muted")
+
+        c.spacer()
+
         c.text("Hash Results", size="sm", color="muted")
         c.code(results)
 
 
+def _hmac_text(key, msg, digest="SHA-256"):
+    """Format the HMAC of msg under key."""
+    return f"HMAC-{digest}:\n{hmac_engine.sign(key.encode(), msg.encode(), digest).hex()}"
+
+
+def _hmac_batch(key, text, digest, mode):
+    """Sign or verify newline-separated messages; returns (output, report)."""
+    start = time.perf_counter()
+    lines = text.splitlines()
+    if mode == "sign":
+        output = "\n".join(hmac_engine.sign_lines(key.encode(), lines, digest))
+        return output, format_item_rate(len(lines), "messages", time.perf_counter() - start)
+
+    failures = hmac_engine.verify_lines(key.encode(), lines, digest)
+    checked = sum(1 for line in lines if line.strip())
+    elapsed = time.perf_counter() - start
+    summary = [f"{checked - len(failures):,} of {checked:,} signatures valid ({digest})"]
+    summary.extend(f"  line {number}: {problem}" for number, problem in failures[:hmac_engine.LIST_LIMIT])
+    if len(failures) > hmac_engine.LIST_LIMIT:
+        summary.append(f"  ... {len(failures) - hmac_engine.LIST_LIMIT:,} more")
+    return "\n".join(summary), format_item_rate(checked, "messages", elapsed)
+
+
 def hmac_tool():
     """HMAC generator."""
     message_sig = c.signal("", name="hmac_msg")
     key_sig = c.signal("", name="hmac_key")
+    digest_sig = c.signal("SHA-256", name="hmac_digest")
     result = c.signal("Enter message and key", name="hmac_out")
+    batch_sig = c.signal("", name="hmac_batch")
+    batch_out = c.signal("", name="hmac_batch_out")
+    batch_report = c.signal("", name="hmac_batch_stats")
+    derived(result, batch_out, batch_report)
+    typing = coalesce.Debouncer("hmac")
 
     @c.on("set_hmac_msg")
     async def set_msg(session, event):
         message_sig.set(session, event.get("value", ""))
-        await compute_hmac(session)
+        typing.push(session, None, compute_hmac, on_error=publish_error)
 
     @c.on("set_hmac_key")
     async def set_key(session, event):
         key_sig.set(session, event.get("value", ""))
-        await compute_hmac(session)
+        typing.push(session, None, compute_hmac, on_error=publish_error)
+
+    def choose(digest):
+        async def handler(session, event):
+            digest_sig.set(session, digest)
+            compute_hmac(session, None)
+        return handler
+
+    for digest in hmac_engine.DIGESTS:
+        c.on(f"hmac_digest_{hmac_engine.DIGESTS[digest]}")(choose(digest))
 
-    async def compute_hmac(session):
+    def compute_hmac(session, _value):
         msg = message_sig.get(session)
         key = key_sig.get(session)
 
         if not msg or not key:
+            executor.cancel(session, "hmac")
             result.set(session, "Enter message and key")
             return
+        executor.submit(session, "hmac", result.set, _hmac_text, key, msg, digest_sig.get(session))
+
+    def publish_error(session, e):
+        result.set(session, f"Error: {str(e)}")
+
+    @c.on("set_hmac_batch")
+    async def set_batch(session, event):
+        batch_sig.set(session, event.get("value", ""))
+
+    def run_batch(mode):
+        async def handler(session, event):
+            key = key_sig.get(session)
+            text = batch_sig.get(session)
+            if not key or not text.strip():
+                batch_out.set(session, "Enter a secret key and one message per line")
+                batch_report.set(session, "")
+                return
+            batch_report.set(session, "Signing..." if mode == "sign" else "Verifying...")
+            executor.submit(session, "hmac_batch", publish_batch, _hmac_batch, key, text, digest_sig.get(session),
+                            mode, on_error=publish_batch_error)
+        return handler
 
-        h = hmac_lib.new(key.encode(), msg.encode(), hashlib.sha256)
-        result.set(session, f"HMAC-SHA256:\n{h.hexdigest()}")
+    c.on("hmac_sign_all")(run_batch("sign"))
+    c.on("hmac_verify_all")(run_batch("verify"))
+
+    def publish_batch(session, batch):
+        batch_out.set(session, batch[0])
+        batch_report.set(session, batch[1])
+
+    def publish_batch_error(session, e):
+        batch_out.set(session, f"Error: {str(e)}")
+        batch_report.set(session, "")
 
     with c.card():
         c.text("Generate HMAC (Hash-based Message Authentication Code).", color="muted")
         c.spacer()
 
+        with c.row(justify="start"):
+            for digest, name in hmac_engine.DIGESTS.items():
+                c.button(digest, on_click=f"hmac_digest_{name}", variant="primary" if digest == "SHA-256" else "outline")
+        c.text(digest_sig, size="sm", color="muted")
+
+        c.spacer()
+
         with c.row():
             with c.col(span=6):
                 c.textarea(label="Message", placeholder="Enter message...", rows=4, on_change="set_hmac_msg")
@@ -86,3 +357,23 @@ def hmac_tool():
             with c.col(span=6):
                 c.text("HMAC Result", size="sm", color="muted")
                 c.code(result)
+
+    c.spacer()
+
+    with c.card():
+        c.text("Sign one message per line, or verify lines of '<signature> <message>' "
+               "(hex or Base64, optionally prefixed like 'sha256=').", color="muted")
+        c.spacer()
+
+        with c.row():
+            with c.col(span=6):
+                c.textarea(label="Messages", placeholder="One message per line...", rows=8, on_change="set_hmac_batch")
+                c.spacer()
+                with c.row(justify="start"):
+                    c.button("Sign All", on_click="hmac_sign_all", variant="primary")
+                    c.button("Verify All", on_click="hmac_verify_all", variant="outline")
+
+            with c.col(span=6):
+                c.text("Batch Result", size="sm", color="muted")
+                c.code(batch_out)
+                c.text(batch_report, size="sm", color="muted")
@@ -0,0 +1,35 @@
+"""Locate the edited region between two versions of a string."""
+
+SIZES = (65536, 4096, 256, 16, 1)  # slice lengths compared, coarse to fine
+
+
+def common_prefix(a, b):
+    """Length of the common prefix of two strings.
+
+    Slices are compared coarse to fine, so each level steps over at most a
+    few slices of the next size instead of looping character by character.
+    """
+    n = min(len(a), len(b))
+    i = 0
+    for size in SIZES:
+        while i + size <= n and a[i:i + size] == b[i:i + size]:
+            i += size
+    return i
+
+
+def common_suffix(a, b, limit):
+    """Length of the common suffix of two strings, at most limit."""
+    la = len(a)
+    lb = len(b)
+    i = 0
+    for size in SIZES:
+        while i + size <= limit and a[la - i - size:la - i] == b[lb - i - size:lb - i]:
+            i += size
+    return i
+
+
+def edit_between(old, new):
+    """Return (start, end, replacement) such that old[:start] + replacement + old[end:] == new."""
+    start = common_prefix(old, new)
+    suffix = common_suffix(old, new, min(len(old), len(new)) - start)
+    return start, len(old) - suffix, new[start:len(new) - suffix]
@@ -0,0 +1,93 @@
+"""Diagnostics: per-tool load from the metrics layer."""
+
+import cacao as c
+
+from . import coalesce, executor, metrics, pager, result_cache, session_state
+from .units import format_bytes
+
+MEMORY_ROWS = 8  # largest signals and sessions listed
+DISABLED = "Metrics are off. Start the app with CACAO_TOOLS_METRICS=1 to record them."
+
+
+def render_all():
+    """Render the diagnostics panel."""
+    diagnostics_tool()
+
+
+def _milliseconds(seconds):
+    if seconds is None:
+        return "-"
+    return "> 10 s" if seconds == float("inf") else f"{seconds * 1000:,.1f} ms"
+
+
+def _report():
+    """One row per handler and job, busiest tool first, then memory, pool and debounce counters."""
+    if not metrics.ENABLED:
+        return "\n".join([DISABLED, ""] + _memory_report())
+    rows = metrics.snapshot()
+    if not rows:
+        return "No events recorded yet"
+    busy = {}
+    for kind, tool, name, series in rows:
+        busy[tool] = busy.get(tool, 0) + series.seconds
+    rows.sort(key=lambda row: (-busy[row[1]], row[1], row[0], -row[3].seconds))
+
+    lines = [f"{'tool':<12} {'kind':<5} {'name':<24} {'calls':>8} {'errors':>6} {'p50':>10} {'p95':>10} "
+             f"{'total':>11} {'cpu':>10} {'in':>10} {'out':>10}"]
+    for kind, tool, name, series in rows:
+        lines.append(f"{tool:<12} {kind:<5} {name:<24} {series.calls:>8,} {series.errors:>6,} "
+                     f"{_milliseconds(series.quantile(0.5)):>10} {_milliseconds(series.quantile(0.95)):>10} "
+                     f"{series.seconds:>9,.3f} s {series.cpu:>8,.3f} s "
+                     f"{format_bytes(series.input_bytes):>10} {format_bytes(series.output_bytes):>10}")
+    lines.append("")
+    lines.extend(_memory_report())
+    cache = result_cache.results.stats()
+    lines.append(f"Result cache: {cache['entries']:,} results, {format_bytes(cache['bytes'])}, {cache['hits']:,} hits, "
+                 f"{cache['misses']:,} misses, {cache['evictions']:,} evictions")
+    lines.append("Jobs: " + ", ".join(f"{count:,} {outcome}" for outcome, count in executor.stats.items()))
+    for name, counts in coalesce.stats().items():
+        if counts["events"]:
+            lines.append(f"Debounce {name}: {counts['events']:,} events, {counts['runs']:,} runs, "
+                         f"{counts['coalesced']:,} coalesced")
+    for name, counts in pager.stats().items():
+        if counts["results"]:
+            lines.append(f"Output {name}: {counts['results']:,} results, {counts['sent']:,} characters sent, "
+                         f"{counts['withheld']:,} withheld")
+    if metrics.endpoint:
+        lines.append(f"Prometheus: {metrics.endpoint}")
+    return "\n".join(lines)
+
+
+def _memory_report():
+    memory = session_state.stats()
+    lines = [f"Sessions: {memory['sessions']:,} seen in the last day holding {format_bytes(memory['bytes'])} "
+             f"({format_bytes(memory['signal_bytes'])} in signals, {format_bytes(memory['state_bytes'])} in tool state) "
+             f"of a {format_bytes(memory['max_bytes'])} ceiling; {memory['evictions']:,} evictions freed "
+             f"{format_bytes(memory['evicted_bytes'])}. Results over {format_bytes(session_state.LARGE)} go after "
+             f"{memory['ttl'] / 60:,.0f} min idle."]
+    largest = sorted(session_state.by_name.items(), key=lambda item: -item[1])[:MEMORY_ROWS]
+    if largest and largest[0][1]:
+        lines.append("Largest: " + ", ".join(f"{name} {format_bytes(n)}" for name, n in largest if n))
+    sessions = sorted(session_state.by_session.values(), reverse=True)[:MEMORY_ROWS]
+    if sessions and sessions[0]:
+        lines.append("Largest sessions: " + ", ".join(format_bytes(n) for n in sessions if n))
+    return lines
+
+
+def diagnostics_tool():
+    """Per-tool call counts, latency, CPU time and payload sizes."""
+    report = c.signal("Click Refresh to load metrics", name="diagnostics_out")
+    session_state.derived(report)
+
+    @c.on("diagnostics_refresh")
+    async def refresh(session, event):
+        session_state.sweep(evict=False)  # fresh memory totals; only the periodic sweep evicts
+        report.set(session, _report())
+
+    with c.card():
+        c.text("Where time goes, per tool. Latency percentiles are bucket upper bounds; "
+               "job times include waiting for a worker.", color="muted")
+        c.spacer()
+        c.button("Refresh", on_click="diagnostics_refresh", variant="primary")
+        c.spacer()
+        c.code(report)
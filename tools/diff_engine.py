@@ -0,0 +1,299 @@
+"""Line diff engine: linear-space Myers, histogram diff and word refinement.
+
+Lines are interned to integer ids first so every comparison is an int
+compare. Both algorithms work on index ranges with explicit stacks and
+produce matching (a index, b index) pairs, which are turned into
+difflib-style opcodes and rendered as a unified diff.
+"""
+
+import re
+
+CONTEXT = 3
+MAX_CHAIN = 64  # histogram diff ignores lines occurring more often than this
+MAX_COST = 256  # edit distance after which a bisection settles for a good split
+_WORD = re.compile(r"\w+|\s+|[^\w\s]")
+
+
+def _intern(a, b):
+    """Map the items of two sequences to shared integer ids."""
+    ids = {}
+    a = [ids.setdefault(x, len(ids)) for x in a]
+    b = [ids.setdefault(x, len(ids)) for x in b]
+    return a, b
+
+
+def _bisect(a, alo, ahi, b, blo, bhi):
+    """Find a point on an optimal edit path through the middle snake.
+
+    Runs the forward and reverse O(ND) searches towards each other in
+    O(N + M) space. Returns absolute (x, y) or None if the ranges share
+    nothing. Past MAX_COST edits it gives up on minimality and splits at
+    the furthest point the forward search reached, which bounds the time
+    spent on very different inputs.
+    """
+    n = ahi - alo
+    m = bhi - blo
+    max_d = (n + m + 1) // 2
+    offset = max_d
+    size = 2 * max_d + 2
+    v1 = [-1] * size
+    v2 = [-1] * size
+    v1[offset + 1] = 0
+    v2[offset + 1] = 0
+    delta = n - m
+    front = delta % 2 != 0
+    k1start = k1end = k2start = k2end = 0
+    furthest = (0, 0, 0)  # (x + y, x, y) reached by the forward search
+
+    for d in range(max_d):
+        for k1 in range(-d + k1start, d + 1 - k1end, 2):
+            k1_offset = offset + k1
+            if k1 == -d or (k1 != d and v1[k1_offset - 1] < v1[k1_offset + 1]):
+                x1 = v1[k1_offset + 1]
+            else:
+                x1 = v1[k1_offset - 1] + 1
+            y1 = x1 - k1
+            while x1 < n and y1 < m and a[alo + x1] == b[blo + y1]:
+                x1 += 1
+                y1 += 1
+            v1[k1_offset] = x1
+            if x1 + y1 > furthest[0] and x1 <= n and y1 <= m:
+                furthest = (x1 + y1, x1, y1)
+            if x1 > n:
+                k1end += 2
+            elif y1 > m:
+                k1start += 2
+            elif front:
+                k2_offset = offset + delta - k1
+                if 0 <= k2_offset < size and v2[k2_offset] != -1:
+                    if x1 >= n - v2[k2_offset]:
+                        return alo + x1, blo + y1
+
+        for k2 in range(-d + k2start, d + 1 - k2end, 2):
+            k2_offset = offset + k2
+            if k2 == -d or (k2 != d and v2[k2_offset - 1] < v2[k2_offset + 1]):
+                x2 = v2[k2_offset + 1]
+            else:
+                x2 = v2[k2_offset - 1] + 1
+            y2 = x2 - k2
+            while x2 < n and y2 < m and a[ahi - 1 - x2] == b[bhi - 1 - y2]:
+                x2 += 1
+                y2 += 1
+            v2[k2_offset] = x2
+            if x2 > n:
+                k2end += 2
+            elif y2 > m:
+                k2start += 2
+            elif not front:
+                k1_offset = offset + delta - k2
+                if 0 <= k1_offset < size and v1[k1_offset] != -1:
+                    x1 = v1[k1_offset]
+                    y1 = offset + x1 - k1_offset
+                    if x1 >= n - x2:
+                        return alo + x1, blo + y1
+
+        if d >= MAX_COST and 0 < furthest[0] < n + m:
+            return alo + furthest[1], blo + furthest[2]
+    return None
+
+
+def _trim(a, b, alo, ahi, blo, bhi, matches):
+    """Record the common prefix and suffix of two ranges; return what is left."""
+    while alo < ahi and blo < bhi and a[alo] == b[blo]:
+        matches.append((alo, blo))
+        alo += 1
+        blo += 1
+    while alo < ahi and blo < bhi and a[ahi - 1] == b[bhi - 1]:
+        ahi -= 1
+        bhi -= 1
+        matches.append((ahi, bhi))
+    return alo, ahi, blo, bhi
+
+
+def _myers(a, b, alo, ahi, blo, bhi, matches):
+    """Append the pairs of a shortest edit script between two ranges."""
+    stack = [(alo, ahi, blo, bhi)]
+    while stack:
+        alo, ahi, blo, bhi = _trim(a, b, *stack.pop(), matches)
+        if alo == ahi or blo == bhi:
+            continue
+        split = _bisect(a, alo, ahi, b, blo, bhi)
+        if split is None:
+            continue
+        x, y = split
+        stack.append((x, ahi, y, bhi))
+        stack.append((alo, x, blo, y))
+
+
+def _histogram(a, b, alo, ahi, blo, bhi, matches):
+    """Append pairs found by histogram diff, falling back to Myers.
+
+    Each range is split around the longest common run anchored on the
+    rarest line of a that also occurs in b, which keeps unique lines such
+    as function signatures aligned in code. Ranges whose shared lines are
+    all too common are handed to Myers.
+    """
+    stack = [(alo, ahi, blo, bhi)]
+    while stack:
+        alo, ahi, blo, bhi = _trim(a, b, *stack.pop(), matches)
+        if alo == ahi or blo == bhi:
+            continue
+
+        positions = {}
+        for i in range(alo, ahi):
+            positions.setdefault(a[i], []).append(i)
+
+        best = None  # (occurrences, -length, a start, b start, length)
+        j = blo
+        while j < bhi:
+            occurrences = positions.get(b[j])
+            if occurrences is None or len(occurrences) > MAX_CHAIN or (
+                    best is not None and len(occurrences) > best[0]):
+                j += 1
+                continue
+            next_j = j + 1
+            for i in occurrences:
+                si, sj = i, j
+                while si > alo and sj > blo and a[si - 1] == b[sj - 1]:
+                    si -= 1
+                    sj -= 1
+                ei, ej = i + 1, j + 1
+                while ei < ahi and ej < bhi and a[ei] == b[ej]:
+                    ei += 1
+                    ej += 1
+                candidate = (len(occurrences), si - ei, si, sj, ei - si)
+                if best is None or candidate < best:
+                    best = candidate
+                next_j = max(next_j, ej)
+            j = next_j
+
+        if best is None:
+            _myers(a, b, alo, ahi, blo, bhi, matches)
+            continue
+        _, _, si, sj, length = best
+        matches.extend((si + k, sj + k) for k in range(length))
+        stack.append((si + length, ahi, sj + length, bhi))
+        stack.append((alo, si, blo, sj))
+
+
+def matching_pairs(a, b, algorithm="myers"):
+    """Return the sorted (a index, b index) pairs of lines kept by the diff."""
+    a, b = _intern(a, b)
+    # Lines that occur on only one side can never match; dropping them first
+    # leaves the same longest common subsequence with a far smaller edit
+    # distance when most changes are edited or added lines
+    in_a = set(a)
+    in_b = set(b)
+    keep_a = [i for i, x in enumerate(a) if x in in_b]
+    keep_b = [j for j, x in enumerate(b) if x in in_a]
+    a = [a[i] for i in keep_a]
+    b = [b[j] for j in keep_b]
+
+    matches = []
+    if algorithm == "histogram":
+        _histogram(a, b, 0, len(a), 0, len(b), matches)
+    else:
+        _myers(a, b, 0, len(a), 0, len(b), matches)
+    matches.sort()
+    return [(keep_a[i], keep_b[j]) for i, j in matches]
+
+
+def opcodes(n_a, n_b, pairs):
+    """Turn sorted matching pairs into (tag, i1, i2, j1, j2) like difflib."""
+    codes = []
+    i = j = 0
+    k = 0
+    pairs = list(pairs) + [(n_a, n_b)]
+    while k < len(pairs):
+        pi, pj = pairs[k]
+        if i < pi and j < pj:
+            codes.append(("replace", i, pi, j, pj))
+        elif i < pi:
+            codes.append(("delete", i, pi, j, j))
+        elif j < pj:
+            codes.append(("insert", i, i, j, pj))
+        if pi == n_a and pj == n_b:
+            break
+        while k + 1 < len(pairs) and pairs[k + 1] == (pairs[k][0] + 1, pairs[k][1] + 1) and pairs[k + 1][0] < n_a:
+            k += 1
+        codes.append(("equal", pi, pairs[k][0] + 1, pj, pairs[k][1] + 1))
+        i, j = pairs[k][0] + 1, pairs[k][1] + 1
+        k += 1
+    return codes
+
+
+def _word_diff(old, new):
+    """Mark word-level changes between two blocks as [-old-]{+new+}."""
+    old_words = _WORD.findall(old)
+    new_words = _WORD.findall(new)
+    pairs = matching_pairs(old_words, new_words)
+    out = []
+    for tag, i1, i2, j1, j2 in opcodes(len(old_words), len(new_words), pairs):
+        if tag == "equal":
+            out.append("".join(old_words[i1:i2]))
+            continue
+        if i1 < i2:
+            out.append("[-" + "".join(old_words[i1:i2]) + "-]")
+        if j1 < j2:
+            out.append("{+" + "".join(new_words[j1:j2]) + "+}")
+    return "".join(out)
+
+
+def _hunks(codes, context):
+    """Group opcodes into hunks with up to `context` equal lines around changes."""
+    if not codes:
+        return
+    if codes[0][0] == "equal":
+        tag, i1, i2, j1, j2 = codes[0]
+        codes[0] = tag, max(i1, i2 - context), i2, max(j1, j2 - context), j2
+    if codes[-1][0] == "equal":
+        tag, i1, i2, j1, j2 = codes[-1]
+        codes[-1] = tag, i1, min(i2, i1 + context), j1, min(j2, j1 + context)
+    group = []
+    for tag, i1, i2, j1, j2 in codes:
+        if tag == "equal" and i2 - i1 > 2 * context:
+            group.append((tag, i1, i1 + context, j1, j1 + context))
+            yield group
+            group = []
+            i1, j1 = i2 - context, j2 - context
+        group.append((tag, i1, i2, j1, j2))
+    if group and not (len(group) == 1 and group[0][0] == "equal"):
+        yield group
+
+
+def unified_diff(a, b, algorithm="myers", context=CONTEXT, words=False, names=("original", "changed")):
+    """Render a unified diff between two lists of lines.
+
+    With words=True, replaced blocks are shown once with word-level
+    [-removed-]{+added+} markers on lines prefixed "~" instead of as
+    separate - and + lines.
+    """
+    codes = opcodes(len(a), len(b), matching_pairs(a, b, algorithm))
+    if all(code[0] == "equal" for code in codes):
+        return ""
+    out = [f"--- {names[0]}", f"+++ {names[1]}"]
+    for group in _hunks(codes, context):
+        i1, i2 = group[0][1], group[-1][2]
+        j1, j2 = group[0][3], group[-1][4]
+        out.append(f"@@ -{_range(i1, i2)} +{_range(j1, j2)} @@")
+        for tag, i1, i2, j1, j2 in group:
+            if tag == "equal":
+                out.extend(" " + line for line in a[i1:i2])
+                continue
+            if words and tag == "replace":
+                merged = _word_diff("\n".join(a[i1:i2]), "\n".join(b[j1:j2]))
+                out.extend("~" + line for line in merged.split("\n"))
+                continue
+            out.extend("-" + line for line in a[i1:i2])
+            out.extend("+" + line for line in b[j1:j2])
+    return "\n".join(out)
+
+
+def _range(start, stop):
+    """Format a hunk range as unified diff does (1-based, length omitted when 1)."""
+    length = stop - start
+    if length == 1:
+        return str(start + 1)
+    if length == 0:
+        return f"{start},0"
+    return f"{start + 1},{length}"
@@ -1,11 +1,18 @@
 """Encoder/Decoder tools."""
 
 import base64
+import re
+import time
 import urllib.parse
 import html
 import json
 import cacao as c
 
+from . import base64_stream, coalesce, executor, files, hexview, json_stream, jwt_engine
+from .pager import Pager
+from .session_state import State, derived
+from .units import format_item_rate, format_rate
+
 
 def render_all():
     """Render all encoder tools."""
@@ -20,26 +27,112 @@ def render_all():
             jwt_tool()
 
 
+_CONTROL = re.compile(rb"[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]")
+
+
+def _printable(data):
+    """Return data as text if it is UTF-8 without control characters, else None."""
+    if _CONTROL.search(data):
+        return None
+    try:
+        return data.decode("utf-8")
+    except UnicodeDecodeError:
+        return None
+
+
+def _base64_transform(text, mode, variant="standard"):
+    """Encode or decode text as Base64; returns (text output, binary output or None)."""
+    if mode == "encode":
+        return base64_stream.encode(text.encode(), variant).decode("ascii"), None
+    try:
+        encoded = text.encode("ascii")
+    except UnicodeEncodeError as e:
+        raise ValueError(f"Invalid Base64: non-ASCII character at position {e.start}") from None
+    data = base64_stream.decode(encoded)
+    decoded = _printable(data)
+    if decoded is not None:
+        return decoded, None
+    return f"Binary output: {len(data):,} bytes", data
+
+
+def _base64_file(src, dst, mode, variant):
+    """Stream the file at src through Base64 into dst, both under the file root; returns a report."""
+    files.check_pair(src, dst)
+    start = time.perf_counter()
+    with files.open_read(src) as fin, files.open_write(dst) as fout:
+        chunks = json_stream.iter_file(fin, base64_stream.CHUNK_SIZE)
+        converted = base64_stream.iter_encode(chunks, variant) if mode == "encode" else base64_stream.iter_decode(chunks)
+        for block in converted:
+            fout.write(block)
+        size = fin.tell()
+    verb = "Encoded" if mode == "encode" else "Decoded"
+    return f"{verb} {src} to {dst}: " + format_rate(size, time.perf_counter() - start)
+
+
 def base64_tool():
     """Base64 encoder/decoder."""
     output = c.signal("", name="base64_out")
     mode = c.signal("encode", name="base64_mode")
+    variant_sig = c.signal("standard", name="base64_variant")
+    report = c.signal("", name="base64_stats")
+    window = c.signal("", name="base64_window")
+    page_sig = c.signal(0, name="base64_page")
+    src_sig = c.signal("", name="base64_src")
+    dst_sig = c.signal("", name="base64_dst")
+    binary = State("base64_binary")  # decoded bytes
+    typing = coalesce.Debouncer("base64")
+    view = Pager("base64", output, window)
 
     @c.on("base64_process")
     async def process(session, event):
-        text = event.get("value", "")
+        typing.push(session, event.get("value", ""), run, on_error=publish_error)
+
+    def run(session, text):
         current_mode = mode.get(session)
         if not text:
-            output.set(session, "")
+            executor.cancel(session, "base64")
+            binary.pop(session)
+            view.clear(session)
+            report.set(session, "")
+            return
+        executor.submit(session, "base64", publish, _base64_transform, text, current_mode,
+                        variant_sig.get(session), on_error=publish_error, cache=True)
+
+    def publish(session, converted):
+        text, data = converted
+        if data is None:
+            binary.pop(session)
+            view.publish(session, text)
+            report.set(session, "")
+            return
+        view.clear(session)
+        binary.set(session, data)
+        report.set(session, text)
+        show_page(session, 0)
+
+    def publish_error(session, e):
+        binary.pop(session)
+        view.clear(session, f"Error: {str(e)}")
+        report.set(session, "")
+
+    def show_page(session, number):
+        source = binary.get(session)
+        if source is None:
             return
-        try:
-            if current_mode == "encode":
-                result = base64.b64encode(text.encode()).decode()
-            else:
-                result = base64.b64decode(text.encode()).decode()
-            output.set(session, result)
-        except Exception as e:
-            output.set(session, f"Error: {str(e)}")
+        # Only the visible window is read and formatted, however large the data
+        dump, pages = hexview.window(source, number)
+        page_sig.set(session, max(0, min(number, pages - 1)))
+        output.set(session, dump)
+
+    @c.on("base64_prev_page")
+    async def prev_page(session, event):
+        if not view.page(session, -1):
+            show_page(session, page_sig.get(session) - 1)
+
+    @c.on("base64_next_page")
+    async def next_page(session, event):
+        if not view.page(session, 1):
+            show_page(session, page_sig.get(session) + 1)
 
     @c.on("base64_encode")
     async def set_encode(session, event):
@@ -49,14 +142,55 @@ def base64_tool():
     async def set_decode(session, event):
         mode.set(session, "decode")
 
+    def choose_variant(variant):
+        async def handler(session, event):
+            variant_sig.set(session, variant)
+        return handler
+
+    for variant in base64_stream.VARIANTS:
+        c.on(f"base64_variant_{variant}")(choose_variant(variant))
+
+    @c.on("set_base64_src")
+    async def set_src(session, event):
+        src_sig.set(session, event.get("value", ""))
+
+    @c.on("set_base64_dst")
+    async def set_dst(session, event):
+        dst_sig.set(session, event.get("value", ""))
+
+    def convert_file(file_mode):
+        async def handler(session, event):
+            src = src_sig.get(session).strip()
+            dst = dst_sig.get(session).strip()
+            if not files.enabled():
+                report.set(session, files.DISABLED)
+                return
+            if not src or not dst:
+                report.set(session, "Enter an input and an output file path")
+                return
+            # Only the report is shown; the files' contents never reach the browser
+            report.set(session, f"Converting {src}...")
+            executor.submit(session, "base64_file", report.set, _base64_file, src, dst, file_mode,
+                            variant_sig.get(session), on_error=publish_file_error)
+        return handler
+
+    def publish_file_error(session, e):
+        report.set(session, f"Error: {str(e)}")
+
+    c.on("base64_encode_file")(convert_file("encode"))
+    c.on("base64_decode_file")(convert_file("decode"))
+
     with c.card():
-        c.text("Encode and decode text using Base64 encoding.", color="muted")
+        c.text("Encode and decode text, binary data and files using Base64 encoding.", color="muted")
         c.spacer()
 
         # Mode toggle
         with c.row(justify="start"):
             c.button("Encode", on_click="base64_encode", variant="primary")
             c.button("Decode", on_click="base64_decode", variant="outline")
+            c.button("Standard", on_click="base64_variant_standard", variant="outline")
+            c.button("URL-safe", on_click="base64_variant_url", variant="outline")
+            c.button("MIME", on_click="base64_variant_mime", variant="outline")
 
         c.spacer()
 
@@ -64,32 +198,54 @@ def base64_tool():
         with c.row():
             with c.col(span=6):
                 c.textarea(label="Input", placeholder="Enter text to encode/decode...", rows=6, on_change="base64_process")
+                c.spacer()
+                c.input("Input File", placeholder=files.hint(), on_change="set_base64_src")
+                c.input("Output File", placeholder=files.hint(), on_change="set_base64_dst")
+                c.spacer()
+                with c.row(justify="start"):
+                    c.button("Encode File", on_click="base64_encode_file", variant="outline")
+                    c.button("Decode File", on_click="base64_decode_file", variant="outline")
 
             with c.col(span=6):
                 c.text("Output", size="sm", color="muted")
                 c.code(output)
+                c.text(report, size="sm", color="muted")
+                c.text(window, size="sm", color="muted")
+                with c.row(justify="start"):
+                    c.button("Previous", on_click="base64_prev_page", variant="outline", size="sm")
+                    c.button("Next", on_click="base64_next_page", variant="outline", size="sm")
+
+
+def _url_transform(text, mode):
+    """Percent-encode or decode text."""
+    if mode == "encode":
+        return urllib.parse.quote(text, safe="")
+    return urllib.parse.unquote(text)
 
 
 def url_tool():
     """URL encoder/decoder."""
     output = c.signal("", name="url_out")
     mode = c.signal("encode", name="url_mode")
+    window = c.signal("", name="url_window")
+    typing = coalesce.Debouncer("url")
+    view = Pager("url", output, window)
 
     @c.on("url_process")
     async def process(session, event):
-        text = event.get("value", "")
+        typing.push(session, event.get("value", ""), run, on_error=publish_error)
+
+    def run(session, text):
         current_mode = mode.get(session)
         if not text:
-            output.set(session, "")
+            executor.cancel(session, "url")
+            view.clear(session)
             return
-        try:
-            if current_mode == "encode":
-                result = urllib.parse.quote(text, safe="")
-            else:
-                result = urllib.parse.unquote(text)
-            output.set(session, result)
-        except Exception as e:
-            output.set(session, f"Error: {str(e)}")
+        executor.submit(session, "url", view.publish, _url_transform, text, current_mode, on_error=publish_error,
+                        cache=True)
+
+    def publish_error(session, e):
+        view.clear(session, f"Error: {str(e)}")
 
     @c.on("url_encode")
     async def set_encode(session, event):
@@ -99,6 +255,14 @@ def url_tool():
     async def set_decode(session, event):
         mode.set(session, "decode")
 
+    @c.on("url_prev_page")
+    async def prev_page(session, event):
+        view.page(session, -1)
+
+    @c.on("url_next_page")
+    async def next_page(session, event):
+        view.page(session, 1)
+
     with c.card():
         c.text("Encode and decode URLs for safe transmission.", color="muted")
         c.spacer()
@@ -116,28 +280,42 @@ def url_tool():
             with c.col(span=6):
                 c.text("Output", size="sm", color="muted")
                 c.code(output)
+                c.text(window, size="sm", color="muted")
+                with c.row(justify="start"):
+                    c.button("Previous", on_click="url_prev_page", variant="outline", size="sm")
+                    c.button("Next", on_click="url_next_page", variant="outline", size="sm")
+
+
+def _html_transform(text, mode):
+    """Escape or unescape HTML entities."""
+    if mode == "encode":
+        return html.escape(text)
+    return html.unescape(text)
 
 
 def html_tool():
     """HTML entity encoder/decoder."""
     output = c.signal("", name="html_out")
     mode = c.signal("encode", name="html_mode")
+    window = c.signal("", name="html_window")
+    typing = coalesce.Debouncer("html")
+    view = Pager("html", output, window)
 
     @c.on("html_process")
     async def process(session, event):
-        text = event.get("value", "")
+        typing.push(session, event.get("value", ""), run, on_error=publish_error)
+
+    def run(session, text):
         current_mode = mode.get(session)
         if not text:
-            output.set(session, "")
+            executor.cancel(session, "html")
+            view.clear(session)
             return
-        try:
-            if current_mode == "encode":
-                result = html.escape(text)
-            else:
-                result = html.unescape(text)
-            output.set(session, result)
-        except Exception as e:
-            output.set(session, f"Error: {str(e)}")
+        executor.submit(session, "html", view.publish, _html_transform, text, current_mode, on_error=publish_error,
+                        cache=True)
+
+    def publish_error(session, e):
+        view.clear(session, f"Error: {str(e)}")
 
     @c.on("html_encode")
     async def set_encode(session, event):
@@ -147,6 +325,14 @@ def html_tool():
     async def set_decode(session, event):
         mode.set(session, "decode")
 
+    @c.on("html_prev_page")
+    async def prev_page(session, event):
+        view.page(session, -1)
+
+    @c.on("html_next_page")
+    async def next_page(session, event):
+        view.page(session, 1)
+
     with c.card():
         c.text("Encode and decode HTML entities.", color="muted")
         c.spacer()
@@ -164,38 +350,113 @@ def html_tool():
             with c.col(span=6):
                 c.text("Output", size="sm", color="muted")
                 c.code(output)
+                c.text(window, size="sm", color="muted")
+                with c.row(justify="start"):
+                    c.button("Previous", on_click="html_prev_page", variant="outline", size="sm")
+                    c.button("Next", on_click="html_next_page", variant="outline", size="sm")
+
+
+def _jwt_decode(token):
+    """Decode a JWT into pretty-printed (header, payload) JSON strings."""
+    parts = token.split(".")
+    if len(parts) != 3:
+        raise ValueError("Invalid JWT format - expected 3 parts")
+
+    # Decode header
+    header_b64 = parts[0] + "=" * (-len(parts[0]) % 4)
+    header = json.loads(base64.urlsafe_b64decode(header_b64))
+
+    # Decode payload
+    payload_b64 = parts[1] + "=" * (-len(parts[1]) % 4)
+    payload = json.loads(base64.urlsafe_b64decode(payload_b64))
+    return json.dumps(header, indent=2), json.dumps(payload, indent=2)
+
+
+JWT_LIST_LIMIT = 200  # tokens listed individually under the summary
+
+
+def _jwt_batch(text, secret, key_path):
+    """Find, decode and verify every JWT in text; returns (summary, report)."""
+    start = time.perf_counter()
+    tokens = jwt_engine.find_tokens(text)
+    if not tokens:
+        return "No JWTs found", ""
+    keys = jwt_engine.load_keys(files.resolve(key_path) if key_path else "", secret)
+    hits = keys.hits
+    results = jwt_engine.verify_all(tokens, keys)
+    elapsed = time.perf_counter() - start
+
+    lines = [jwt_engine.summarize(results), "", "Tokens:"]
+    for i, r in enumerate(results[:JWT_LIST_LIMIT], 1):
+        sub = r["payload"].get("sub", "")
+        lines.append(f"  {i:>4}. {str(r['header'].get('alg', '?')):<6} {r['status']:<18} {r['timing']:<14} {sub}")
+    if len(results) > JWT_LIST_LIMIT:
+        lines.append(f"  ... {len(results) - JWT_LIST_LIMIT:,} more")
+    report = format_item_rate(len(results), "tokens", elapsed) + f", {keys.hits - hits:,} verdicts reused"
+    return "\n".join(lines), report
 
 
 def jwt_tool():
     """JWT decoder."""
     header_out = c.signal("{}", name="jwt_header")
     payload_out = c.signal("{}", name="jwt_payload")
+    bulk_text = c.signal("", name="jwt_bulk_text")
+    secret_sig = c.signal("", name="jwt_secret")
+    key_path_sig = c.signal("", name="jwt_key_path")
+    bulk_out = c.signal("", name="jwt_bulk_out")
+    bulk_report = c.signal("", name="jwt_bulk_stats")
+    derived(header_out, payload_out, bulk_out, bulk_report)
+    typing = coalesce.Debouncer("jwt")
 
     @c.on("jwt_decode")
     async def decode_jwt(session, event):
-        token = event.get("value", "").strip()
+        typing.push(session, event.get("value", "").strip(), run, on_error=publish_error)
+
+    def run(session, token):
         if not token:
+            executor.cancel(session, "jwt")
             header_out.set(session, "{}")
             payload_out.set(session, "{}")
             return
+        executor.submit(session, "jwt", publish, _jwt_decode, token, on_error=publish_error)
+
+    def publish(session, decoded):
+        header_out.set(session, decoded[0])
+        payload_out.set(session, decoded[1])
 
-        try:
-            parts = token.split(".")
-            if len(parts) != 3:
-                raise ValueError("Invalid JWT format - expected 3 parts")
+    def publish_error(session, e):
+        header_out.set(session, f"Error: {str(e)}")
+        payload_out.set(session, "")
 
-            # Decode header
-            header_b64 = parts[0] + "=" * (-len(parts[0]) % 4)
-            header = json.loads(base64.urlsafe_b64decode(header_b64))
-            header_out.set(session, json.dumps(header, indent=2))
+    @c.on("set_jwt_bulk")
+    async def set_bulk(session, event):
+        bulk_text.set(session, event.get("value", ""))
 
-            # Decode payload
-            payload_b64 = parts[1] + "=" * (-len(parts[1]) % 4)
-            payload = json.loads(base64.urlsafe_b64decode(payload_b64))
-            payload_out.set(session, json.dumps(payload, indent=2))
-        except Exception as e:
-            header_out.set(session, f"Error: {str(e)}")
-            payload_out.set(session, "")
+    @c.on("set_jwt_secret")
+    async def set_secret(session, event):
+        secret_sig.set(session, event.get("value", ""))
+
+    @c.on("set_jwt_key_path")
+    async def set_key_path(session, event):
+        key_path_sig.set(session, event.get("value", "").strip())
+
+    @c.on("jwt_verify_all")
+    async def verify_all(session, event):
+        text = bulk_text.get(session)
+        if not text.strip():
+            bulk_out.set(session, "Paste tokens or a log containing them")
+            return
+        bulk_report.set(session, "Verifying...")
+        executor.submit(session, "jwt_bulk", publish_bulk, _jwt_batch, text, secret_sig.get(session),
+                        key_path_sig.get(session), on_error=publish_bulk_error)
+
+    def publish_bulk(session, verified):
+        bulk_out.set(session, verified[0])
+        bulk_report.set(session, verified[1])
+
+    def publish_bulk_error(session, e):
+        bulk_out.set(session, f"Error: {str(e)}")
+        bulk_report.set(session, "")
 
     with c.card():
         c.text("Decode JWT tokens to view header and payload.", color="muted")
@@ -213,3 +474,25 @@ def jwt_tool():
             with c.col(span=6):
                 c.text("Payload", size="sm", color="muted")
                 c.code(payload_out, language="json")
+
+    c.spacer()
+
+    with c.card():
+        c.text("Verify every JWT in a pasted log. HS256/384/512 use the secret; RS, PS and ES "
+               "use a PEM key, certificate or JWKS file (requires the cryptography package).", color="muted")
+        c.spacer()
+
+        with c.row():
+            with c.col(span=6):
+                c.textarea(label="Tokens or Log", placeholder="Paste tokens or log lines containing them...", rows=8,
+                           on_change="set_jwt_bulk")
+                c.spacer()
+                c.input("HMAC Secret", placeholder="Shared secret for HS tokens...", on_change="set_jwt_secret")
+                c.input("Key File", placeholder=files.hint(), on_change="set_jwt_key_path")
+                c.spacer()
+                c.button("Verify All", on_click="jwt_verify_all", variant="primary")
+
+            with c.col(span=6):
+                c.text("Summary", size="sm", color="muted")
+                c.code(bulk_out)
+                c.text(bulk_report, size="sm", color="muted")
@@ -0,0 +1,126 @@
+"""Shared worker pools for running tool transforms off the event loop."""
+
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from . import metrics, result_cache
+
+THREAD_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+PROCESS_WORKERS = os.cpu_count() or 1
+
+_threads = None
+_processes = None
+_jobs = {}  # (session id, key) -> asyncio.Task of the latest job
+stats = {"submitted": 0, "published": 0, "superseded": 0, "errors": 0}
+
+
+def _pool(process):
+    """Return the shared thread or process pool, creating it on first use."""
+    global _threads, _processes
+    if process:
+        if _processes is None:
+            try:
+                _processes = ProcessPoolExecutor(max_workers=PROCESS_WORKERS)
+            except (ImportError, NotImplementedError, OSError):
+                # No multiprocessing support on this platform; fall back to threads
+                process = False
+        if _processes is not None:
+            return _processes
+    if _threads is None:
+        _threads = ThreadPoolExecutor(max_workers=THREAD_WORKERS, thread_name_prefix="cacao-tools")
+    return _threads
+
+
+async def run(func, *args, process=False):
+    """Run func(*args) in a worker pool and return its result.
+
+    Threads suit work that releases the GIL (hashlib, zlib); pass
+    process=True for pure-Python work. func must be picklable then.
+    """
+    global _processes
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(_pool(process), func, *args)
+    except BrokenProcessPool:
+        # A worker died; drop the pool so the next job gets a fresh one
+        _processes = None
+        raise
+
+
+def submit(session, key, publish, func, *args, process=False, on_error=None, cache=False):
+    """Compute func(*args) in the background and publish only the latest result.
+
+    Any job still in flight for the same session and key is cancelled, so
+    a burst of on_change events only ever publishes the newest input's
+    result. publish(session, result) is called on success; failures call
+    on_error(session, exc), or publish an "Error: ..." string by default.
+    With cache=True the result is shared with every session that submits
+    the same key, function and arguments; func must be deterministic and
+    its result never mutated.
+    """
+    cancel(session, key)
+    stats["submitted"] += 1
+    task = asyncio.ensure_future(_publish_latest(session, key, publish, on_error, func, args, process, cache))
+    _jobs[(session.id, key)] = task
+    return task
+
+
+def cancel(session, key):
+    """Cancel the in-flight job for a session and key, if any."""
+    task = _jobs.pop((session.id, key), None)
+    if task is not None and not task.done():
+        task.cancel()
+        stats["superseded"] += 1
+
+
+async def _compute(key, func, args, process, cache):
+    """Run one job, through the shared result cache when asked."""
+    cache_key = None
+    if cache and result_cache.cacheable(key):
+        # Digesting a large input is worth doing off the event loop too
+        cache_key = await run(result_cache.key, key, func, args)
+        hit, result = result_cache.results.get(cache_key)
+        if hit:
+            return result
+    if metrics.ENABLED:
+        start = time.perf_counter()
+        try:
+            result, cpu = await run(metrics.timed, func, *args, process=process)
+        except Exception:
+            metrics.record("job", metrics.current_tool(), key, time.perf_counter() - start, error=True)
+            raise
+        metrics.record("job", metrics.current_tool(), key, time.perf_counter() - start,
+                       output_bytes=metrics.size(result), cpu=cpu)
+    else:
+        result = await run(func, *args, process=process)
+    if cache_key is not None:
+        result_cache.results.put(cache_key, result)
+    return result
+
+
+async def _publish_latest(session, key, publish, on_error, func, args, process, cache):
+    job_key = (session.id, key)
+    try:
+        result = await _compute(key, func, args, process, cache)
+    except asyncio.CancelledError:
+        return
+    except Exception as e:
+        if _jobs.get(job_key) is not asyncio.current_task():
+            return
+        del _jobs[job_key]
+        stats["errors"] += 1
+        if on_error is not None:
+            on_error(session, e)
+        else:
+            publish(session, f"Error: {str(e)}")
+        return
+
+    # A newer job may have replaced this one after the worker finished
+    if _jobs.get(job_key) is not asyncio.current_task():
+        return
+    del _jobs[job_key]
+    stats["published"] += 1
+    publish(session, result)
@@ -0,0 +1,209 @@
+"""Schema-driven fake data, generated a column at a time.
+
+A schema is a JSON object mapping column names to specs such as "uuid",
+"int:18:90" or "date:2020-01-01:2024-12-31". Each batch of rows is drawn
+one column at a time with bulk calls on a seeded random.Random (choices,
+randbytes), and the encoded columns are then zipped into JSONL or CSV lines.
+The same schema, seed and batch size always give the same rows.
+"""
+
+import datetime
+import functools
+import json
+import math
+import os
+import random
+import sys
+
+from . import bulk_random
+
+BATCH = 10_000
+FORMATS = ("jsonl", "csv")
+MAX_DATE_SPAN = 1_000_000  # days; wider ranges are drawn as offsets instead of from a table
+MAX_DIGITS = 20  # decimal places of a float column
+LOREM_WORDS = [
+    "lorem", "ipsum", "dolor", "sit", "amet", "consectetur", "adipiscing",
+    "elit", "sed", "do", "eiusmod", "tempor", "incididunt", "ut", "labore",
+    "et", "dolore", "magna", "aliqua", "enim", "ad", "minim", "veniam",
+]
+EXAMPLE_SCHEMA = """{
+  "id": "uuid",
+  "name": "lorem:2:3",
+  "age": "int:18:90",
+  "score": "float:0:100:2",
+  "active": "bool",
+  "plan": "choice:free|pro|team",
+  "joined": "date:2020-01-01:2024-12-31",
+  "api_key": "password:24"
+}"""
+
+# How a column's cells are written out:
+# "raw"  - already valid JSON and CSV (numbers, true/false)
+# "text" - strings without quotes, backslashes, commas or control characters
+# "any"  - arbitrary strings that need escaping
+_RAW, _TEXT, _ANY = "raw", "text", "any"
+
+
+def sentences(rng, n, shortest=8, longest=16):
+    """Return n capitalised lorem sentences, drawing all words in one call."""
+    lengths = rng.choices(range(shortest, longest + 1), k=n)
+    words = rng.choices(LOREM_WORDS, k=sum(lengths))
+    out = []
+    pos = 0
+    for length in lengths:
+        out.append(" ".join(words[pos:pos + length]).capitalize() + ".")
+        pos += length
+    return out
+
+
+def _index(rng, n, start):
+    return list(map(str, range(start, start + n))), _RAW
+
+
+def _uuid(rng, n, start):
+    return bulk_random.uuids(n, 4, source=rng.randbytes), _TEXT
+
+
+def _password(rng, n, start, length=16):
+    return bulk_random.passwords(n, length, bulk_random.PASSWORD_ALPHABET, source=rng.randbytes), _TEXT
+
+
+def _int(rng, n, start, low, high):
+    if high - low < sys.maxsize:
+        return list(map(str, rng.choices(range(low, high + 1), k=n))), _RAW
+    # choices() needs len(range), which must fit in a C ssize_t
+    randrange = rng.randrange
+    return [str(randrange(low, high + 1)) for _ in range(n)], _RAW
+
+
+def _float(rng, n, start, low, high, digits=2):
+    r = rng.random
+    span = high - low
+    return [f"{low + span * r():.{digits}f}" for _ in range(n)], _RAW
+
+
+def _bool(rng, n, start):
+    return rng.choices(("true", "false"), k=n), _RAW
+
+
+def _date(rng, n, start, first, last):
+    days = (last - first).days + 1
+    if days <= MAX_DATE_SPAN:
+        return rng.choices(_date_table(first, days), k=n), _TEXT
+    base = first.toordinal()
+    return [datetime.date.fromordinal(base + d).isoformat() for d in rng.choices(range(days), k=n)], _TEXT
+
+
+@functools.lru_cache(maxsize=8)
+def _date_table(first, days):
+    """ISO strings for every day of a range, so drawing a date is a table lookup."""
+    base = first.toordinal()
+    return tuple(datetime.date.fromordinal(base + d).isoformat() for d in range(days))
+
+
+def _choice(rng, n, start, options):
+    return rng.choices(options, k=n), _ANY
+
+
+def _lorem(rng, n, start, shortest=8, longest=16):
+    return sentences(rng, n, shortest, longest), _TEXT
+
+
+_COLUMNS = {
+    "index": (_index, ()),
+    "uuid": (_uuid, ()),
+    "password": (_password, (int,)),
+    "int": (_int, (int, int)),
+    "float": (_float, (float, float, int)),
+    "bool": (_bool, ()),
+    "date": (_date, (datetime.date.fromisoformat, datetime.date.fromisoformat)),
+    "choice": (_choice, (lambda value: value.split("|"),)),
+    "lorem": (_lorem, (int, int)),
+}
+_REQUIRED = {"int": 2, "float": 2, "date": 2, "choice": 1}
+
+
+def _parse_spec(name, spec):
+    """Turn "kind:arg:arg" into (name, generator, args)."""
+    if not isinstance(spec, str):
+        raise ValueError(f"Column {name!r}: spec must be a string like \"int:1:10\"")
+    kind, *raw = spec.split(":", 1 if spec.startswith("choice:") else -1)
+    if kind not in _COLUMNS:
+        raise ValueError(f"Column {name!r}: unknown type {kind!r} (expected one of {', '.join(_COLUMNS)})")
+    generate, converters = _COLUMNS[kind]
+    if len(raw) > len(converters) or len(raw) < _REQUIRED.get(kind, 0):
+        raise ValueError(f"Column {name!r}: wrong number of arguments in {spec!r}")
+    try:
+        args = tuple(convert(value) for convert, value in zip(converters, raw))
+    except ValueError as e:
+        raise ValueError(f"Column {name!r}: {e}") from None
+    if kind == "lorem" and len(args) == 1:
+        args = (args[0], args[0])  # "lorem:5" is exactly five words
+    if kind == "float" and not (math.isfinite(args[0]) and math.isfinite(args[1] - args[0])):
+        # nan and inf are not valid JSON numbers, and neither bound may overflow the span
+        raise ValueError(f"Column {name!r}: float bounds must be finite numbers in {spec!r}")
+    if kind == "float" and len(args) == 3 and not 0 <= args[2] <= MAX_DIGITS:
+        raise ValueError(f"Column {name!r}: float digits must be 0-{MAX_DIGITS}")
+    if kind in ("int", "float", "date", "lorem") and len(args) >= 2 and args[0] > args[1]:
+        raise ValueError(f"Column {name!r}: empty range in {spec!r}")
+    if kind == "password" and args and not 1 <= args[0] <= 256:
+        raise ValueError(f"Column {name!r}: password length must be 1-256")
+    if kind == "lorem" and args and args[0] < 1:
+        raise ValueError(f"Column {name!r}: sentences need at least one word")
+    return name, generate, args
+
+
+def parse_schema(text):
+    """Parse a JSON schema object into columns; raises ValueError when invalid."""
+    schema = json.loads(text)
+    if not isinstance(schema, dict) or not schema:
+        raise ValueError("Schema must be a JSON object mapping column names to types")
+    return [_parse_spec(name, spec) for name, spec in schema.items()]
+
+
+def _csv_quote(value):
+    if any(ch in value for ch in ',"\r\n'):
+        return '"' + value.replace('"', '""') + '"'
+    return value
+
+
+def _encode(values, kind, fmt):
+    """Encode one column's cells for the output format."""
+    if kind == _RAW:
+        return values
+    if kind == _TEXT:
+        return values if fmt == "csv" else ['"' + v + '"' for v in values]
+    # Arbitrary strings usually come from a short list of options, so encode each once
+    encode = _csv_quote if fmt == "csv" else json.dumps
+    cache = {v: encode(v) for v in set(values)}
+    return [cache[v] for v in values]
+
+
+def new_seed():
+    """Return a random seed to report, so any run can be reproduced."""
+    return int.from_bytes(os.urandom(4), "big")
+
+
+def iter_text(columns, count, fmt="jsonl", seed=0, batch=BATCH):
+    """Yield count rows as JSONL or CSV text blocks of up to batch rows."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported format: {fmt}")
+    rng = random.Random(seed)
+    if fmt == "csv":
+        yield ",".join(_csv_quote(str(name)) for name, _, _ in columns) + "\n"
+    else:
+        template = "{" + ", ".join(json.dumps(name).replace("%", "%%") + ": %s" for name, _, _ in columns) + "}"
+
+    start = 0
+    while start < count:
+        n = min(batch, count - start)
+        cells = []
+        for _, generate, args in columns:
+            values, kind = generate(rng, n, start, *args)
+            cells.append(_encode(values, kind, fmt))
+        rows = zip(*cells)
+        if fmt == "csv":
+            yield "\n".join(map(",".join, rows)) + "\n"
+        else:
+            yield "\n".join([template % row for row in rows]) + "\n"
+        start += n
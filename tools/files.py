@@ -0,0 +1,76 @@
+"""Server-side files that tools may read and write on a client's behalf.
+
+File modes are off unless CACAO_TOOLS_FILE_ROOT names a directory. Every
+path a client sends is taken relative to that root, resolved with its
+symlinks, and refused unless it stays inside; only regular files are
+opened, so a browser cannot read secrets elsewhere on the server,
+overwrite files outside the root, or hand a tool /dev/zero or a FIFO.
+"""
+
+import os
+import stat
+
+ROOT = os.path.realpath(os.environ["CACAO_TOOLS_FILE_ROOT"]) if os.environ.get("CACAO_TOOLS_FILE_ROOT") else None
+DISABLED = "File mode is off. Start the app with CACAO_TOOLS_FILE_ROOT set to the directory it may use."
+
+_READ = os.O_RDONLY | getattr(os, "O_NONBLOCK", 0) | getattr(os, "O_BINARY", 0)
+_WRITE = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_NOFOLLOW", 0) | getattr(os, "O_BINARY", 0)
+
+
+def enabled():
+    """Whether a file root is configured."""
+    return ROOT is not None
+
+
+def hint():
+    """Placeholder text for a file path input."""
+    return f"Path under {ROOT}..." if ROOT else "File mode is off (set CACAO_TOOLS_FILE_ROOT)"
+
+
+def resolve(path):
+    """Return the real path of path under ROOT; raises ValueError outside it."""
+    if ROOT is None:
+        raise ValueError(DISABLED)
+    if not path:
+        raise ValueError("Enter a file path")
+    real = os.path.realpath(os.path.join(ROOT, path))
+    if os.path.commonpath([ROOT, real]) != ROOT:
+        # Say nothing about what exists out there
+        raise ValueError(f"Files must be under {ROOT}")
+    return real
+
+
+def check_pair(src, dst):
+    """Refuse a conversion that would truncate its own input."""
+    if resolve(src) == resolve(dst):
+        raise ValueError("Input and output must be different files")
+
+
+def _regular(fd, path):
+    if not stat.S_ISREG(os.fstat(fd).st_mode):
+        os.close(fd)
+        raise ValueError(f"Not a regular file: {path}")
+
+
+def open_read(path, mode="rb", **kwargs):
+    """Open a regular file under ROOT for reading."""
+    real = resolve(path)
+    # Non-blocking, so a FIFO fails the regular-file check instead of hanging here
+    fd = os.open(real, _READ)
+    _regular(fd, path)
+    return os.fdopen(fd, mode, **kwargs)
+
+
+def open_write(path, mode="wb", **kwargs):
+    """Create or truncate a regular file under ROOT for writing."""
+    real = resolve(path)
+    try:
+        existing = os.lstat(real)
+    except FileNotFoundError:
+        pass
+    else:
+        if not stat.S_ISREG(existing.st_mode):
+            raise ValueError(f"Not a regular file: {path}")
+    fd = os.open(real, _WRITE, 0o644)
+    _regular(fd, path)
+    return os.fdopen(fd, mode, **kwargs)
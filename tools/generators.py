@@ -1,11 +1,15 @@
 """Generator tools."""
 
-import uuid as uuid_lib
-import secrets
 import string
 import random
+import time
 import cacao as c
 
+from . import bulk_random, executor, fake_data
+from .pager import Pager
+from .session_state import derived
+from .units import format_item_rate
+
 
 def render_all():
     """Render all generator tools."""
@@ -16,84 +20,212 @@ def render_all():
             password_tool()
         with c.tab("lorem", "Lorem Ipsum"):
             lorem_tool()
+        with c.tab("fake_data", "Fake Data"):
+            fake_data_tool()
+
+
+UUID_BATCH_LIMIT = 1_000_000  # about 37 MB of text, held per session and paged to the browser
+
+
+def _uuid_header(fmt):
+    return "uuid\n" if fmt == "csv" else ""
+
+
+def _uuid_batch(count, version, fmt):
+    """Generate count UUIDs as text or one-column CSV; returns (output, report)."""
+    start = time.perf_counter()
+    output = _uuid_header(fmt) + "".join(bulk_random.iter_uuids(count, version))
+    report = f"v{version}: " + format_item_rate(count, "IDs", time.perf_counter() - start)
+    return output.rstrip("\n"), report
 
 
 def uuid_tool():
     """UUID generator."""
-    result = c.signal(str(uuid_lib.uuid4()), name="uuid_result")
+    # Signal defaults are shared by every session, so nothing is generated until asked
+    result = c.signal("Click Generate for a new UUID", name="uuid_result")
+    version_sig = c.signal(4, name="uuid_version")
+    count_sig = c.signal(1, name="uuid_count")
+    format_sig = c.signal("text", name="uuid_format")
+    report = c.signal("", name="uuid_stats")
+    window = c.signal("", name="uuid_window")
+    view = Pager("uuid", result, window)
 
     @c.on("gen_uuid")
     async def generate(session, event):
-        result.set(session, str(uuid_lib.uuid4()))
+        executor.submit(session, "uuid", publish, _uuid_batch, count_sig.get(session), version_sig.get(session),
+                        format_sig.get(session), on_error=publish_error)
+
+    def publish(session, generated):
+        view.clear(session)  # a fresh batch starts on its first page
+        view.publish(session, generated[0])
+        report.set(session, generated[1])
+
+    def publish_error(session, e):
+        report.set(session, f"Error: {str(e)}")
+
+    def choose_version(version):
+        async def handler(session, event):
+            version_sig.set(session, version)
+            await generate(session, event)
+        return handler
+
+    for version in bulk_random.UUID_VERSIONS:
+        c.on(f"uuid_v{version}")(choose_version(version))
+
+    @c.on("set_uuid_count")
+    async def set_count(session, event):
+        try:
+            count = int(event.get("value", "") or 1)
+        except ValueError:
+            report.set(session, "Count must be a whole number")
+            return
+        if count > UUID_BATCH_LIMIT:
+            report.set(session, f"At most {UUID_BATCH_LIMIT:,} IDs at a time")
+        count_sig.set(session, max(1, min(count, UUID_BATCH_LIMIT)))
+
+    @c.on("uuid_text")
+    async def set_text(session, event):
+        format_sig.set(session, "text")
+
+    @c.on("uuid_csv")
+    async def set_csv(session, event):
+        format_sig.set(session, "csv")
+
+    @c.on("uuid_prev_page")
+    async def prev_page(session, event):
+        view.page(session, -1)
+
+    @c.on("uuid_next_page")
+    async def next_page(session, event):
+        view.page(session, 1)
 
     # Clean card-based layout
     with c.card():
-        c.text("Generate UUIDs (Universally Unique Identifiers).", color="muted")
+        c.text("Generate UUIDs (Universally Unique Identifiers), one at a time or in bulk.", color="muted")
         c.spacer()
 
         # Large output display
         c.code(result)
+        c.text(report, size="sm", color="muted")
+        c.text(window, size="sm", color="muted")
+        with c.row(justify="start"):
+            c.button("Previous", on_click="uuid_prev_page", variant="outline", size="sm")
+            c.button("Next", on_click="uuid_next_page", variant="outline", size="sm")
+        c.spacer()
+
+        with c.row(justify="start"):
+            c.button("v4 (random)", on_click="uuid_v4", variant="outline")
+            c.button("v1 (time)", on_click="uuid_v1", variant="outline")
+            c.button("v7 (time-ordered)", on_click="uuid_v7", variant="outline")
+            c.button("Text", on_click="uuid_text", variant="outline")
+            c.button("CSV", on_click="uuid_csv", variant="outline")
+
+        c.spacer()
+
+        c.input("Count", placeholder="1", on_change="set_uuid_count")
+
         c.spacer()
 
-        # Action button
+        # Action buttons
         with c.row(justify="start"):
-            c.button("Generate New UUID", on_click="gen_uuid", variant="primary")
+            c.button("Generate", on_click="gen_uuid", variant="primary")
+
+
+PASSWORD_CLASSES = {"digit": string.digits, "symbol": bulk_random.SYMBOLS}
+PASSWORD_ALPHABET = bulk_random.PASSWORD_ALPHABET
+PASSWORD_BATCH_LIMIT = 10_000
+
+
+def _password_batch(count, length, required):
+    """Generate count passwords, one per line; returns (output, report)."""
+    classes = [PASSWORD_CLASSES[name] for name in required]
+    start = time.perf_counter()
+    batch = bulk_random.passwords(count, length, PASSWORD_ALPHABET, classes)
+    elapsed = time.perf_counter() - start
+    entropy = bulk_random.password_entropy(length, PASSWORD_ALPHABET, classes)
+    report = f"Entropy: at least {entropy:.1f} bits each. " + format_item_rate(count, "passwords", elapsed)
+    return "\n".join(batch), report
 
 
 def password_tool():
     """Password generator."""
-    chars = string.ascii_letters + string.digits + "!@#$%^&*"
-    initial_pwd = "".join(secrets.choice(chars) for _ in range(16))
-
-    password = c.signal(initial_pwd, name="password")
+    # A default would be the same password for every session; generate on request
+    password = c.signal("Click Generate Password", name="password")
     length = c.signal(16, name="pwd_length")
+    count_sig = c.signal(1, name="pwd_count")
+    required_sig = c.signal([], name="pwd_required")
+    report = c.signal("", name="pwd_stats")
+    derived(password, report)
 
     @c.on("gen_password")
     async def generate(session, event):
-        pwd_len = length.get(session)
-        pwd = "".join(secrets.choice(chars) for _ in range(pwd_len))
-        password.set(session, pwd)
+        executor.submit(session, "password", publish, _password_batch, count_sig.get(session),
+                        length.get(session), required_sig.get(session), on_error=publish_error)
+
+    def publish(session, generated):
+        password.set(session, generated[0])
+        report.set(session, generated[1])
+
+    def publish_error(session, e):
+        report.set(session, f"Error: {str(e)}")
 
     @c.on("set_pwd_length")
     async def set_length(session, event):
         length.set(session, int(event.get("value", 16)))
 
+    @c.on("set_pwd_count")
+    async def set_count(session, event):
+        try:
+            count = int(event.get("value", "") or 1)
+        except ValueError:
+            report.set(session, "Count must be a whole number")
+            return
+        count_sig.set(session, max(1, min(count, PASSWORD_BATCH_LIMIT)))
+
+    def toggle(name):
+        async def handler(session, event):
+            required = required_sig.get(session)
+            required_sig.set(session, [r for r in required if r != name] if name in required else required + [name])
+            report.set(session, "Requires: " + (", ".join(required_sig.get(session)) or "nothing"))
+        return handler
+
+    for name in PASSWORD_CLASSES:
+        c.on(f"pwd_require_{name}")(toggle(name))
+
     with c.card():
-        c.text("Generate secure random passwords.", color="muted")
+        c.text("Generate secure random passwords, one at a time or in batches.", color="muted")
         c.spacer()
 
         # Output display
         c.code(password)
+        c.text(report, size="sm", color="muted")
         c.spacer()
 
         # Controls
         c.slider("Password Length", min=8, max=64, value=16, on_change="set_pwd_length")
         c.spacer()
 
+        c.input("Count", placeholder="1", on_change="set_pwd_count")
+        c.spacer()
+
         with c.row(justify="start"):
             c.button("Generate Password", on_click="gen_password", variant="primary")
+            c.button("Require Digit", on_click="pwd_require_digit", variant="outline")
+            c.button("Require Symbol", on_click="pwd_require_symbol", variant="outline")
+
+
+LOREM_DEFAULT = ("Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod tempor incididunt "
+                 "ut labore et dolore magna aliqua.")
 
 
 def lorem_tool():
     """Lorem Ipsum generator."""
-    LOREM_WORDS = [
-        "lorem", "ipsum", "dolor", "sit", "amet", "consectetur", "adipiscing",
-        "elit", "sed", "do", "eiusmod", "tempor", "incididunt", "ut", "labore",
-        "et", "dolore", "magna", "aliqua", "enim", "ad", "minim", "veniam",
-    ]
-
     def gen_paragraph():
-        def gen_sentence():
-            sent_length = random.randint(8, 16)
-            words = [random.choice(LOREM_WORDS) for _ in range(sent_length)]
-            words[0] = words[0].capitalize()
-            return " ".join(words) + "."
-        sentences = [gen_sentence() for _ in range(random.randint(4, 8))]
-        return " ".join(sentences)
-
-    initial_text = "\n\n".join(gen_paragraph() for _ in range(3))
-    output = c.signal(initial_text, name="lorem_out")
+        return " ".join(fake_data.sentences(random, random.randint(4, 8)))
+
+    output = c.signal(LOREM_DEFAULT, name="lorem_out")
     para_count = c.signal(3, name="lorem_para")
+    derived(output)
 
     @c.on("gen_lorem")
     async def generate(session, event):
@@ -119,3 +251,112 @@ def lorem_tool():
 
         # Output
         c.text(output)
+
+
+FAKE_ROW_LIMIT = 100_000  # rows per run, held per session and paged to the browser
+
+
+def _fake_rows(schema, count, fmt, seed):
+    """Generate count rows as one text; returns (output, report)."""
+    columns = fake_data.parse_schema(schema)
+    start = time.perf_counter()
+    output = "".join(fake_data.iter_text(columns, count, fmt, seed))
+    report = f"Seed {seed}: " + format_item_rate(count, "rows", time.perf_counter() - start)
+    return output.rstrip("\n"), report
+
+
+def fake_data_tool():
+    """Schema-driven fake data generator."""
+    schema_sig = c.signal(fake_data.EXAMPLE_SCHEMA, name="fake_schema")
+    count_sig = c.signal(10, name="fake_count")
+    seed_sig = c.signal("", name="fake_seed")
+    format_sig = c.signal("jsonl", name="fake_format")
+    output = c.signal("", name="fake_out")
+    report = c.signal("", name="fake_stats")
+    window = c.signal("", name="fake_window")
+    view = Pager("fake_data", output, window)
+
+    def seed_for(session):
+        seed = seed_sig.get(session).strip()
+        return int(seed) if seed else fake_data.new_seed()
+
+    @c.on("set_fake_schema")
+    async def set_schema(session, event):
+        schema_sig.set(session, event.get("value", ""))
+
+    @c.on("set_fake_count")
+    async def set_count(session, event):
+        try:
+            count = int(event.get("value", "") or 10)
+        except ValueError:
+            report.set(session, "Count must be a whole number")
+            return
+        if count > FAKE_ROW_LIMIT:
+            report.set(session, f"At most {FAKE_ROW_LIMIT:,} rows at a time")
+        count_sig.set(session, max(1, min(count, FAKE_ROW_LIMIT)))
+
+    @c.on("set_fake_seed")
+    async def set_seed(session, event):
+        seed = event.get("value", "").strip()
+        if seed and not seed.isdigit():
+            report.set(session, "Seed must be a whole number, or empty for a random seed")
+            return
+        seed_sig.set(session, seed)
+
+    @c.on("fake_jsonl")
+    async def set_jsonl(session, event):
+        format_sig.set(session, "jsonl")
+        await generate(session, event)
+
+    @c.on("fake_csv")
+    async def set_csv(session, event):
+        format_sig.set(session, "csv")
+        await generate(session, event)
+
+    @c.on("gen_fake")
+    async def generate(session, event):
+        executor.submit(session, "fake_data", publish, _fake_rows, schema_sig.get(session), count_sig.get(session),
+                        format_sig.get(session), seed_for(session), process=True, on_error=publish_error)
+
+    def publish(session, generated):
+        view.clear(session)  # a fresh run starts on its first page
+        view.publish(session, generated[0])
+        report.set(session, generated[1])
+
+    def publish_error(session, e):
+        report.set(session, f"Error: {str(e)}")
+
+    @c.on("fake_prev_page")
+    async def prev_page(session, event):
+        view.page(session, -1)
+
+    @c.on("fake_next_page")
+    async def next_page(session, event):
+        view.page(session, 1)
+
+    with c.card():
+        c.text("Generate rows of test data from a schema of column types, as JSON Lines or CSV.", color="muted")
+        c.text("Types: index, uuid, password[:length], int:min:max, float:min:max[:digits], bool, "
+               "date:first:last, choice:a|b|c, lorem[:min_words[:max_words]]", size="sm", color="muted")
+        c.spacer()
+
+        with c.row():
+            with c.col(span=6):
+                c.textarea(label="Schema", signal=schema_sig, rows=10, on_change="set_fake_schema")
+                c.spacer()
+                with c.row():
+                    c.input("Rows", placeholder="10", on_change="set_fake_count")
+                    c.input("Seed", placeholder="Random", on_change="set_fake_seed")
+                c.spacer()
+                with c.row(justify="start"):
+                    c.button("JSON Lines", on_click="fake_jsonl", variant="primary")
+                    c.button("CSV", on_click="fake_csv", variant="outline")
+
+            with c.col(span=6):
+                c.text("Output", size="sm", color="muted")
+                c.code(output, language="json")
+                c.text(report, size="sm", color="muted")
+                c.text(window, size="sm", color="muted")
+                with c.row(justify="start"):
+                    c.button("Previous", on_click="fake_prev_page", variant="outline", size="sm")
+                    c.button("Next", on_click="fake_next_page", variant="outline", size="sm")
@@ -0,0 +1,43 @@
+"""Hex dumps of a window into binary data held in memory or in a file."""
+
+import os
+
+ROW = 16  # bytes per line
+ROWS = 32  # lines per window
+
+_PRINTABLE = bytes(b if 32 <= b < 127 else 46 for b in range(256))  # others become "."
+
+
+def hexdump(data, offset=0):
+    """Format bytes like `hexdump -C`, numbering lines from offset."""
+    lines = []
+    for i in range(0, len(data), ROW):
+        row = data[i:i + ROW]
+        left = row[:8].hex(" ")
+        right = row[8:].hex(" ")
+        lines.append(f"{offset + i:08x}  {left:<23}  {right:<23}  |{row.translate(_PRINTABLE).decode('ascii')}|")
+    return "\n".join(lines)
+
+
+def size_of(source):
+    """Length of bytes, or of the file at a path."""
+    if isinstance(source, (bytes, bytearray)):
+        return len(source)
+    return os.path.getsize(source)
+
+
+def read_window(source, offset, size=ROW * ROWS):
+    """Read only size bytes at offset from bytes or from the file at a path."""
+    if isinstance(source, (bytes, bytearray)):
+        return bytes(source[offset:offset + size])
+    with open(source, "rb") as f:
+        f.seek(offset)
+        return f.read(size)
+
+
+def window(source, page):
+    """Return (hex dump of one page, page count) of bytes or a file."""
+    pages = max(1, -(-size_of(source) // (ROW * ROWS)))
+    page = max(0, min(page, pages - 1))
+    offset = page * ROW * ROWS
+    return hexdump(read_window(source, offset), offset), pages
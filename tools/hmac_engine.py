@@ -0,0 +1,86 @@
+"""HMAC signing and verification that reuses the keyed state.
+
+hmac.new() hashes the padded key into an inner and outer state before it
+sees any message. That state depends only on the key and digest, so a
+batch builds it once and copies it for each message. It is not kept
+between calls: keys are secrets, and nothing derived from them outlives
+the request that supplied them (see result_cache.SENSITIVE).
+"""
+
+import base64
+import binascii
+import hmac
+import re
+
+DIGESTS = {
+    "SHA-256": "sha256",
+    "SHA-384": "sha384",
+    "SHA-512": "sha512",
+    "SHA-1": "sha1",
+    "MD5": "md5",
+    "SHA3-256": "sha3_256",
+    "BLAKE2b": "blake2b",
+}
+LIST_LIMIT = 100  # failing lines listed individually in a verify report
+
+# "<signature> <message>", where the signature may carry a "sha256=" style prefix
+_SIGNED_LINE = re.compile(r"(?:[\w-]+=)?([A-Za-z0-9+/_-]+=*)[ \t](.*)", re.DOTALL)
+
+
+def keyed(key, digest="SHA-256"):
+    """Return the HMAC object for key (bytes) before any message; copy it, never update it."""
+    return hmac.new(key, digestmod=DIGESTS[digest])
+
+
+def sign(key, message, digest="SHA-256"):
+    """Return the HMAC digest of message (bytes) under key (bytes)."""
+    # One message, so there is no keyed state worth keeping: hash it in one call
+    return hmac.digest(key, message, DIGESTS[digest])
+
+
+def sign_lines(key, lines, digest="SHA-256"):
+    """Return the hex HMAC of each str line, encoded as UTF-8."""
+    state = keyed(key, digest)
+    signatures = []
+    for line in lines:
+        mac = state.copy()
+        mac.update(line.encode("utf-8"))
+        signatures.append(mac.hexdigest())
+    return signatures
+
+
+def _parse_signature(text, size):
+    """Decode a hex or Base64 signature; returns None if it is neither."""
+    if len(text) == 2 * size:
+        try:
+            return bytes.fromhex(text)
+        except ValueError:
+            pass
+    try:
+        return base64.b64decode(text.replace("-", "+").replace("_", "/") + "=" * (-len(text) % 4), validate=True)
+    except binascii.Error:
+        return None
+
+
+def verify_lines(key, lines, digest="SHA-256"):
+    """Check lines of "<signature> <message>"; returns [(line number, problem)].
+
+    Signatures may be hex or Base64 and may carry a prefix such as
+    "sha256=". Blank lines are skipped.
+    """
+    state = keyed(key, digest)
+    size = state.digest_size
+    failures = []
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        match = _SIGNED_LINE.fullmatch(line)
+        expected = match and _parse_signature(match.group(1), size)
+        if not expected:
+            failures.append((number, "expected '<signature> <message>'"))
+            continue
+        mac = state.copy()
+        mac.update(match.group(2).encode("utf-8"))
+        if not hmac.compare_digest(mac.digest(), expected):
+            failures.append((number, "signature mismatch"))
+    return failures
@@ -0,0 +1,130 @@
+"""Local HTTP endpoint for running tool transforms in batches.
+
+    GET  /tools         list the transforms and their options
+    POST /tools/<name>  run a batch; options may also go in the query string
+
+A JSON body is a list of items, or {"items": [...], "options": {...}},
+and gets back {"results": [...]}. An application/x-ndjson body holds one
+item per line and gets back one result per line, streamed as each item
+finishes. An item is a string for the transform's main input or an
+object of parameters.
+"""
+
+import json
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from . import api
+
+HOST = "127.0.0.1"  # local only; the tools read and write server-side files
+PORT = 8765
+MAX_BODY = 64 << 20  # bytes
+# Host names a request may be addressed to; any other is a DNS rebinding attempt from a web page
+LOCAL_NAMES = frozenset({"127.0.0.1", "localhost", "::1"})
+
+
+class Handler(BaseHTTPRequestHandler):
+    server_version = "CacaoTools"
+
+    def _send_json(self, status, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _error(self, status, message):
+        self._send_json(status, {"error": message})
+
+    def _local(self):
+        """Whether the Host header names this machine; answers 403 otherwise."""
+        try:
+            name = urllib.parse.urlsplit("//" + self.headers.get("Host", "")).hostname
+        except ValueError:
+            name = None
+        if name in LOCAL_NAMES or name == self.server.server_address[0]:
+            return True
+        self._error(403, "Host not allowed")
+        return False
+
+    def do_GET(self):
+        if not self._local():
+            return
+        if urllib.parse.urlsplit(self.path).path.rstrip("/") == "/tools":
+            self._send_json(200, api.describe())
+        else:
+            self._error(404, "Not found")
+
+    def do_POST(self):
+        if not self._local():
+            return
+        url = urllib.parse.urlsplit(self.path)
+        prefix, _, name = url.path.strip("/").partition("/")
+        if prefix != "tools" or name not in api.TRANSFORMS:
+            self._error(404, f"Unknown tool: {name}" if prefix == "tools" else "Not found")
+            return
+        try:
+            length = int(self.headers.get("Content-Length", ""))
+        except ValueError:
+            self._error(411, "Content-Length required")
+            return
+        if length > MAX_BODY:
+            self._error(413, f"Body larger than {MAX_BODY:,} bytes")
+            return
+        options = dict(urllib.parse.parse_qsl(url.query))
+        if self.headers.get_content_type() == "application/x-ndjson":
+            self._stream(name, length, options)
+            return
+        try:
+            body = json.loads(self.rfile.read(length))
+            if isinstance(body, dict):
+                if not isinstance(body.get("options", {}), dict):
+                    raise ValueError("\"options\" must be an object")
+                options.update(body.get("options", {}))
+                body = body.get("items", [])
+            if not isinstance(body, list):
+                raise ValueError("Expected a list of items or {\"items\": [...]}")
+        except ValueError as e:
+            self._error(400, f"Invalid request: {str(e)}")
+            return
+        self._send_json(200, {"results": list(api.iter_batch(name, body, options))})
+
+    def _stream(self, name, length, options):
+        remaining = [length]
+
+        def items():
+            while remaining[0] > 0:
+                line = self.rfile.readline(remaining[0])
+                if not line:
+                    return
+                remaining[0] -= len(line)
+                if line.strip():
+                    try:
+                        yield json.loads(line)
+                    except ValueError as e:
+                        yield ValueError(f"Invalid JSON line: {str(e)}")
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Connection", "close")  # the body ends when the connection does
+        self.end_headers()
+        self.close_connection = True
+        for result in api.iter_batch(name, items(), options):
+            self.wfile.write(json.dumps(result).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+    def log_message(self, format, *args):
+        pass  # one line per request would swamp batch pipelines
+
+
+def serve(host=HOST, port=PORT):
+    """Serve the API until interrupted."""
+    server = ThreadingHTTPServer((host, port), Handler)
+    print(f"Serving {len(api.TRANSFORMS)} tools on http://{host}:{port}/tools")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
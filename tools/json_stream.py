@@ -0,0 +1,313 @@
+"""Incremental JSON tokenizer producing a flat stream of parse events.
+
+Events are (kind, value) tuples: ("start_map", None), ("key", str),
+("end_map", None), ("start_array", None), ("end_array", None) and
+("value", scalar). Nesting is tracked with an explicit stack, so neither
+parsing nor walking is limited by the recursion limit.
+"""
+
+import itertools
+import json
+import re
+
+CHUNK_SIZE = 1 << 20
+
+_WS = re.compile(r"[ \t\n\r]*")
+# One group per token kind, so the parser can branch on m.lastindex alone
+_TOKEN = re.compile(r"""[ \t\n\r]*(?:
+    (\{) | (\[) | (\}) | (\]) | (,) | (:)
+  | ("[^"\\\x00-\x1f]*(?:\\.[^"\\\x00-\x1f]*)*")     # complete string
+  | (-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?)  # number
+  | (true|false|null)
+)""", re.VERBOSE)
+_OPEN_MAP, _OPEN_ARRAY, _CLOSE_MAP, _CLOSE_ARRAY, _COMMA, _COLON_TOKEN, _STRING, _NUMBER, _LITERAL = range(1, 10)
+# What an unfinished token at the end of a chunk can look like
+_PARTIAL = re.compile(r'"|-?[0-9]*\.?[0-9]*(?:[eE][+-]?[0-9]*)?\Z|(?:t|tr|tru|f|fa|fal|fals|n|nu|nul)\Z')
+_NUMBER_TAIL = re.compile(r"[0-9.eE+-]*\Z")
+_LITERALS = {"true": True, "false": False, "null": None}
+_END = object()
+_decoder = json.JSONDecoder()
+
+# Parser states
+_VALUE, _VALUE_OR_END, _KEY, _KEY_OR_END, _COLON, _COMMA_OR_END, _DONE = range(7)
+
+
+def _unexpected(m, offset):
+    return ValueError(f"Unexpected {m.group(m.lastindex)[:20]!r} at position {offset + m.start(m.lastindex)}")
+
+
+def iter_events(chunks):
+    """Parse JSON text arriving as an iterable of str chunks into events.
+
+    Raises ValueError on malformed input.
+    """
+    stack = []  # True for an object, False for an array
+    state = _VALUE
+    buf = ""
+    pos = 0
+    offset = 0  # characters consumed from earlier chunks, for error messages
+    need = 0  # length of an unfinished token carried over from the last chunk
+    chunks = iter(chunks)
+    final = False
+
+    while not final:
+        # Read at least as much new text as is carried over, so a token
+        # spanning many chunks is rescanned a logarithmic number of times
+        parts = [buf[pos:]]
+        got = 0
+        while True:
+            chunk = next(chunks, None)
+            if chunk is None:
+                final = True
+                break
+            parts.append(chunk)
+            got += len(chunk)
+            if got >= need:
+                break
+        offset += pos
+        buf = "".join(parts)
+        pos = 0
+        need = 0
+
+        end = len(buf)
+        next_token = _TOKEN.scanner(buf, pos).match
+        while True:
+            m = next_token()
+            group = m.lastindex if m is not None else None
+            if group is None or (group == _NUMBER and not final and end - m.end() <= 2
+                                 and _NUMBER_TAIL.match(buf, m.end())):
+                pos = _WS.match(buf, pos).end()
+                if pos >= end:
+                    break
+                # Incomplete token split across chunks: wait for more text
+                if not final and _PARTIAL.match(buf, pos):
+                    need = end - pos
+                    break
+                raise ValueError(f"Invalid JSON at position {offset + pos}")
+            pos = m.end()
+
+            if group == _STRING:
+                token = m.group(group)
+                value = json.loads(token) if "\\" in token else token[1:-1]
+                if state == _KEY or state == _KEY_OR_END:
+                    state = _COLON
+                    yield "key", value
+                    continue
+            elif group == _NUMBER:
+                token = m.group(group)
+                value = float(token) if "." in token or "e" in token or "E" in token else int(token)
+            elif group == _LITERAL:
+                value = _LITERALS[m.group(group)]
+            elif group == _COMMA:
+                if state != _COMMA_OR_END:
+                    raise _unexpected(m, offset)
+                state = _KEY if stack[-1] else _VALUE
+                continue
+            elif group == _COLON_TOKEN:
+                if state != _COLON:
+                    raise _unexpected(m, offset)
+                state = _VALUE
+                continue
+            elif group <= _OPEN_ARRAY:
+                if state != _VALUE and state != _VALUE_OR_END:
+                    raise _unexpected(m, offset)
+                if group == _OPEN_MAP:
+                    stack.append(True)
+                    state = _KEY_OR_END
+                    yield "start_map", None
+                else:
+                    stack.append(False)
+                    state = _VALUE_OR_END
+                    yield "start_array", None
+                continue
+            else:
+                is_map = group == _CLOSE_MAP
+                if not stack or stack[-1] != is_map or (
+                        state != _COMMA_OR_END and state != (_KEY_OR_END if is_map else _VALUE_OR_END)):
+                    raise _unexpected(m, offset)
+                stack.pop()
+                state = _COMMA_OR_END if stack else _DONE
+                yield ("end_map" if is_map else "end_array"), None
+                continue
+
+            if state != _VALUE and state != _VALUE_OR_END:
+                raise _unexpected(m, offset)
+            state = _COMMA_OR_END if stack else _DONE
+            yield "value", value
+
+    if state != _DONE:
+        raise ValueError("Unexpected end of JSON input")
+
+
+def iter_file(f, size=CHUNK_SIZE):
+    """Yield chunks of text read from a file object."""
+    while True:
+        chunk = f.read(size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def walk(data):
+    """Yield the events describing an already parsed JSON value."""
+    stack = []  # (iterator over children, is_map)
+    item = data
+    while True:
+        if isinstance(item, dict):
+            yield "start_map", None
+            stack.append((iter(item.items()), True))
+        elif isinstance(item, (list, tuple)):
+            yield "start_array", None
+            stack.append((iter(item), False))
+        else:
+            yield "value", item
+
+        while stack:
+            children, is_map = stack[-1]
+            child = next(children, _END)
+            if child is _END:
+                stack.pop()
+                yield ("end_map" if is_map else "end_array"), None
+                continue
+            if is_map:
+                key, item = child
+                yield "key", key
+            else:
+                item = child
+            break
+        else:
+            return
+
+
+def _build(kind, value, events):
+    """Assemble the value that starts with (kind, value) from the events that follow."""
+    if kind == "value":
+        return value
+    root = {} if kind == "start_map" else []
+    stack = [root]
+    key = None
+    for kind, value in events:
+        top = stack[-1]
+        if kind == "key":
+            key = value
+        elif kind == "value":
+            if type(top) is dict:
+                top[key] = value
+            else:
+                top.append(value)
+        elif kind == "start_map" or kind == "start_array":
+            child = {} if kind == "start_map" else []
+            if type(top) is dict:
+                top[key] = child
+            else:
+                top.append(child)
+            stack.append(child)
+        else:
+            stack.pop()
+            if not stack:
+                return root
+    raise ValueError("Unexpected end of JSON input")
+
+
+def iter_items(events):
+    """Yield the elements of a top-level array one at a time.
+
+    Only one element is held in memory at once. A top-level value that is
+    not an array is yielded as the single item.
+    """
+    events = iter(events)
+    kind, value = next(events)
+    if kind != "start_array":
+        yield _build(kind, value, events)
+    else:
+        for kind, value in events:
+            if kind == "end_array":
+                break
+            yield _build(kind, value, events)
+    # Parse to the end, so trailing text such as a second "}" is refused
+    for _ in events:
+        raise ValueError("Extra data after JSON value")
+
+
+def iter_array(chunks):
+    """Yield the elements of a top-level JSON array read from text chunks.
+
+    Each element is parsed by the C decoder with raw_decode, so this is much
+    faster than iter_items over iter_events while still holding only one
+    element and one chunk in memory. A top-level value that is not an array
+    falls back to the event parser and is yielded as the single item.
+    """
+    decode = _decoder.raw_decode
+    chunks = iter(chunks)
+    buf = ""
+    pos = 0
+    final = False
+    opened = False
+    expect_value = True  # after "[" or ","; False after an element
+    first = True  # directly after "[", where "]" is also allowed
+
+    def more(need):
+        nonlocal buf, pos, final
+        parts = [buf[pos:]]
+        got = 0
+        while got <= need:
+            chunk = next(chunks, None)
+            if chunk is None:
+                final = True
+                break
+            parts.append(chunk)
+            got += len(chunk)
+        buf = "".join(parts)
+        pos = 0
+
+    while True:
+        pos = _WS.match(buf, pos).end()
+        if pos >= len(buf):
+            if final:
+                raise ValueError("Unexpected end of JSON input")
+            more(0)
+            continue
+
+        if not opened:
+            if buf[pos] != "[":
+                yield from iter_items(iter_events(itertools.chain((buf[pos:],), chunks)))
+                return
+            opened = True
+            pos += 1
+            continue
+
+        char = buf[pos]
+        if char == "]" and (first or not expect_value):
+            pos += 1
+            break
+        if not expect_value:
+            if char != ",":
+                raise ValueError(f"Expected ',' or ']' in array, got {char!r}")
+            expect_value = True
+            pos += 1
+            continue
+
+        try:
+            item, end = decode(buf, pos)
+        except json.JSONDecodeError:
+            if final:
+                raise
+            more(len(buf) - pos)
+            continue
+        if not final and (end == len(buf) or (buf[pos] in "-0123456789" and _NUMBER_TAIL.match(buf, end))):
+            # A number at the end of the buffer ("1." or "1e+") may continue in the next chunk
+            more(len(buf) - pos)
+            continue
+        pos = end
+        first = False
+        expect_value = False
+        yield item
+
+    # Only whitespace may follow the closing bracket
+    while True:
+        if _WS.match(buf, pos).end() < len(buf):
+            raise ValueError("Extra data after JSON array")
+        chunk = next(chunks, None)
+        if chunk is None:
+            return
+        buf, pos = chunk, 0
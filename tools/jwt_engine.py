@@ -0,0 +1,355 @@
+"""Bulk JWT decoding and signature verification.
+
+HS256/384/512 are verified with the standard library. RS, PS and ES
+algorithms need the optional cryptography package and a PEM key,
+certificate or JWKS file. Keys parsed from a file are cached by file,
+keys inside a set are looked up by `kid`, and each key set remembers the
+verdicts for tokens it has already checked. Key sets, with the secret
+and tokens they hold, belong to one call: nothing a client sent is kept
+once it returns.
+"""
+
+import base64
+import collections
+import datetime
+import functools
+import hashlib
+import hmac
+import json
+import math
+import os
+import re
+import stat
+import threading
+import time
+import types
+
+# A JWT header always starts with '{"', which is "eyJ" in Base64
+TOKEN = re.compile(r"eyJ[A-Za-z0-9_-]*\.[A-Za-z0-9_-]+\.[A-Za-z0-9_-]*")
+MEMO_SIZE = 65536  # verdicts remembered per key set
+LEEWAY = 0  # seconds of clock skew allowed for exp and nbf
+_EPOCH = datetime.datetime(1970, 1, 1)
+# NumericDates outside years 1-9999 cannot be shown as dates
+MIN_TIME = (datetime.datetime(1, 1, 1) - _EPOCH) // datetime.timedelta(seconds=1)
+MAX_TIME = (datetime.datetime(9999, 12, 31, 23, 59, 59) - _EPOCH) // datetime.timedelta(seconds=1)
+
+_HMAC_DIGESTS = {"HS256": hashlib.sha256, "HS384": hashlib.sha384, "HS512": hashlib.sha512}
+_HASH_NAMES = {"256": "SHA256", "384": "SHA384", "512": "SHA512"}
+# alg -> (JWK curve, cryptography curve name, bytes per signature half)
+_CURVES = {"ES256": ("P-256", "secp256r1", 32), "ES384": ("P-384", "secp384r1", 48), "ES512": ("P-521", "secp521r1", 66)}
+
+VALID = "valid"
+INVALID = "invalid signature"
+NO_KEY = "no key"
+UNVERIFIED = "unverified (alg none)"
+INVALID_HEADER = "invalid header: alg and kid must be strings"
+
+
+@functools.lru_cache(maxsize=None)
+def crypto():
+    """The cryptography modules RS/PS/ES need, or None if it is not installed.
+
+    Imported on first use: it costs more at startup than the rest of the
+    tools together.
+    """
+    try:
+        from cryptography import x509
+        from cryptography.exceptions import InvalidSignature
+        from cryptography.hazmat.primitives import hashes, serialization
+        from cryptography.hazmat.primitives.asymmetric import ec, padding, rsa, utils
+    except ImportError:
+        return None
+    return types.SimpleNamespace(x509=x509, InvalidSignature=InvalidSignature, hashes=hashes,
+                                 serialization=serialization, ec=ec, padding=padding, rsa=rsa, utils=utils)
+
+
+def _b64decode(part):
+    return base64.urlsafe_b64decode(part + "=" * (-len(part) % 4))
+
+
+def find_tokens(text):
+    """Return every JWT-shaped string in text, in order."""
+    return TOKEN.findall(text)
+
+
+def decode(token):
+    """Split and decode a token into (header, payload, signing input, signature).
+
+    Returns a str describing the problem instead when the token is malformed.
+    """
+    parts = token.split(".")
+    if len(parts) != 3:
+        return "malformed: expected 3 parts"
+    try:
+        header = json.loads(_b64decode(parts[0]))
+        payload = json.loads(_b64decode(parts[1]))
+        signature = _b64decode(parts[2])
+    except ValueError as e:
+        return f"malformed: {e}"
+    if not isinstance(header, dict) or not isinstance(payload, dict):
+        return "malformed: header and payload must be JSON objects"
+    return header, payload, (parts[0] + "." + parts[1]).encode("ascii"), signature
+
+
+class KeySet:
+    """Verification keys by kid, with a memo of verdicts per token."""
+
+    def __init__(self, keys=None, default=None):
+        self.keys = keys or {}  # kid -> (kind, key); kind is "hmac", "rsa" or "ec"
+        self.default = default  # used for tokens without a kid, or for any token when no key has a kid
+        self._hmac = {}  # (kid, alg) -> keyed HMAC object to copy per token
+        self._memo = collections.OrderedDict()
+        self._lock = threading.Lock()  # verify may be called from several threads
+        self.hits = 0
+
+    def key_for(self, kid):
+        """Return (slot, key): the kid the key is stored under (None for the default) and the key.
+
+        A kid that names no key in a set of identified keys finds nothing,
+        rather than falling back to a key meant for someone else.
+        """
+        if kid is not None and kid in self.keys:
+            return kid, self.keys[kid]
+        if kid is not None and any(name is not None for name in self.keys):
+            return None, None
+        return None, self.default
+
+    def verify(self, token, header, signing_input, signature):
+        """Return VALID, INVALID, NO_KEY, UNVERIFIED or an explanation."""
+        with self._lock:
+            verdict = self._memo.get(token)
+            if verdict is not None:
+                self._memo.move_to_end(token)
+                self.hits += 1
+                return verdict
+        verdict = self._verify(header, signing_input, signature)
+        with self._lock:
+            self._memo[token] = verdict
+            if len(self._memo) > MEMO_SIZE:
+                self._memo.popitem(last=False)
+        return verdict
+
+    def _verify(self, header, signing_input, signature):
+        alg = header.get("alg")
+        kid = header.get("kid")
+        if not isinstance(alg, str) or not (kid is None or isinstance(kid, str)):
+            # A list or object here cannot be looked up, and says nothing about the key anyway
+            return INVALID_HEADER
+        if alg == "none":
+            return UNVERIFIED
+        slot, key = self.key_for(kid)
+        if key is None:
+            return NO_KEY
+        kind, material = key
+        if alg in _HMAC_DIGESTS:
+            if kind != "hmac":
+                return f"{alg} needs a shared secret, not an {kind.upper()} key"
+            # The padded inner/outer key state is computed once per key and copied
+            state = self._hmac.get((slot, alg))
+            if state is None:
+                state = self._hmac[(slot, alg)] = hmac.new(material, digestmod=_HMAC_DIGESTS[alg])
+            mac = state.copy()
+            mac.update(signing_input)
+            return VALID if hmac.compare_digest(mac.digest(), signature) else INVALID
+        if alg[:2] not in ("RS", "PS", "ES") or alg[2:] not in _HASH_NAMES:
+            return f"unsupported alg {alg!r}"
+        cr = crypto()
+        if cr is None:
+            return f"{alg} needs the cryptography package (pip install cryptography)"
+        algorithm = getattr(cr.hashes, _HASH_NAMES[alg[2:]])()
+        try:
+            if alg[:2] in ("RS", "PS"):
+                if kind != "rsa":
+                    return f"{alg} needs an RSA key"
+                if alg[:2] == "RS":
+                    pad = cr.padding.PKCS1v15()
+                else:
+                    pad = cr.padding.PSS(mgf=cr.padding.MGF1(algorithm), salt_length=algorithm.digest_size)
+                material.verify(signature, signing_input, pad, algorithm)
+            else:
+                curve, curve_name, size = _CURVES[alg]
+                if kind != "ec" or material.curve.name != curve_name:
+                    return f"{alg} needs an EC {curve} key"
+                if len(signature) != 2 * size:
+                    return INVALID
+                r = int.from_bytes(signature[:size], "big")
+                s = int.from_bytes(signature[size:], "big")
+                material.verify(cr.utils.encode_dss_signature(r, s), signing_input, cr.ec.ECDSA(algorithm))
+        except cr.InvalidSignature:
+            return INVALID
+        return VALID
+
+
+def _jwk(jwk):
+    """Parse one JWK into (kind, key)."""
+    kty = jwk.get("kty")
+    if kty == "oct":
+        return "hmac", _b64decode(jwk["k"])
+    cr = crypto()
+    if cr is None:
+        raise ValueError("RSA and EC keys need the cryptography package (pip install cryptography)")
+    if kty == "RSA":
+        n = int.from_bytes(_b64decode(jwk["n"]), "big")
+        e = int.from_bytes(_b64decode(jwk["e"]), "big")
+        return "rsa", cr.rsa.RSAPublicNumbers(e, n).public_key()
+    if kty == "EC":
+        curve = {"P-256": cr.ec.SECP256R1, "P-384": cr.ec.SECP384R1, "P-521": cr.ec.SECP521R1}.get(jwk.get("crv"))
+        if curve is None:
+            raise ValueError(f"Unsupported EC curve: {jwk.get('crv')}")
+        x = int.from_bytes(_b64decode(jwk["x"]), "big")
+        y = int.from_bytes(_b64decode(jwk["y"]), "big")
+        return "ec", cr.ec.EllipticCurvePublicNumbers(x, y, curve()).public_key()
+    raise ValueError(f"Unsupported key type: {kty}")
+
+
+def _pem(data):
+    """Parse a PEM public key or certificate into (kind, key)."""
+    cr = crypto()
+    if cr is None:
+        raise ValueError("PEM keys need the cryptography package (pip install cryptography)")
+    if b"BEGIN CERTIFICATE" in data:
+        key = cr.x509.load_pem_x509_certificate(data).public_key()
+    else:
+        key = cr.serialization.load_pem_public_key(data)
+    if isinstance(key, cr.rsa.RSAPublicKey):
+        return "rsa", key
+    if isinstance(key, cr.ec.EllipticCurvePublicKey):
+        return "ec", key
+    raise ValueError("Only RSA and EC public keys are supported")
+
+
+@functools.lru_cache(maxsize=32)
+def _load(path, mtime, size):
+    """Parse a key file into (keys by kid, default key)."""
+    keys = {}
+    default = None
+    with open(path, "rb") as f:
+        data = f.read()
+    if data.lstrip().startswith(b"{"):
+        document = json.loads(data)
+        for jwk in document.get("keys", [document]):
+            keys[jwk.get("kid")] = _jwk(jwk)
+        if len(keys) == 1:
+            default = next(iter(keys.values()))
+    else:
+        default = _pem(data)
+    return keys, default
+
+
+def load_keys(path="", secret=""):
+    """Return a new KeySet for a key file and/or HMAC secret.
+
+    The file may be a PEM public key or certificate, a JWKS document or a
+    single JWK; it is parsed again only when its size or mtime changes.
+    The secret is never cached.
+    """
+    keys = {}
+    default = None
+    if path:
+        path = os.path.expanduser(path)
+        st = os.stat(path)
+        if not stat.S_ISREG(st.st_mode):
+            raise ValueError(f"Not a regular file: {path}")
+        keys, default = _load(path, st.st_mtime_ns, st.st_size)
+    if secret:
+        default = ("hmac", secret.encode("utf-8"))
+    return KeySet(dict(keys), default)
+
+
+def _numeric_date(value):
+    """Return a claim's NumericDate, or None unless it is a finite number of seconds in years 1-9999."""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    if not (math.isfinite(value) and MIN_TIME <= value <= MAX_TIME):
+        return None
+    return value
+
+
+def _timing(payload, now):
+    dates = {}
+    for name in ("exp", "nbf", "iat"):
+        if name in payload:
+            dates[name] = _numeric_date(payload[name])
+            if dates[name] is None:
+                return f"invalid {name}"
+    exp = dates.get("exp")
+    nbf = dates.get("nbf")
+    if nbf is not None and nbf > now + LEEWAY:
+        return "not yet valid"
+    if exp is None:
+        return "no expiry"
+    return "expired" if exp < now - LEEWAY else "active"
+
+
+def verify_all(tokens, keys, now=None):
+    """Decode and verify tokens; returns a list of per-token dicts."""
+    now = time.time() if now is None else now
+    results = []
+    decoded_tokens = {}  # logs repeat tokens; decode each once
+    for token in tokens:
+        decoded = decoded_tokens.get(token)
+        if decoded is None:
+            decoded = decoded_tokens[token] = decode(token)
+        if isinstance(decoded, str):
+            results.append({"token": token, "status": decoded, "timing": "", "header": {}, "payload": {}})
+            continue
+        header, payload, signing_input, signature = decoded
+        results.append({
+            "token": token,
+            "status": keys.verify(token, header, signing_input, signature),
+            "timing": _timing(payload, now),
+            "header": header,
+            "payload": payload,
+        })
+    return results
+
+
+def _top(counter, limit=5):
+    return ", ".join(f"{value} ({count:,})" for value, count in counter.most_common(limit))
+
+
+def summarize(results):
+    """Summarise verdicts, expiry and the distribution of common claims."""
+    statuses = collections.Counter(r["status"] for r in results)
+    timings = collections.Counter(r["timing"] for r in results if r["timing"])
+    claims = collections.Counter()
+    values = collections.defaultdict(collections.Counter)
+    expiries = []
+    for r in results:
+        claims.update(r["payload"].keys())
+        for name in ("alg", "kid"):
+            if name in r["header"]:
+                values[name][str(r["header"][name])] += 1
+        for name in ("iss", "aud", "sub"):
+            if name in r["payload"]:
+                values[name][json.dumps(r["payload"][name]) if not isinstance(r["payload"][name], str)
+                             else r["payload"][name]] += 1
+        exp = _numeric_date(r["payload"].get("exp"))
+        if exp is not None:
+            expiries.append(exp)
+
+    unique = len({r["token"] for r in results})
+    lines = [f"Tokens: {len(results):,} ({unique:,} unique)", "", "Signatures:"]
+    lines.extend(f"  {status}: {count:,}" for status, count in statuses.most_common())
+    if timings:
+        lines.append("")
+        lines.append("Expiry: " + ", ".join(f"{name} {count:,}" for name, count in timings.most_common()))
+    if expiries:
+        lines.append("  earliest exp: " + _utc(min(expiries)))
+        lines.append("  latest exp:   " + _utc(max(expiries)))
+    if values:
+        lines.append("")
+        lines.append("Top values:")
+        for name in ("alg", "kid", "iss", "aud", "sub"):
+            if name in values:
+                lines.append(f"  {name}: {_top(values[name])}")
+    if claims:
+        lines.append("")
+        lines.append("Claims present: " + _top(claims, limit=20))
+    return "\n".join(lines)
+
+
+def _utc(timestamp):
+    # Unlike time.gmtime, this covers every year from 1 to 9999 on every platform
+    moment = _EPOCH + datetime.timedelta(seconds=timestamp)
+    return f"{moment.year:04d}-{moment:%m-%d %H:%M:%S} UTC"
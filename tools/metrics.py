@@ -0,0 +1,266 @@
+"""Per-tool handler and job metrics, in Prometheus text format.
+
+Off unless CACAO_TOOLS_METRICS is set, and then c.on is left alone and
+the executor skips its single check, so a disabled build pays nothing.
+When on, every event handler registered while a tool's panel is built is
+wrapped to count calls and errors, time them and size their input. Every
+background job records its wall time, worker CPU time and output size
+under the tool whose event started it. Sizes count characters for text.
+"""
+
+import bisect
+import contextlib
+import contextvars
+import functools
+import os
+import threading
+import time
+
+ENABLED = os.environ.get("CACAO_TOOLS_METRICS", "").lower() not in ("", "0", "false", "no", "off")
+HOST = "127.0.0.1"
+PORT = int(os.environ.get("CACAO_TOOLS_METRICS_PORT", "9464"))  # 0 serves no endpoint
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)  # seconds
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+endpoint = None  # URL of the running /metrics endpoint
+_lock = threading.Lock()  # the endpoint reads from its own thread
+_series = {}  # (kind, tool, name) -> Series
+_registering = None  # tool key whose panel is being built
+_tool = contextvars.ContextVar("tool", default="app")  # tool of the event being handled; jobs inherit it
+
+
+class Series:
+    """Counters and a latency histogram for one handler or job."""
+
+    __slots__ = ("calls", "errors", "seconds", "cpu", "input_bytes", "output_bytes", "buckets")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.seconds = 0.0
+        self.cpu = 0.0
+        self.input_bytes = 0
+        self.output_bytes = 0
+        self.buckets = [0] * (len(BUCKETS) + 1)  # per bucket, not cumulative; last is +Inf
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-quantile, or None."""
+        if not self.calls:
+            return None
+        rank = q * self.calls
+        seen = 0
+        for bound, count in zip(BUCKETS, self.buckets):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+
+def record(kind, tool, name, seconds, error=False, input_bytes=0, output_bytes=0, cpu=0.0):
+    """Add one call to a series."""
+    with _lock:
+        series = _series.get((kind, tool, name))
+        if series is None:
+            series = _series[(kind, tool, name)] = Series()
+        series.calls += 1
+        series.errors += error
+        series.seconds += seconds
+        series.cpu += cpu
+        series.input_bytes += input_bytes
+        series.output_bytes += output_bytes
+        series.buckets[bisect.bisect_left(BUCKETS, seconds)] += 1
+
+
+def size(value):
+    """Approximate payload size: str and bytes lengths, one level into containers."""
+    if isinstance(value, (str, bytes, bytearray)):
+        return len(value)
+    if isinstance(value, dict):
+        value = value.values()
+    elif not isinstance(value, (list, tuple)):
+        return 0
+    return sum(len(v) for v in value if isinstance(v, (str, bytes, bytearray)))
+
+
+# Instrumentation
+
+def instrument(cacao):
+    """Wrap every handler registered through cacao.on from now on."""
+    register = cacao.on
+
+    def on(event_name):
+        decorator = register(event_name)
+        tool = _registering or "app"
+
+        def wrap(func):
+            @functools.wraps(func)
+            async def handler(session, event):
+                token = _tool.set(tool)
+                start = time.perf_counter()
+                error = True
+                try:
+                    await func(session, event)
+                    error = False
+                finally:
+                    record("event", tool, event_name, time.perf_counter() - start, error, size(event))
+                    _tool.reset(token)
+            return decorator(handler)
+        return wrap
+
+    cacao.on = on
+
+
+@contextlib.contextmanager
+def registering(tool):
+    """Label handlers registered inside the block with a tool key."""
+    global _registering
+    _registering = tool
+    try:
+        yield
+    finally:
+        _registering = None
+
+
+def timed(func, *args):
+    """Run func(*args) in a worker; return its result and the CPU time it took."""
+    start = time.thread_time()
+    result = func(*args)
+    return result, time.thread_time() - start
+
+
+def current_tool():
+    """Tool key of the event that led here, or "app"."""
+    return _tool.get()
+
+
+# Reporting
+
+def snapshot():
+    """Return [(kind, tool, name, Series)] sorted by tool."""
+    with _lock:
+        items = [(kind, tool, name, _copy(series)) for (kind, tool, name), series in _series.items()]
+    return sorted(items, key=lambda item: (item[1], item[0], item[2]))
+
+
+def _copy(series):
+    copy = Series()
+    for slot in Series.__slots__:
+        value = getattr(series, slot)
+        setattr(copy, slot, list(value) if slot == "buckets" else value)
+    return copy
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value):
+    return "+Inf" if value == float("inf") else repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render():
+    """Return every metric in the Prometheus text exposition format."""
+    from . import coalesce, executor, pager, result_cache, session_state  # executor imports this module
+
+    families = {}  # name -> (type, help, [(labels, value)])
+
+    def add(name, kind, help, labels, value):
+        family = families.setdefault(name, (kind, help, []))
+        family[2].append((labels, value))
+
+    for kind, tool, name, series in snapshot():
+        prefix = f"cacao_tools_{kind}"
+        # "job" is the label Prometheus gives every scrape target, so jobs are named by task
+        labels = f'tool="{_label(tool)}",{"task" if kind == "job" else kind}="{_label(name)}"'
+        what = "event handler calls" if kind == "event" else "background jobs"
+        add(f"{prefix}s_total", "counter", what.capitalize(), labels, series.calls)
+        add(f"{prefix}_errors_total", "counter", f"Failed {what}", labels, series.errors)
+        if kind == "event":
+            add(f"{prefix}_input_bytes_total", "counter", "Size of event payloads", labels, series.input_bytes)
+        else:
+            add(f"{prefix}_output_bytes_total", "counter", "Size of job results", labels, series.output_bytes)
+            add(f"{prefix}_cpu_seconds_total", "counter", "Worker CPU time of jobs", labels, series.cpu)
+        cumulative = 0
+        for bound, count in zip(BUCKETS + (float("inf"),), series.buckets):
+            cumulative += count
+            add(f"{prefix}_seconds_bucket", "histogram", f"Latency of {what}",
+                f'{labels},le="{_number(bound)}"', cumulative)
+        add(f"{prefix}_seconds_sum", "histogram", None, labels, series.seconds)
+        add(f"{prefix}_seconds_count", "histogram", None, labels, series.calls)
+
+    for outcome, count in executor.stats.items():
+        add("cacao_tools_executor_jobs_total", "counter", "Background jobs by outcome",
+            f'outcome="{outcome}"', count)
+    for name, counts in coalesce.stats().items():
+        for counter, count in counts.items():
+            add(f"cacao_tools_debounce_{counter}_total", "counter", f"Debouncer {counter}",
+                f'debouncer="{_label(name)}"', count)
+    for name, counts in pager.stats().items():
+        add("cacao_tools_output_sent_chars_total", "counter", "Characters of results published",
+            f'pager="{_label(name)}"', counts["sent"])
+        add("cacao_tools_output_withheld_chars_total", "counter", "Characters of results kept off the wire",
+            f'pager="{_label(name)}"', counts["withheld"])
+    memory = session_state.stats()
+    add("cacao_tools_sessions", "gauge", "Sessions seen within the last day, as of the last sweep", "",
+        memory["sessions"])
+    for kind in ("signal", "state"):
+        add("cacao_tools_session_bytes", "gauge", "Approximate memory held for sessions, by kind",
+            f'kind="{kind}"', memory[f"{kind}_bytes"])
+    for name, n in session_state.by_name.items():
+        add("cacao_tools_session_value_bytes", "gauge", "Approximate memory held for sessions, by signal or state",
+            f'name="{_label(name)}"', n)
+    add("cacao_tools_session_evictions_total", "counter", "Sessions whose large values were evicted", "",
+        memory["evictions"])
+    add("cacao_tools_session_evicted_bytes_total", "counter", "Approximate memory freed by eviction", "",
+        memory["evicted_bytes"])
+    add("cacao_tools_session_max_bytes", "gauge", "Ceiling on memory held for sessions", "", memory["max_bytes"])
+    cache = result_cache.results.stats()
+    for counter in ("hits", "misses", "evictions"):
+        add(f"cacao_tools_cache_{counter}_total", "counter", f"Result cache {counter}", "", cache[counter])
+    add("cacao_tools_cache_entries", "gauge", "Results held in the cache", "", cache["entries"])
+    add("cacao_tools_cache_bytes", "gauge", "Approximate size of cached results", "", cache["bytes"])
+
+    lines = []
+    for name, (kind, help, samples) in families.items():
+        if help is not None:
+            family = name[:-len("_bucket")] if kind == "histogram" else name
+            lines.append(f"# HELP {family} {help}")
+            lines.append(f"# TYPE {family} {kind}")
+        lines.extend(f"{name}{{{labels}}} {_number(value)}" if labels else f"{name} {_number(value)}"
+                     for labels, value in samples)
+    return "\n".join(lines) + "\n"
+
+
+# Endpoint
+
+def serve_in_background(host=HOST, port=PORT):
+    """Serve /metrics from a daemon thread; returns the server, or None if the port is taken."""
+    global endpoint
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer  # only when metrics are on
+
+    class Handler(BaseHTTPRequestHandler):
+        server_version = "CacaoTools"
+
+        def do_GET(self):
+            if self.path.split("?")[0].rstrip("/") != "/metrics":
+                self.send_error(404)
+                return
+            data = render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass  # scraped every few seconds
+
+    try:
+        server = ThreadingHTTPServer((host, port), Handler)
+    except OSError as e:
+        print(f"Metrics endpoint not started on {host}:{port}: {str(e)}")
+        return None
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="cacao-tools-metrics", daemon=True).start()
+    endpoint = f"http://{host}:{server.server_address[1]}/metrics"
+    return server
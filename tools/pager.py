@@ -0,0 +1,107 @@
+"""Windowed publishing of large text results.
+
+The browser only ever receives one page of a long result: the full text
+stays here, per session, and Previous/Next events move the window. When
+a new result arrives its edit against the previous one is located with
+delta.edit_between; if the visible page is untouched nothing is sent,
+and if the change lies on another page the status line says where.
+"""
+
+import sys
+
+from . import delta
+from .session_state import State, derived
+
+WINDOW = 64 << 10  # characters sent to the browser at once
+
+_pagers = []
+
+
+class Pager:
+    """Publish a session's latest text result one window at a time.
+
+    Results that fit in one window are published whole, as before. The
+    status signal describes the visible range of longer ones.
+    """
+
+    def __init__(self, name, output, status, window=WINDOW):
+        self.name = name
+        self.output = output
+        self.status = status
+        self.window = window
+        self.results = 0
+        self.sent = 0  # characters published
+        self.withheld = 0  # characters of results not published
+        self._texts = State(f"{name}_pages", size=lambda entry: sys.getsizeof(entry[0]))  # [text, page]
+        derived(output, status)  # eviction may clear them; the next result refills them
+        _pagers.append(self)
+
+    def pages(self, text):
+        return max(1, -(-len(text) // self.window))
+
+    def publish(self, session, text):
+        """Show a new result, keeping the current page when there is one."""
+        self.results += 1
+        previous = self._texts.pop(session)
+        if len(text) <= self.window:
+            self._send(session, text, len(text))
+            self.status.set(session, "")
+            return
+
+        page = min(previous[1], self.pages(text) - 1) if previous else 0
+        self._texts.set(session, [text, page])
+        lo, hi = page * self.window, (page + 1) * self.window
+        changed = None
+        if previous is not None:
+            if previous[0] == text:
+                return  # the same result again
+            start, end, replacement = delta.edit_between(previous[0], text)
+            changed = min(start, len(text) - 1)  # a cut at the very end is reported on the last page
+            if page == previous[1] and (start >= hi or (end <= lo and len(replacement) == end - start)):
+                # Same page, untouched: only the status needs updating (a clamped page must be resent)
+                self.withheld += len(text)
+                self.status.set(session, self._describe(text, page, changed))
+                return
+        self._send(session, text[lo:hi], len(text))
+        self.status.set(session, self._describe(text, page, changed))
+
+    def clear(self, session, message=""):
+        """Forget the session's result and show message instead."""
+        self._texts.pop(session)
+        self.output.set(session, message)
+        self.status.set(session, "")
+
+    def page(self, session, step):
+        """Move the session's window by step pages; returns False if there is no long result."""
+        entry = self._texts.get(session)
+        if entry is None:
+            return False
+        text, page = entry
+        page = max(0, min(page + step, self.pages(text) - 1))
+        if page != entry[1]:
+            entry[1] = page
+            self._send(session, text[page * self.window:(page + 1) * self.window], len(text))
+            self.status.set(session, self._describe(text, page, None))
+        return True
+
+    def _send(self, session, window, total):
+        self.sent += len(window)
+        self.withheld += total - len(window)
+        self.output.set(session, window)
+
+    def _describe(self, text, page, changed):
+        lo = page * self.window
+        hi = min(len(text), lo + self.window)
+        line = f"Characters {lo + 1:,}-{hi:,} of {len(text):,} (page {page + 1:,} of {self.pages(text):,})"
+        if changed is not None and not lo <= changed < hi:
+            line += f"; changed from character {changed + 1:,} (page {changed // self.window + 1:,})"
+        return line
+
+    def stats(self):
+        """Return result count and characters published and withheld."""
+        return {"results": self.results, "sent": self.sent, "withheld": self.withheld}
+
+
+def stats():
+    """Return counters for every pager, keyed by name."""
+    return {p.name: p.stats() for p in _pagers}
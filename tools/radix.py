@@ -0,0 +1,212 @@
+"""Integer conversion between bases 2-36, 58 and 62 at any size.
+
+CPython converts between int and str in quadratic time, and refuses
+non-power-of-two strings longer than sys.get_int_max_str_digits(). Here
+long strings are split in half recursively and recombined by big-int
+multiplication, and long numbers are split on cached powers of the base,
+so the builtins only ever see short pieces. Those splits divide by
+recursive (Burnikel-Ziegler) division, and decimal output goes through the
+decimal module, so every step costs about one big multiplication.
+"""
+
+import decimal
+import functools
+
+DIGITS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+BASE58 = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"  # Bitcoin alphabet
+BASE62 = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+BASES = tuple(range(2, 37)) + (58, 62)
+BASE_NAMES = {2: "Binary", 8: "Octal", 10: "Decimal", 16: "Hexadecimal"}
+PREFIXES = {"0b": 2, "0o": 8, "0x": 16}
+CHUNK = 1024  # digits handed to the builtins at once; well under the int/str limit
+DECIMAL_BITS = 12000  # numbers up to this size are formatted with str() (about 3,600 digits)
+DIVISION_BITS = 4000  # quotients up to this size use the builtin divmod
+_BUILTIN_FORMATS = {2: "b", 8: "o", 16: "X"}
+
+
+def alphabet(base):
+    """Return the digits of base, lowest first."""
+    if base == 58:
+        return BASE58
+    if base == 62:
+        return BASE62
+    if base not in BASES:
+        raise ValueError(f"Unsupported base: {base} (use 2-36, 58 or 62)")
+    return DIGITS[:base]
+
+
+@functools.lru_cache(maxsize=None)
+def _valid(base):
+    """Translate table deleting every digit of base; what survives is invalid."""
+    digits = alphabet(base)
+    if base <= 36:
+        digits += digits.lower()
+    return dict.fromkeys(map(ord, digits))
+
+
+@functools.lru_cache(maxsize=None)
+def _values(base):
+    """Translate table mapping each base-58/62 digit to the character of its value."""
+    return {ord(ch): chr(value) for value, ch in enumerate(alphabet(base))}
+
+
+@functools.lru_cache(maxsize=128)
+def _power(base, level):
+    """base ** (CHUNK << level), by repeated squaring."""
+    if level == 0:
+        return base ** CHUNK
+    return _power(base, level - 1) ** 2
+
+
+def parse(text, base=10):
+    """Parse a number written in base; raises ValueError on anything else.
+
+    Surrounding whitespace, a sign, "_" separators and a 0b/0o/0x prefix
+    matching the base are accepted.
+    """
+    alphabet(base)  # rejects unsupported bases
+    text = text.strip().replace("_", "")
+    negative = text[:1] == "-"
+    if text[:1] in "+-":
+        text = text[1:]
+    if PREFIXES.get(text[:2].lower()) == base:
+        text = text[2:]
+    if not text:
+        raise ValueError("No digits")
+    invalid = text.translate(_valid(base))
+    if invalid:
+        raise ValueError(f"Invalid digit {invalid[0]!r} for base {base}")
+
+    if base in _BUILTIN_FORMATS or base in (4, 32):
+        n = int(text, base)  # linear and unlimited for power-of-two bases
+    elif base <= 36:
+        n = _parse_split(text, functools.partial(int, base=base), base)
+    else:
+        values = text.translate(_values(base)).encode("latin-1")
+        n = _parse_split(values, functools.partial(_horner, base=base), base)
+    return -n if negative else n
+
+
+def _horner(values, base):
+    n = 0
+    for value in values:
+        n = n * base + value
+    return n
+
+
+def _parse_split(digits, leaf, base):
+    def inner(lo, hi):
+        length = hi - lo
+        if length <= CHUNK:
+            return leaf(digits[lo:hi])
+        # Split off the largest CHUNK * 2**level low digits that leave a non-empty high part
+        level = ((length - 1) // CHUNK).bit_length() - 1
+        split = hi - (CHUNK << level)
+        return inner(lo, split) * _power(base, level) + inner(split, hi)
+
+    return inner(0, len(digits))
+
+
+def to_string(n, base=10):
+    """Format an int in base, with a leading "-" if negative."""
+    if n < 0:
+        return "-" + to_string(-n, base)
+    digits = alphabet(base)
+    if base in _BUILTIN_FORMATS:
+        return format(n, _BUILTIN_FORMATS[base])
+    if base == 10:
+        return str(n) if n.bit_length() <= DECIMAL_BITS else _decimal_string(n)
+    if n == 0:
+        return digits[0]
+
+    pieces = []
+
+    def leaf(n, pad):
+        out = []
+        while n:
+            n, d = divmod(n, base)
+            out.append(digits[d])
+        piece = "".join(reversed(out))
+        pieces.append(piece.rjust(CHUNK, digits[0]) if pad else piece)
+
+    def inner(n, level, pad):
+        # n has at most CHUNK << (level + 1) digits; exactly that many when padded
+        if level < 0:
+            leaf(n, pad)
+            return
+        power = _power(base, level)
+        high, low = _div2n1n(n, power, power.bit_length())
+        if high or pad:
+            inner(high, level - 1, pad)
+            inner(low, level - 1, True)
+        else:
+            inner(low, level - 1, False)
+
+    level = -1
+    while n >= _power(base, level + 1):
+        level += 1
+    inner(n, level, False)
+    return "".join(pieces)
+
+
+def _div2n1n(a, b, n):
+    """divmod(a, b) for b < 2**n and a < 2**n * b, by recursive halving."""
+    if a.bit_length() - n <= DIVISION_BITS:
+        return divmod(a, b)
+    pad = n & 1
+    if pad:
+        a <<= 1
+        b <<= 1
+        n += 1
+    half = n >> 1
+    mask = (1 << half) - 1
+    b1, b2 = b >> half, b & mask
+    q1, r = _div3n2n(a >> n, (a >> half) & mask, b, b1, b2, half)
+    q2, r = _div3n2n(r, a & mask, b, b1, b2, half)
+    if pad:
+        r >>= 1
+    return q1 << half | q2, r
+
+
+def _div3n2n(a12, a3, b, b1, b2, n):
+    if a12 >> n == b1:
+        q, r = (1 << n) - 1, a12 - (b1 << n) + b1
+    else:
+        q, r = _div2n1n(a12, b1, n)
+    r = (r << n | a3) - q * b2
+    while r < 0:
+        q -= 1
+        r += b
+    return q, r
+
+
+def _decimal_string(n):
+    """str(n) for large n, built as a Decimal from binary halves."""
+    with decimal.localcontext() as ctx:
+        ctx.prec = decimal.MAX_PREC
+        ctx.Emax = decimal.MAX_EMAX
+        ctx.traps[decimal.Inexact] = True  # every step must be exact
+        two = decimal.Decimal(2)
+        powers = {}
+
+        def power(bits):
+            result = powers.get(bits)
+            if result is None:
+                half = bits >> 1
+                result = two ** bits if bits <= DECIMAL_BITS else power(half) * power(bits - half)
+                powers[bits] = result
+            return result
+
+        def inner(n, bits):
+            if bits <= DECIMAL_BITS:
+                return decimal.Decimal(n)
+            half = bits >> 1
+            high = n >> half
+            return inner(high, bits - half) * power(half) + inner(n - (high << half), half)
+
+        return str(inner(n, n.bit_length()))
+
+
+def convert(text, from_base, to_base):
+    """Rewrite a number from one base in another."""
+    return to_string(parse(text, from_base), to_base)
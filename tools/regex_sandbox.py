@@ -0,0 +1,198 @@
+"""Sandboxed regex matching in killable worker processes."""
+
+import bisect
+import functools
+import itertools
+import multiprocessing
+import re
+import threading
+import time
+
+from . import delta
+
+MATCH_TIMEOUT = 2.0  # seconds of wall-clock time per search
+MAX_MATCHES = 10_000
+MAX_WORKERS = 4
+BATCH_SIZE = 500  # matches per message sent back by a worker
+PATTERN_CACHE_SIZE = 256  # compiled patterns kept per worker
+
+# Pattern syntax that can consume or test a newline, or depend on text after
+# the end of the current line: lookahead, end anchors, DOTALL, negated sets,
+# whitespace/non-word classes, numeric escapes and low control characters
+_CROSS_LINE = re.compile(r"\\[sSWDZnxuUNta0-9]|\[\^|\[[^\]]*\\b|\(\?[=!]|\(\?[a-zA-Z-]*s|[\x00-\x0a]")
+
+_idle = []
+_idle_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(MAX_WORKERS)
+
+
+class MatchSet:
+    """Match spans found in a text, rendered lazily one page at a time."""
+
+    def __init__(self, pattern, flags, text, spans, truncated=False, timed_out=False, reused=0):
+        self.pattern = pattern
+        self.flags = flags
+        self.text = text
+        self.spans = spans  # one tuple of (start, end) per group, group 0 first
+        self.truncated = truncated
+        self.timed_out = timed_out
+        self.reused = reused  # matches carried over from the previous search
+
+    def __len__(self):
+        return len(self.spans)
+
+    def page(self, number, size):
+        """Format matches [number * size, (number + 1) * size)."""
+        total = len(self.spans)
+        if total == 0:
+            if self.timed_out:
+                return "Search timed out without a match"
+            return "No matches found"
+
+        pages = (total + size - 1) // size
+        number = max(0, min(number, pages - 1))
+        first = number * size
+        last = min(first + size, total)
+
+        found = f"{total:,}"
+        if self.timed_out:
+            found += "+ (search timed out)"
+        elif self.truncated:
+            found += "+ (stopped at match limit)"
+        output_lines = [f"Found {found} match(es), showing {first + 1}-{last} (page {number + 1} of {pages}):", ""]
+        for i in range(first, last):
+            regs = self.spans[i]
+            start, end = regs[0]
+            output_lines.append(f"Match {i + 1}: \"{self.text[start:end]}\"")
+            output_lines.append(f"  Position: {start}-{end}")
+            for j, (gs, ge) in enumerate(regs[1:]):
+                group = self.text[gs:ge] if gs >= 0 else None
+                output_lines.append(f"  Group {j + 1}: \"{group}\"")
+            output_lines.append("")
+        return "\n".join(output_lines)
+
+
+@functools.lru_cache(maxsize=PATTERN_CACHE_SIZE)
+def _compile(pattern, flags):
+    return re.compile(pattern, flags)
+
+
+def _serve(conn):
+    """Worker loop: run searches and stream match spans back in batches."""
+    while True:
+        try:
+            pattern, flags, text, pos, max_matches = conn.recv()
+        except EOFError:
+            return
+        try:
+            regex = _compile(pattern, flags)
+        except re.error as e:
+            conn.send(("error", str(e)))
+            continue
+
+        matches = regex.finditer(text, pos)
+        sent = 0
+        while sent < max_matches:
+            batch = [m.regs for m in itertools.islice(matches, min(BATCH_SIZE, max_matches - sent))]
+            if not batch:
+                break
+            sent += len(batch)
+            conn.send(("matches", batch))
+        truncated = sent >= max_matches and next(matches, None) is not None
+        conn.send(("done", truncated))
+
+
+class _Worker:
+    def __init__(self):
+        self.conn, child = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(target=_serve, args=(child,), daemon=True)
+        self.process.start()
+        child.close()
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+def _acquire():
+    with _idle_lock:
+        while _idle:
+            worker = _idle.pop()
+            if worker.process.is_alive():
+                return worker
+    return _Worker()
+
+
+def _release(worker):
+    with _idle_lock:
+        _idle.append(worker)
+
+
+def _line_local(pattern, flags):
+    """Whether matching pattern never looks past the end of the current line."""
+    if flags & re.DOTALL:
+        return False
+    if "$" in pattern and not flags & re.MULTILINE:
+        return False
+    return _CROSS_LINE.search(pattern) is None
+
+
+def _reusable(previous, pattern, flags, text):
+    """Return (spans to keep, position to resume from) for an edited text.
+
+    Only line-local patterns qualify: a match whose line ends before the
+    first edited character cannot change, nor can the failed attempts that
+    led to it. The last such match is rescanned rather than trusted so that
+    empty-match rules at the resume point behave exactly as in a full scan.
+    """
+    if previous is None or previous.pattern != pattern or previous.flags != flags:
+        return [], 0
+    if not _line_local(pattern, flags):
+        return [], 0
+
+    edit = delta.common_prefix(previous.text, text)
+    safe = text.rfind("\n", 0, edit)
+    spans = previous.spans
+    kept = bisect.bisect_right(spans, safe, key=lambda regs: regs[0][0]) - 1
+    if kept < 0:
+        return [], 0
+    resume = spans[kept][0][0]
+    while kept > 0 and spans[kept - 1][0] == (resume, resume):
+        kept -= 1
+    return spans[:kept], resume
+
+
+def find_matches(pattern, text, flags=0, timeout=MATCH_TIMEOUT, max_matches=MAX_MATCHES, previous=None):
+    """Search text in a worker process and return a MatchSet.
+
+    The worker is killed if the search runs past timeout (e.g. catastrophic
+    backtracking); the matches streamed back so far are kept. Pass the
+    previous MatchSet for the same pattern to rescan only from the first
+    match an edit can affect. Raises re.error for an invalid pattern.
+    """
+    spans, pos = _reusable(previous, pattern, flags, text)
+    reused = len(spans)
+    spans = list(spans)
+    with _slots:
+        worker = _acquire()
+        worker.conn.send((pattern, flags, text, pos, max_matches - reused))
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not worker.conn.poll(remaining):
+                worker.kill()
+                return MatchSet(pattern, flags, text, spans, timed_out=True, reused=reused)
+            try:
+                kind, payload = worker.conn.recv()
+            except EOFError:
+                worker.kill()
+                raise RuntimeError("Regex worker exited unexpectedly")
+            if kind == "matches":
+                spans.extend(payload)
+            elif kind == "error":
+                _release(worker)
+                raise re.error(payload)
+            else:
+                _release(worker)
+                return MatchSet(pattern, flags, text, spans, truncated=payload, reused=reused)
@@ -0,0 +1,99 @@
+"""Results of deterministic transforms, shared by every session.
+
+Jobs submitted with cache=True are keyed by their job key, function and
+arguments, with long text and bytes arguments replaced by a BLAKE2b
+digest, so large inputs are not held a second time. Results are kept in
+least-recently-used order up to a byte budget. Job keys in SENSITIVE
+are never cached, whatever the caller asks, so secrets and whatever is
+derived from them are not retained across sessions.
+"""
+
+import collections
+import hashlib
+import sys
+
+MAX_BYTES = 64 << 20  # total size of cached results
+MAX_ENTRY = MAX_BYTES // 8  # larger results would push out too much to be worth keeping
+DIGEST_OVER = 256  # str and bytes arguments longer than this are keyed by digest
+SENSITIVE = frozenset({"hmac", "hmac_batch", "jwt", "jwt_bulk"})
+
+
+def key(job, func, args):
+    """Cache key for func(*args) run as job; digests long arguments. Runs in a worker."""
+    parts = [job, func.__module__, func.__qualname__]
+    for arg in args:
+        if isinstance(arg, str) and len(arg) > DIGEST_OVER:
+            arg = arg.encode("utf-8", "surrogatepass")
+        if isinstance(arg, (bytes, bytearray)) and len(arg) > DIGEST_OVER:
+            arg = ("blake2b", len(arg), hashlib.blake2b(arg, digest_size=20).digest())
+        elif isinstance(arg, (list, dict, set)):
+            arg = repr(arg)
+        parts.append(arg)
+    return tuple(parts)
+
+
+def size(value):
+    """Approximate memory held by a result."""
+    if isinstance(value, (tuple, list)):
+        return sys.getsizeof(value) + sum(size(v) for v in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(size(k) + size(v) for k, v in value.items())
+    return sys.getsizeof(value)
+
+
+class ResultCache:
+    """Byte-bounded LRU map of cache keys to results."""
+
+    def __init__(self, max_bytes=MAX_BYTES, max_entry=MAX_ENTRY):
+        self.max_bytes = max_bytes
+        self.max_entry = max_entry
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = collections.OrderedDict()  # key -> (result, size)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Return (True, result) on a hit, (False, None) on a miss."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return False, None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return True, entry[0]
+
+    def put(self, key, result):
+        """Store a result, evicting the least recently used until it fits."""
+        n = size(result)
+        if n > self.max_entry:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.bytes -= old[1]
+        self._entries[key] = (result, n)
+        self.bytes += n
+        while self.bytes > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self.bytes -= evicted
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+        self.bytes = 0
+
+    def stats(self):
+        """Return entry, byte, hit, miss and eviction counts."""
+        return {"entries": len(self._entries), "bytes": self.bytes, "hits": self.hits,
+                "misses": self.misses, "evictions": self.evictions}
+
+
+results = ResultCache()
+
+
+def cacheable(job):
+    """Whether results of job may be cached."""
+    return job not in SENSITIVE
@@ -0,0 +1,217 @@
+"""Memory held per session, with idle eviction and a global ceiling.
+
+Two kinds of per-session memory are tracked: the value of every Cacao
+signal, and the server-side objects tools keep in State maps (decoded
+bytes, pagers' full results, incremental engines). A periodic sweep
+measures both. Large values of sessions idle for longer than TTL are
+dropped, so the next edit recomputes them: signals marked derived are
+replaced in the page by a note saying so (or their default, if not
+text), and State entries are removed. When the total passes MAX_BYTES, the least recently active
+sessions lose their large values first until it fits again.
+
+Only results are ever dropped. Signals and State holding what the user
+entered stay, because the browser still shows that text and the tool
+computes the next result from it.
+"""
+
+import asyncio
+import functools
+import os
+import sys
+import time
+
+import cacao
+
+from .result_cache import size as approximate_size
+
+TTL = float(os.environ.get("CACAO_TOOLS_STATE_TTL", "1800"))  # seconds idle before large values go
+MAX_BYTES = int(float(os.environ.get("CACAO_TOOLS_STATE_MAX_MB", "1024")) * (1 << 20))
+LARGE = 4096  # bytes; smaller values (modes, keys, settings) are never evicted
+EVICTED = "Result cleared to save memory while idle; change the input or run the tool again."
+FORGET = 24 * 3600  # seconds idle before a session's small State entries go too
+SWEEP = 30.0  # seconds between sweeps
+
+_last_seen = {}  # session id -> time.monotonic() of its latest event
+_states = []
+_derived = set()  # names of signals holding results, the only signals eviction resets
+_sweeper = None
+totals = {"sessions": 0, "signal_bytes": 0, "state_bytes": 0, "evictions": 0, "evicted_bytes": 0, "sweeps": 0}
+by_name = {}  # signal or State name -> bytes held, as of the last sweep
+by_session = {}  # session id -> bytes held, as of the last sweep
+
+
+class _SessionRef:
+    """Stands in for a Session where only its id is used."""
+
+    __slots__ = ("id",)
+
+    def __init__(self, session_id):
+        self.id = session_id
+
+
+class State:
+    """A tool's server-side value per session, counted and evicted with it."""
+
+    def __init__(self, name, size=approximate_size, evict=True):
+        self.name = name
+        self.size = size
+        self.evict = evict  # False for input a tool recomputes from; it goes only with the session
+        self.bytes = 0
+        self._values = {}  # session id -> (value, size)
+        _states.append(self)
+
+    def get(self, session, default=None):
+        entry = self._values.get(session.id)
+        return default if entry is None else entry[0]
+
+    def set(self, session, value):
+        n = self.size(value)
+        old = self._values.get(session.id)
+        if old is not None:
+            self.bytes -= old[1]
+        self._values[session.id] = (value, n)
+        self.bytes += n
+        return value
+
+    def pop(self, session, default=None):
+        return self._drop(session.id, default)
+
+    def _drop(self, session_id, default=None):
+        entry = self._values.pop(session_id, None)
+        if entry is None:
+            return default
+        self.bytes -= entry[1]
+        return entry[0]
+
+    def held(self, session_id):
+        entry = self._values.get(session_id)
+        return 0 if entry is None else entry[1]
+
+
+def derived(*signals):
+    """Mark signals as results a tool recomputes, which eviction may reset.
+
+    Every other signal holds input and is never reset.
+    """
+    _derived.update(signal.name for signal in signals)
+
+
+def touch(session):
+    """Mark a session active now, and start sweeping on first use."""
+    global _sweeper
+    _last_seen[session.id] = time.monotonic()
+    if _sweeper is None or _sweeper.done():
+        _sweeper = asyncio.ensure_future(_sweep_forever())
+
+
+def track(app):
+    """Touch the session of every handler registered through app.on from now on."""
+    register = app.on
+
+    def on(event_name):
+        decorator = register(event_name)
+
+        def wrap(func):
+            @functools.wraps(func)
+            async def handler(session, event):
+                touch(session)
+                await func(session, event)
+            return decorator(handler)
+        return wrap
+
+    app.on = on
+
+
+def _signal_size(value):
+    return sys.getsizeof(value) if isinstance(value, (str, bytes)) else approximate_size(value)
+
+
+def _measure():
+    """Return {session id: {signal: bytes}} for every tracked session."""
+    signals = cacao.Signal.get_all_signals()
+    usage = {}
+    for session_id in _last_seen:
+        ref = _SessionRef(session_id)
+        held = usage[session_id] = {}
+        for name, signal in signals.items():
+            value = signal.get(ref)
+            if value is not signal.default:
+                held[name] = _signal_size(value)
+    return usage
+
+
+def _evict(session_id, signal_usage, everything=False):
+    """Drop a session's large results (all State values if everything); returns bytes freed.
+
+    Evicted signals are removed from signal_usage.
+    """
+    freed = 0
+    ref = _SessionRef(session_id)
+    signals = cacao.Signal.get_all_signals()
+    for name, n in list(signal_usage.items()):
+        if n >= LARGE and name in _derived:
+            default = signals[name].default
+            signals[name].set(ref, EVICTED if isinstance(default, str) else default)
+            del signal_usage[name]
+            freed += n
+    for state in _states:
+        n = state.held(session_id)
+        if (n >= LARGE and state.evict) or (everything and session_id in state._values):
+            state._drop(session_id)
+            freed += n
+    if freed:
+        totals["evictions"] += 1
+        totals["evicted_bytes"] += freed
+    return freed
+
+
+def sweep(now=None, evict=True):
+    """Measure every session, evict idle ones, then enforce MAX_BYTES.
+
+    With evict=False only the totals are refreshed.
+    """
+    now = time.monotonic() if now is None else now
+    usage = _measure()
+    for session_id, signal_usage in list(usage.items()) if evict else ():
+        idle = now - _last_seen[session_id]
+        if idle > TTL:
+            _evict(session_id, signal_usage, everything=idle > FORGET)
+        if idle > FORGET:
+            del _last_seen[session_id]
+            del usage[session_id]
+
+    def bytes_of(session_id):
+        return sum(usage[session_id].values()) + sum(state.held(session_id) for state in _states)
+
+    sessions = {session_id: bytes_of(session_id) for session_id in usage}
+    total = sum(sessions.values())
+    if evict and total > MAX_BYTES:
+        for session_id in sorted(sessions, key=_last_seen.get):
+            total -= _evict(session_id, usage[session_id])
+            sessions[session_id] = bytes_of(session_id)
+            if total <= MAX_BYTES:
+                break
+
+    by_name.clear()
+    for signal_usage in usage.values():
+        for name, n in signal_usage.items():
+            by_name[name] = by_name.get(name, 0) + n
+    for state in _states:
+        by_name[state.name] = by_name.get(state.name, 0) + state.bytes
+    by_session.clear()
+    by_session.update(sessions)
+    totals["sessions"] = len(_last_seen)
+    totals["signal_bytes"] = sum(sum(signal_usage.values()) for signal_usage in usage.values())
+    totals["state_bytes"] = sum(state.bytes for state in _states)
+    totals["sweeps"] += 1
+
+
+async def _sweep_forever():
+    while True:
+        await asyncio.sleep(SWEEP)
+        sweep()
+
+
+def stats():
+    """Return the totals of the last sweep, with the ceiling and TTL."""
+    return dict(totals, bytes=totals["signal_bytes"] + totals["state_bytes"], max_bytes=MAX_BYTES, ttl=TTL)
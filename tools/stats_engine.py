@@ -0,0 +1,126 @@
+"""Incrementally maintained text statistics.
+
+The text is covered by blocks of a few thousand characters, each with a
+summary of its counts and what it starts and ends with. Totals are kept as
+sums of block counts minus corrections where a word or punctuation run
+crosses a block boundary, so an edit only re-scans the blocks it touches.
+"""
+
+import bisect
+import re
+
+from . import delta
+
+BLOCK = 4096
+_PUNCT_RUN = re.compile(r"[.!?]+")
+
+# Summary fields
+_CHARS, _BLANKS, _NEWLINES, _WORDS, _SENTENCES, _FIRST_SPACE, _LAST_SPACE, _FIRST_PUNCT, _LAST_PUNCT = range(9)
+
+
+def _summarize(block):
+    """Count one block with C-level string scans; no per-character Python loop."""
+    return (
+        len(block),
+        block.count(" ") + block.count("\n") + block.count("\t"),
+        block.count("\n"),
+        len(block.split()),
+        len(_PUNCT_RUN.findall(block)),
+        block[0].isspace(),
+        block[-1].isspace(),
+        block[0] in ".!?",
+        block[-1] in ".!?",
+    )
+
+
+def _joins(left, right):
+    """(words, sentences) counted twice because they cross from left into right."""
+    if left is None or right is None:
+        return 0, 0
+    return (
+        int(not left[_LAST_SPACE] and not right[_FIRST_SPACE]),
+        int(left[_LAST_PUNCT] and right[_FIRST_PUNCT]),
+    )
+
+
+class TextStats:
+    """Character, word, line and sentence counts that follow edits to a text."""
+
+    def __init__(self, text=""):
+        self.text = ""
+        self._starts = []  # offset of each block in self.text
+        self._summaries = []
+        self._totals = [0] * 5  # chars, blanks, newlines, words, sentences
+        self.update(text)
+
+    def update(self, text):
+        """Bring the counts up to date with a new version of the text."""
+        start, end, replacement = delta.edit_between(self.text, text)
+        if start == end and not replacement:
+            return
+        self._apply(start, end, len(replacement), text)
+
+    def replace(self, start, end, replacement):
+        """Apply the edit text[start:end] = replacement."""
+        text = self.text[:start] + replacement + self.text[end:]
+        self._apply(start, end, len(replacement), text)
+
+    def _apply(self, start, end, inserted, text):
+        starts = self._starts
+        summaries = self._summaries
+        old_length = len(self.text)
+
+        # Blocks overlapping [start, end], plus the one the edit touches at its edges
+        if summaries:
+            first = max(0, bisect.bisect_right(starts, start) - 1)
+            last = max(first, bisect.bisect_right(starts, max(start, end - 1)) - 1)
+            region_start = starts[first]
+            region_end = starts[last + 1] if last + 1 < len(starts) else old_length
+        else:
+            first, last = 0, -1
+            region_start = region_end = 0
+
+        shift = inserted - (end - start)
+        region = text[region_start:region_end + shift]
+        if len(region) <= 2 * BLOCK:
+            pieces = [region] if region else []
+        else:
+            pieces = [region[i:i + BLOCK] for i in range(0, len(region), BLOCK)]
+        new_summaries = [_summarize(piece) for piece in pieces]
+
+        before = summaries[first - 1] if first > 0 else None
+        after = summaries[last + 1] if last + 1 < len(summaries) else None
+        old_chain = [before] + summaries[first:last + 1] + [after]
+        new_chain = [before] + new_summaries + [after]
+        totals = self._totals
+        for chain, sign in ((old_chain, -1), (new_chain, 1)):
+            for summary in chain[1:-1]:
+                for field in range(5):
+                    totals[field] += sign * summary[field]
+            for left, right in zip(chain, chain[1:]):
+                words, sentences = _joins(left, right)
+                totals[_WORDS] -= sign * words
+                totals[_SENTENCES] -= sign * sentences
+
+        new_starts = []
+        offset = region_start
+        for piece in pieces:
+            new_starts.append(offset)
+            offset += len(piece)
+        starts[first:last + 1] = new_starts
+        summaries[first:last + 1] = new_summaries
+        if shift:
+            for k in range(first + len(new_starts), len(starts)):
+                starts[k] += shift
+        self.text = text
+
+    def counts(self):
+        """Return the current counts as a dict."""
+        chars, blanks, newlines, words, sentences = self._totals
+        return {
+            "chars": chars,
+            "chars_no_spaces": chars - blanks,
+            "words": words,
+            "lines": newlines + 1,
+            "sentences": sentences,
+        }
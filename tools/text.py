@@ -1,8 +1,16 @@
 """Text utility tools."""
 
+import functools
 import re
+import sys
+import time
 import cacao as c
 
+from . import coalesce, diff_engine, executor, regex_sandbox, stats_engine
+from .session_state import State, derived
+
+REGEX_PAGE_SIZE = 50
+
 
 def render_all():
     """Render all text tools."""
@@ -11,35 +19,60 @@ def render_all():
             stats_tool()
         with c.tab("regex", "Regex Tester"):
             regex_tool()
+        with c.tab("diff", "Text Diff"):
+            diff_tool()
+
+
+def _format_stats(counts):
+    """Format word, line and sentence statistics from TextStats counts."""
+    chars = counts["chars"]
+    chars_no_spaces = counts["chars_no_spaces"]
+    words = counts["words"]
+    avg_word = round(chars_no_spaces / words, 2) if words > 0 else 0
+    reading_time = max(1, words // 200)
+
+    return f"""Characters:           {chars:,}
+Characters (no space): {chars_no_spaces:,}
+Words:                {words:,}
+Lines:                {counts["lines"]:,}
+Sentences:            {counts["sentences"]:,}
+Avg word length:      {avg_word}
+Reading time:         ~{reading_time} min"""
+
+
+def _analyze(text):
+    """Format word, line and sentence statistics for text."""
+    return _format_stats(stats_engine.TextStats(text).counts())
 
 
 def stats_tool():
     """Text statistics."""
     results = c.signal("", name="stats_out")
+    derived(results)
+    engines = State("stats_engine", size=lambda engine: sys.getsizeof(engine.text))  # follows each session's text
+    typing = coalesce.Debouncer("stats")
 
     @c.on("analyze_text")
     async def analyze(session, event):
-        text = event.get("value", "")
+        typing.push(session, event.get("value", ""), run, on_error=publish_error)
+
+    def run(session, text):
         if not text:
+            engines.pop(session)
             results.set(session, "")
             return
+        # Only the blocks around the edit are rescanned, so this stays cheap
+        # enough to run inline even for book-length text
+        engine = engines.get(session)
+        if engine is None:
+            engine = stats_engine.TextStats()
+        engine.update(text)
+        engines.set(session, engine)  # the text it holds has changed size
+        results.set(session, _format_stats(engine.counts()))
 
-        chars = len(text)
-        chars_no_spaces = len(text.replace(" ", "").replace("\n", "").replace("\t", ""))
-        words = len(text.split())
-        lines = len(text.split("\n"))
-        sentences = max(0, len(re.split(r"[.!?]+", text)) - 1)
-        avg_word = round(chars_no_spaces / words, 2) if words > 0 else 0
-        reading_time = max(1, words // 200)
-
-        output = f"""Characters:           {chars:,}
-Characters (no space): {chars_no_spaces:,}
-Words:                {words:,}
-Lines:                {lines:,}
-Sentences:            {sentences:,}
-Avg word length:      {avg_word}
-Reading time:         ~{reading_time} min"""
-        results.set(session, output)
+    def publish_error(session, e):
+        engines.pop(session)
+        results.set(session, f"Error: {str(e)}")
 
     with c.card():
         c.text("Analyze text and get detailed statistics.", color="muted")
@@ -53,48 +86,73 @@ Reading time:         ~{reading_time} min"""
         c.code(results)
 
 
+def _match_set_size(match_set):
+    # The text plus about 160 bytes of tuples and ints per match
+    return sys.getsizeof(match_set.text) + 160 * len(match_set.spans)
+
+
 def regex_tool():
     """Regex tester."""
     pattern_sig = c.signal("", name="regex_pattern")
     text_sig = c.signal("", name="regex_text")
     results = c.signal("Enter a pattern and test text", name="regex_out")
+    page_sig = c.signal(0, name="regex_page")
+    derived(results)
+    match_sets = State("regex_matches", size=_match_set_size)  # MatchSet of each session's latest search
+    typing = coalesce.Debouncer("regex")
 
     @c.on("set_regex_pattern")
     async def set_pattern(session, event):
         pattern_sig.set(session, event.get("value", ""))
-        await test_regex(session)
+        typing.push(session, None, test_regex, on_error=publish_error)
 
     @c.on("set_regex_text")
     async def set_text(session, event):
         text_sig.set(session, event.get("value", ""))
-        await test_regex(session)
+        typing.push(session, None, test_regex, on_error=publish_error)
 
-    async def test_regex(session):
+    def test_regex(session, _value):
         pattern = pattern_sig.get(session)
         text = text_sig.get(session)
 
         if not pattern or not text:
+            executor.cancel(session, "regex")
+            match_sets.pop(session)
             results.set(session, "Enter a pattern and test text")
             return
+        # The sandbox runs the search in its own killable process, rescanning
+        # only from the first match the edit can affect
+        search = functools.partial(regex_sandbox.find_matches, previous=match_sets.get(session))
+        executor.submit(session, "regex", publish, search, pattern, text, on_error=publish_error)
 
-        try:
-            regex = re.compile(pattern)
-            matches = list(regex.finditer(text))
-            if not matches:
-                results.set(session, "No matches found")
-                return
-
-            output_lines = [f"Found {len(matches)} match(es):", ""]
-            for i, m in enumerate(matches):
-                output_lines.append(f"Match {i + 1}: \"{m.group()}\"")
-                output_lines.append(f"  Position: {m.start()}-{m.end()}")
-                if m.groups():
-                    for j, g in enumerate(m.groups()):
-                        output_lines.append(f"  Group {j + 1}: \"{g}\"")
-                output_lines.append("")
-            results.set(session, "\n".join(output_lines))
-        except re.error as e:
+    def publish(session, match_set):
+        match_sets.set(session, match_set)
+        page_sig.set(session, 0)
+        results.set(session, match_set.page(0, REGEX_PAGE_SIZE))
+
+    def publish_error(session, e):
+        match_sets.pop(session)
+        if isinstance(e, re.error):
             results.set(session, f"Invalid regex: {str(e)}")
+        else:
+            results.set(session, f"Error: {str(e)}")
+
+    def show_page(session, delta):
+        match_set = match_sets.get(session)
+        if match_set is None or not len(match_set):
+            return
+        pages = (len(match_set) + REGEX_PAGE_SIZE - 1) // REGEX_PAGE_SIZE
+        number = max(0, min(page_sig.get(session) + delta, pages - 1))
+        page_sig.set(session, number)
+        results.set(session, match_set.page(number, REGEX_PAGE_SIZE))
+
+    @c.on("regex_prev_page")
+    async def prev_page(session, event):
+        show_page(session, -1)
+
+    @c.on("regex_next_page")
+    async def next_page(session, event):
+        show_page(session, 1)
 
     with c.card():
         c.text("Test regular expressions against text.", color="muted")
@@ -109,3 +167,95 @@ def regex_tool():
             with c.col(span=6):
                 c.text("Results", size="sm", color="muted")
                 c.code(results)
+                with c.row(justify="start"):
+                    c.button("Previous", on_click="regex_prev_page", variant="outline", size="sm")
+                    c.button("Next", on_click="regex_next_page", variant="outline", size="sm")
+
+
+def _diff(original, changed, algorithm, words):
+    """Diff two texts line by line, returning (unified diff, timing report)."""
+    start = time.perf_counter()
+    a = original.splitlines()
+    b = changed.splitlines()
+    result = diff_engine.unified_diff(a, b, algorithm, words=words) or "No differences"
+    elapsed = time.perf_counter() - start
+    return result, f"Compared {len(a):,} and {len(b):,} lines in {elapsed * 1000:,.1f} ms"
+
+
+def diff_tool():
+    """Text diff."""
+    original_sig = c.signal("", name="diff_a")
+    changed_sig = c.signal("", name="diff_b")
+    algorithm_sig = c.signal("myers", name="diff_algorithm")
+    words_sig = c.signal(False, name="diff_words")
+    results = c.signal("Enter two texts to compare", name="diff_out")
+    report = c.signal("", name="diff_stats")
+    derived(results, report)
+    typing = coalesce.Debouncer("diff")
+
+    @c.on("set_diff_a")
+    async def set_original(session, event):
+        original_sig.set(session, event.get("value", ""))
+        typing.push(session, None, run_diff, on_error=publish_error)
+
+    @c.on("set_diff_b")
+    async def set_changed(session, event):
+        changed_sig.set(session, event.get("value", ""))
+        typing.push(session, None, run_diff, on_error=publish_error)
+
+    @c.on("diff_myers")
+    async def set_myers(session, event):
+        algorithm_sig.set(session, "myers")
+        run_diff(session, None)
+
+    @c.on("diff_histogram")
+    async def set_histogram(session, event):
+        algorithm_sig.set(session, "histogram")
+        run_diff(session, None)
+
+    @c.on("diff_toggle_words")
+    async def toggle_words(session, event):
+        words_sig.set(session, not words_sig.get(session))
+        run_diff(session, None)
+
+    def run_diff(session, _value):
+        original = original_sig.get(session)
+        changed = changed_sig.get(session)
+        if not original and not changed:
+            executor.cancel(session, "diff")
+            results.set(session, "Enter two texts to compare")
+            report.set(session, "")
+            return
+        executor.submit(session, "diff", publish, _diff, original, changed,
+                        algorithm_sig.get(session), words_sig.get(session), process=True, on_error=publish_error)
+
+    def publish(session, diffed):
+        results.set(session, diffed[0])
+        report.set(session, diffed[1])
+
+    def publish_error(session, e):
+        results.set(session, f"Error: {str(e)}")
+        report.set(session, "")
+
+    with c.card():
+        c.text("Compare two texts line by line and see the differences.", color="muted")
+        c.spacer()
+
+        with c.row(justify="start"):
+            c.button("Myers", on_click="diff_myers", variant="primary")
+            c.button("Histogram", on_click="diff_histogram", variant="outline")
+            c.button("Word Diff", on_click="diff_toggle_words", variant="outline")
+
+        c.spacer()
+
+        with c.row():
+            with c.col(span=6):
+                c.textarea(label="Original", placeholder="Paste the original text...", rows=8, on_change="set_diff_a")
+            with c.col(span=6):
+                c.textarea(label="Changed", placeholder="Paste the changed text...", rows=8, on_change="set_diff_b")
+
+        c.spacer()
+
+        c.text("Differences", size="sm", color="muted")
+        c.code(results, language="diff")
+        c.text(report, size="sm", color="muted")
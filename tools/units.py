@@ -0,0 +1,21 @@
+"""Human-readable sizes and throughput for tool reports."""
+
+
+def format_bytes(n):
+    """Format a byte count, e.g. 1536 -> "1.5 KB"."""
+    for unit in ("B", "KB", "MB", "GB"):
+        if n < 1024 or unit == "GB":
+            return f"{n:,.0f} {unit}" if unit == "B" else f"{n:,.1f} {unit}"
+        n /= 1024
+
+
+def format_rate(n, seconds):
+    """Format n bytes processed in seconds as "<size> in <time> (<rate>/s)"."""
+    rate = n / seconds if seconds > 0 else 0
+    return f"{format_bytes(n)} in {seconds * 1000:,.1f} ms ({format_bytes(rate)}/s)"
+
+
+def format_item_rate(n, unit, seconds):
+    """Format n items processed in seconds, e.g. "1,000 rows in 2.0 ms (500,000 rows/s)"."""
+    rate = n / seconds if seconds > 0 else 0
+    return f"{n:,} {unit} in {seconds * 1000:,.1f} ms ({rate:,.0f} {unit}/s)"